@@ -55,11 +55,15 @@ OPTIONS:
      List of colon seperated filenames to be searched for. These 
      could be relative pathnames too.
      default:=[<appname>.json]
-  -j, --json= (json|ujson)
-      Use as scanner and parser one of the verified packages:
+  -j, --json= (json|ujson|simplejson|rapidjson|auto)
+      Use as scanner and parser one of the registered packages:
           'json': standard package
           'ujson': ultra-json for performance, check platform availability,
               and eventually run unit tests.
+          'simplejson': externally maintained version of 'json'
+          'rapidjson': python-rapidjson
+          'auto': the fastest installed package which passes the
+              conformance check, see jsondata.JSONDataBackend
   -n, --no-default-path
      Supress load of default path.
      default: False
@@ -70,9 +74,10 @@ OPTIONS:
      Search path for JSON data file(s), standard list for current platform.
      default:= ../dirname(__file__)/:dirname(__file__)/:/etc/:$HOME/
   -P, --plugins-pathlist= <search-path-JSON-data-branches>
-     Search path for JSON data file(s) to be inserted as additional branches,
-     standard list for current platform.
-     default:= ../dirname(__file__)/:dirname(__file__)/:/etc/:$HOME/
+     Directories with JSON data file(s) to be inserted as additional branches,
+     each at the JSONPointer of its member '$pointer'. The files are loaded
+     concurrently.
+     default:= none
   -s, --schemafile= <schemafile>
      Schema file - JSONschema.
      default: jsondc.jsd
@@ -175,14 +180,7 @@ for _o,_a in _opts:
         _kargs['filelist'] = _a.split(":")
 
     elif _o in ("-j","--json"):
-        if _a == 'ujson':
-            import ujson as myjson
-            #_myjson = 'ujson'
-        else:
-            import json as myjson
-            #_myjson = 'json'
-        #import importlib
-        #i = importlib.import_module(_myjson)
+        _kargs['backend'] = _a
 
     elif _o in ("-n","--no-default-path"):
         _kargs['nodefaultpath'] = True
@@ -36,20 +36,17 @@ if not version in ('2.6','2.7',): # pragma: no cover
 
 #import termcolor
 import copy
+import multiprocessing
 from types import NoneType
+from itertools import islice
 
-#
-# Check whether the application has selected a verified JSON package
-if sys.modules.get('json'):
-    import json as myjson #@UnusedImport
-elif sys.modules.get('ujson'):
-    import ujson as myjson
-else:
-    import json as myjson
+from jsondata.JSONDataBackend import get_backend
+from jsondata import JSONDataCanonical
 
 # for now the only one supported
 import jsonschema
 from jsonschema import ValidationError,SchemaError
+from jsonschema.validators import validator_for
 # Constants.
 MODE_JSON_RFC4927 = 0
 """The first JSON RFC. """
@@ -109,6 +106,7 @@ _interactive = False
 
 # generic exceptions for 'jsondata'
 from JSONDataExceptions import JSONDataParameter,JSONDataException,JSONDataValue,JSONDataKeyError,JSONDataSourceFile,JSONDataTargetFile,JSONDataNodeType
+from jsondata.JSONDataIO import json_read,schemacache
 
 #
 # special cases of exceptions
@@ -156,6 +154,12 @@ class JSONData:
             by the module 'json'.
         **schema**: The validator for 'data' provided by 
             the module 'jsonschema'.
+        **dirty**: The set of split branches changed by the
+            methods 'branch_*' and by 'JSONPatch.apply', each
+            as a tuple of the path, '()' for the remaining root.
+            'None' when not tracked, see
+            'JSONDataSerializer.split_export'.
+        **splitbranches**: The tracked split branches.
 
     Common call parameters provided by the methods of this class are:
         *targetnode := addressreference*
@@ -256,6 +260,12 @@ class JSONData:
                 data
                 
             **kargs:
+                backend: The JSON package for scan, parse, and encoding
+                    of this instance, the name of a registered package,
+                    'auto' for the fastest conforming installed package,
+                    or a package, see 'jsondata.JSONDataBackend'.
+                    
+                    default:= DEFAULT_BACKEND
                 data: JSON data within memory.
                     
                     default:= None
@@ -267,6 +277,11 @@ class JSONData:
                     default:= False
                 schema: A valid in-meory JSONschema.
                     
+                    default:= None
+                schemaregistry: The registry for the local resolution
+                    of '$ref' within the schemas, see
+                    'jsondata.JSONDataSchema.SchemaRegistry'.
+                    
                     default:= None
                 validator: [default, draft3, draft4, on, off, ]
                     Sets schema validator for the data file.
@@ -316,9 +331,15 @@ class JSONData:
         self.branch = None
         self.data = None
         self.schema = None
+        self._schemasource = None # the shared schema 'self.schema' is copied from
         self.indent = 4
         self.sort_keys = False
         self.validator = MODE_SCHEMA_OFF # default validator 
+        self.loadcached = False
+        self.backend = get_backend()
+        self.schemaregistry = None
+        self.dirty = None # tracked by the split persistence only
+        self.splitbranches = []
 
         if __debug__:
             self.debug = False
@@ -343,7 +364,9 @@ class JSONData:
         for k,v in kargs.items():
 #             if k == 'branch':
 #                 self.branch = v
-            if k == 'data':
+            if k == 'backend':
+                self.backend = get_backend(v)
+            elif k == 'data':
                 self.data = v
             elif k == 'indent_str':
                 self.indent_str = v
@@ -351,6 +374,8 @@ class JSONData:
                 self.loadcached = v
             elif k == 'requires':
                 self.requires = v
+            elif k == 'schemaregistry':
+                self.schemaregistry = v
             elif k == 'validator': # controls validation by JSONschema
                 if v == 'default' or v == MODE_SCHEMA_DRAFT4:
                     self.validator = MODE_SCHEMA_DRAFT4
@@ -370,10 +395,10 @@ class JSONData:
             
 
         if self.verbose:
-                print "VERB:JSON=          "+str(myjson.__name__)+" / "+str(myjson.__version__)
+                print "VERB:JSON=          "+str(self.backend.name)+" / "+str(self.backend.version)
         if __debug__:
             if self.debug:
-                print "DBG:JSON=           "+str(myjson.__name__)+" / "+str(myjson.__version__)
+                print "DBG:JSON=           "+str(self.backend.name)+" / "+str(self.backend.version)
                 print "DBG:self.data=    #["+str(self.schemafile)+"]#"
                 print "DBG:self.schema=  #["+str(self.schema)+"]#"
 
@@ -586,7 +611,7 @@ class JSONData:
     def __str__(self):
         """Dumps data by pretty print.
         """
-        return myjson.dumps(self.data, indent=self.indent, sort_keys=self.sort_keys)
+        return self.backend.dumps(self.data, indent=self.indent, sort_keys=self.sort_keys)
 
     def __getitem__(self,key):
         """Support of slices, for 'iterator' refer to self.__iter__.
@@ -666,6 +691,7 @@ class JSONData:
 
         """
         ret = False
+        self._mark_dirty(targetnode,key)
         if isinstance(targetnode,JSONPointer):
             try:
                 if not key:
@@ -812,8 +838,6 @@ class JSONData:
             JSONData:
 
         """
-        ret = None
-
         def getNewNode(keytype):
             """Fetch the required new container."""
             if keytype == '-':
@@ -837,46 +861,52 @@ class JSONData:
 
         if targetnode == '': # RFC6901 - whole document
             targetnode = self.data
-        
-        if type(targetnode) == dict:
-            # Be aware, the special '-' could be a valid key, thus cannot be prohibited!!! 
-            if type(branch[0]) not in (str,unicode,):
-                raise JSONDataException("value","container/branch",str(type(targetnode))+"/"+str(type(branch[0])))
-
-            if len(branch)>1:
-                if not targetnode.get(unicode(branch[0]),False):
-                    targetnode[unicode(branch[0])] = getNewNode(branch[1])
-                ret = self.branch_create(targetnode[branch[0]], branch[1:], value)
-            else:
-                if targetnode.get(branch[0],False):
-                    raise JSONDataException("exists","branch",str(branch[0]))
-                ret = targetnode[unicode(branch[0])] = self.getCanonical(value)
+        self._mark_dirty(targetnode,branch[0]) # the created nodes are below
+
+        def create(targetnode, branch):
+            """Creates the branch, the nodes below are marked by the caller."""
+            ret = None
+            if type(targetnode) == dict:
+                # Be aware, the special '-' could be a valid key, thus cannot be prohibited!!! 
+                if type(branch[0]) not in (str,unicode,):
+                    raise JSONDataException("value","container/branch",str(type(targetnode))+"/"+str(type(branch[0])))
+
+                if len(branch)>1:
+                    if not targetnode.get(unicode(branch[0]),False):
+                        targetnode[unicode(branch[0])] = getNewNode(branch[1])
+                    ret = create(targetnode[branch[0]], branch[1:])
+                else:
+                    if targetnode.get(branch[0],False):
+                        raise JSONDataException("exists","branch",str(branch[0]))
+                    ret = targetnode[unicode(branch[0])] = self.getCanonical(value)
                 
-        elif type(targetnode) == list:
-            if type(branch[0]) in (int,) and branch[0] < len(targetnode): # see RFC6902 for '-'/append
-                raise JSONDataException("exists","branch",str(branch[0]))
-            elif unicode(branch[0]) == u'-': # see RFC6902 for '-'/append
-                pass
-            else:
-                raise JSONDataException("value","targetnode/branch:"+str(type(targetnode))+"/"+str(type(branch[0])))
+            elif type(targetnode) == list:
+                if type(branch[0]) in (int,) and branch[0] < len(targetnode): # see RFC6902 for '-'/append
+                    raise JSONDataException("exists","branch",str(branch[0]))
+                elif unicode(branch[0]) == u'-': # see RFC6902 for '-'/append
+                    pass
+                else:
+                    raise JSONDataException("value","targetnode/branch:"+str(type(targetnode))+"/"+str(type(branch[0])))
 
-            if len(branch) == 1:            
-                if branch[0] == '-':
-                    branch[0] = len(targetnode)
-                    targetnode.append(self.getCanonical(value))
+                if len(branch) == 1:            
+                    if branch[0] == '-':
+                        branch[0] = len(targetnode)
+                        targetnode.append(self.getCanonical(value))
+                    else:
+                        targetnode[branch[0]] = self.getCanonical(value)
+                    ret = targetnode
                 else:
-                    targetnode[branch[0]] = self.getCanonical(value)
-                ret = targetnode
+                    if branch[0] == '-':
+                        branch[0] = len(targetnode)
+                        targetnode.append(getNewNode(branch[1]))
+                    ret = create(targetnode[branch[0]], branch[1:])
+
             else:
-                if branch[0] == '-':
-                    branch[0] = len(targetnode)
-                    targetnode.append(getNewNode(branch[1]))
-                ret = self.branch_create(targetnode[branch[0]], branch[1:], value)
+                raise JSONDataException("type","targetnode",str(type(targetnode)))
 
-        else:
-            raise JSONDataException("type","targetnode",str(type(targetnode)))
+            return ret
 
-        return ret
+        return create(targetnode, branch)
 
     def branch_move(self, targetnode, key, sourcenode, skey, force=True, forcext=False):
         """Moves a source branch to target node.
@@ -948,6 +978,8 @@ class JSONData:
         
         """
         ret = False
+        self._mark_dirty(targetnode,key if key != None else skey)
+        self._mark_dirty(sourcenode,skey if skey != None else key)
 
         if type(targetnode) is dict:
 
@@ -1075,6 +1107,7 @@ class JSONData:
 
         """
         ret = False
+        self._mark_dirty(targetnode,key)
 
         if type(targetnode) == dict:
             if not key:
@@ -1131,6 +1164,73 @@ class JSONData:
             return False
         return self.branch_add(targetnode, key, sourcenode)
 
+    def _mark_dirty(self, targetnode, key=None):
+        """Marks the split branches changed by a modification of 'targetnode'.
+
+        The branch containing the modified node is marked, the root '()'
+        when none does, and in addition all branches below the node,
+        which could be replaced as a whole. Pointers are applied by
+        their path, in-memory nodes only when known by '_path_of',
+        thus without a search within the data. Other nodes mark all.
+
+        Args:
+            targetnode: The modified node, or its container.
+
+            key: The key of the modified item within 'targetnode', None
+                for the node itself.
+
+        Returns:
+            None.
+
+        Raises:
+            None.
+        """
+        if self.dirty == None:
+            return
+        if isinstance(targetnode,JSONPointer):
+            path = tuple(unicode(x) for x in targetnode)
+        else:
+            path = self._path_of(targetnode)
+            if path == None: # unknown, thus any
+                self.dirty.add(())
+                self.dirty.update(self.splitbranches)
+                return
+        if key != None:
+            path += (unicode(key),)
+
+        owner = ()
+        for b in self.splitbranches:
+            if path[:len(b)] == b:
+                if len(b) > len(owner): # the innermost
+                    owner = b
+            elif b[:len(path)] == path: # replaced with a parent
+                self.dirty.add(b)
+        self.dirty.add(owner)
+
+    def _path_of(self, node):
+        """Gets the path of an in-memory node as tuple of unicode, or None.
+
+        The top-level containers and the split branches are known, other
+        nodes are not searched within the data.
+        """
+        if node is self.data or node == '':
+            return ()
+        if type(self.data) is dict:
+            for k,v in self.data.iteritems():
+                if v is node:
+                    return (k,)
+        for b in self.splitbranches:
+            n = self.data
+            try:
+                for x in b:
+                    n = n[int(x)] if type(n) is list else n[x]
+            except (KeyError,IndexError,ValueError,TypeError):
+                continue
+            if n is node:
+                return b
+
+        return None
+
     @classmethod
     def branch_test(cls,targetnode, value):
         """Tests match in accordance to RFC6902.
@@ -1360,6 +1460,76 @@ class JSONData:
         else:
             raise JSONDataException("type","value",str(value))
     
+    def dumps_canonical(self, sourcenode=None):
+        """Encodes data into the canonical form of RFC8785.
+
+        The canonical form is unique for equal data, thus applicable for
+        the comparison of documents by their text, see
+        'jsondata.JSONDataCanonical'.
+
+        Args:
+            sourcenode: The node, or a JSONPointer.
+
+                default:= self.data
+
+        Returns:
+            The text, 'str' encoded as UTF-8.
+
+        Raises:
+            JSONDataValue:
+        """
+        return JSONDataCanonical.dumps_canonical(self._canonical_source(sourcenode))
+
+    def hash_canonical(self, sourcenode=None, sink=None):
+        """Feeds the canonical form of RFC8785 into a hash.
+
+        The text is encoded in chunks, and is not materialized as a
+        whole. For example the fingerprint of a branch::
+
+            jdata.hash_canonical(JSONPointer('/a')).hexdigest()
+
+        Args:
+            sourcenode: The node, or a JSONPointer.
+
+                default:= self.data
+
+            sink: An object of 'hashlib', or any object with the method
+                'update', or 'write'.
+
+                default:= hashlib.sha256()
+
+        Returns:
+            The sink.
+
+        Raises:
+            JSONDataValue:
+        """
+        return JSONDataCanonical.hash_canonical(self._canonical_source(sourcenode),sink)
+
+    def iterencode_canonical(self, sourcenode=None):
+        """Encodes data into the canonical form of RFC8785 in chunks.
+
+        Args:
+            sourcenode: The node, or a JSONPointer.
+
+                default:= self.data
+
+        Returns:
+            Generator of the chunks, 'str' encoded as UTF-8.
+
+        Raises:
+            JSONDataValue:
+        """
+        return JSONDataCanonical.iterencode_canonical(self._canonical_source(sourcenode))
+
+    def _canonical_source(self, sourcenode):
+        """Gets the node for the canonical encoding."""
+        if isinstance(sourcenode,JSONPointer):
+            return sourcenode.get_node_or_value(self.data)
+        if sourcenode is None:
+            return self.data
+        return sourcenode
+
     def isApplicable(self, targetnode, key, branch, matchcondition=None, **kargs):
         """ Checks applicability by validation of provided match criteria.
 
@@ -1620,15 +1790,14 @@ class JSONData:
                 "source="+str(source)
                 )
         if sourcefile:
-            source = open(sourcefile)
-            source = myjson.load(source)
+            source = json_read(sourcefile,self.backend)
         elif not source:
             source = self.data # yes, almost the same...
 
         if pretty:
-            print myjson.dumps(source,indent=self.indent)
+            print self.backend.dumps(source,indent=self.indent)
         else:
-            print myjson.dumps(source)
+            print self.backend.dumps(source)
 
     def printSchema(self, pretty=True, **kargs):
         """Prints structured schema.
@@ -1661,15 +1830,14 @@ class JSONData:
                 "source="+str(source)
                 )
         if sourcefile:
-            source = open(sourcefile)
-            source = myjson.load(source)
+            source = json_read(sourcefile,self.backend)
         elif not source:
             source = self.schema # yes, almost the same...
 
         if pretty:
-            print myjson.dumps(source,indent=self.indent)
+            print self.backend.dumps(source,indent=self.indent)
         else:
-            print myjson.dumps(source)
+            print self.backend.dumps(source)
 
     def setSchema(self,schemafile=None, targetnode=None, **kargs):
         """Sets schema or inserts a new branch into the current assigned schema.
@@ -1704,6 +1872,10 @@ class JSONData:
                     Requires valid 'schemafile'.
                     
                     default:=False
+                backend:
+                    The JSON package for the load of 'schemafile'.
+                    
+                    default:=self.backend
 
         Returns:
             When successful returns 'True', else returns either 'False', or
@@ -1729,6 +1901,7 @@ class JSONData:
         validator = self.validator # use class settings as MODE_SCHEMA_DRAFT4
         persistent = False
         schema = None
+        backend = self.backend
         for k,v in kargs.items():
             if k == 'validator': # controls validation by JSONschema
                 if v == 'default' or v == MODE_SCHEMA_DRAFT4:
@@ -1745,6 +1918,8 @@ class JSONData:
                 datafile = v
             elif k == 'persistent':
                 persistent = v
+            elif k == 'backend':
+                backend = get_backend(v)
 
         if schemafile != None: # change filename
             self.schemafile = schemafile
@@ -1763,17 +1938,28 @@ class JSONData:
 
         # schema for validation
         if schema: # use loaded
-            pass
+            if not targetnode:
+                self._schemasource = None
 
         elif schemafile: # load from file
             schemafile = os.path.abspath(schemafile)
             self.schemafile = schemafile
             if not os.path.isfile(schemafile):
                 raise JSONDataSourceFile("open","schemafile",str(schemafile))
-            with open(schemafile) as schema_file:
-                schema = myjson.load(schema_file)
+            source = None
+            if self.schemaregistry != None: # with the siblings for '$ref'
+                self.schemaregistry.add_path(os.path.dirname(schemafile))
+                schema = self.schemaregistry.resolve(schemafile) # a copy of the registry
+            else:
+                try:
+                    source = schemacache.load(schemafile,backend,self.loadcached)
+                    schema = schemacache.copy(source,backend) # the cached schema is shared
+                except (IOError,OSError,ValueError,) as e:
+                    raise JSONDataSourceFile("read","schemafile",str(schemafile),str(e))
             if schema == None:
                 raise JSONDataSourceFile("read","schemafile",str(schemafile))
+            if not targetnode:
+                self._schemasource = source
 
         else: # missing at all
             raise JSONDataSourceFile("open","schemafile",str(schemafile))
@@ -1795,7 +1981,26 @@ class JSONData:
 
         return schema != None
 
-    def validate(self,data,schema,validator=None):
+    def _compiled(self, schema, cls):
+        """Gets the validator compiled once for a schema loaded from a file.
+
+        The copy 'self.schema' is validated by the validator of the
+        shared schema it is copied from, as long as both are equal.
+
+        Returns:
+            The validator, or None when not loaded from a file.
+        """
+        if schema is self.schema and self._schemasource is not None \
+                and self._schemasource == schema:
+            schema = self._schemasource
+        v = None
+        if self.schemaregistry != None: # resolved '$ref'
+            v = self.schemaregistry.compiled(schema,cls)
+        if v == None:
+            v = schemacache.compiled(schema,cls)
+        return v
+
+    def validate(self,data,schema,validator=None,**kargs):
         """Validate data with schema by selected validator.
 
         Args:
@@ -1824,11 +2029,32 @@ class JSONData:
                     Sets schema validator for the data file.
                     
                     default:= MODE_SCHEMA_DRAFT4
+            **kargs:
+                quiet: Suppresses any display and exception for 
+                    validation errors. Returns a lazy iterator of
+                    structured error records instead, see
+                    'iter_validation_errors'.
+
+                    default:=False
+                maxerrors: Maximum number of errors provided by
+                    the iterator in 'quiet' mode, None for all.
+
+                    default:=None
+                processes: Number of worker processes for the 
+                    parallel validation of the items of a top-level
+                    array, see 'iter_validation_errors_raw'.
+
+                    default:=None
+                chunksize: Number of array items per worker task.
+
+                    default:=1024
 
         Returns:
             When successful returns 'True', else returns either 'False', or
             raises an exception.
 
+            In 'quiet' mode returns an iterator of error records.
+
         Raises:
             ValidationError:
             SchemaError:
@@ -1837,39 +2063,38 @@ class JSONData:
         """
         if not validator:
             validator = self.mode_schema
-        
+
+        if kargs.get('quiet',False):
+            return iter_validation_errors(data,schema,validator,**kargs)
+
+        if kargs.get('processes',None) > 1 and validator != MODE_SCHEMA_OFF:
+            errors = iter_validation_errors_raw(data,schema,validator,1,
+                processes=kargs['processes'],chunksize=kargs.get('chunksize',1024))
+            for path,schema_path,message in errors:
+                errors.close()
+                if self.verbose:
+                    print "VERB:ValidationError:"+_ascii(_pointer_str(path))+":"+_ascii(message)
+                raise ValidationError(message,path=path,schema_path=schema_path)
+            return
+
         if validator == MODE_SCHEMA_DRAFT4:
             if self.verbose:
                 print "VERB:Validate: draft4"
             try:
-                jsonschema.validate(data, schema)
-                
-            #FIXME:
-            
+                v = None
+                if type(schema) is dict: # same class as by 'jsonschema.validate'
+                    v = self._compiled(schema,validator_for(schema))
+                if v != None: # loaded from a file, thus compiled once
+                    v.validate(data)
+                else:
+                    jsonschema.validate(data, schema)
             except ValidationError as e:
-                print "ValidationError"
-                print e
-                print "#---"
-                print dir(e)
-                print "#---"
-                print str(e)
-                print "#---"
-                print repr(e)
-                print "#---"
+                if self.verbose:
+                    print "VERB:ValidationError:"+_ascii(_pointer_str(e.path))+":"+_ascii(e.message)
                 raise
             except SchemaError as e:
-                print "SchemaError"
-                print e
-                print "#---"
-                print dir(e)
-                print "#---"
-                print str(e)
-                print "#---"
-                print repr(e)
-                print "#---"
-                print "path:"+str(e.path)
-                print "schema_path:"+str(e.schema_path)
-                print "#---"
+                if self.verbose:
+                    print "VERB:SchemaError:"+_ascii(_pointer_str(e.schema_path))+":"+_ascii(e.message)
                 raise
             
         elif validator == MODE_SCHEMA_DRAFT3:
@@ -1881,6 +2106,169 @@ class JSONData:
         
         pass
 
+def _pointer_str(path):
+    """Converts a path deque of 'jsonschema' into a pointer string in accordance to RFC6901."""
+    return u''.join([u'/'+unicode(p).replace(u'~',u'~0').replace(u'/',u'~1') for p in path])
+
+def _ascii(x):
+    """Converts into 'str' with escaped non-ASCII characters for the verbose output."""
+    if not isinstance(x,unicode):
+        x = str(x).decode('utf-8','replace')
+    return x.encode('ascii','backslashreplace')
+
+def iter_validation_errors(data,schema,validator=MODE_SCHEMA_DRAFT4,maxerrors=None,**kargs):
+    """Lazily iterates the validation errors of data.
+
+    The errors are generated by 'iter_errors' of the selected validator
+    on demand, thus the first error is available without the validation
+    of the remaining document. Each error is provided as a record::
+
+        {
+            'pointer':     <RFC6901 pointer to the failed data node>,
+            'schema_path': <RFC6901 pointer to the failed schema keyword>,
+            'message':     <error message>
+        }
+
+    Args:
+        data:
+            JSON-Data.
+        schema:
+            JSON-Schema for validation.
+        validator: [draft3, draft4, off, ]
+            Validator to be applied.
+
+            default:= MODE_SCHEMA_DRAFT4
+        maxerrors:
+            Maximum number of errors to be provided, None for all.
+
+            default:=None
+        **kargs:
+            processes: Number of worker processes for the validation
+                of the items of a top-level array, see 
+                'iter_validation_errors_raw'.
+
+                default:=None
+            chunksize: Number of array items per worker task.
+
+                default:=1024
+
+    Returns:
+        Yields the error records.
+
+    Raises:
+        SchemaError: Checked before the first error.
+        JSONDataValue:
+    """
+    for path,schema_path,message in iter_validation_errors_raw(data,schema,validator,maxerrors,**kargs):
+        yield {
+            'pointer': _pointer_str(path),
+            'schema_path': _pointer_str(schema_path),
+            'message': message,
+        }
+
+def iter_validation_errors_raw(data,schema,validator=MODE_SCHEMA_DRAFT4,maxerrors=None,**kargs):
+    """Lazily iterates the validation errors of data as raw path lists.
+
+    When 'processes' is set, the data is a top-level array, and the
+    schema defines one common 'items' schema, the items are validated
+    in chunks by a pool of worker processes. The validator is compiled
+    once for each worker, the data is passed to the workers on 
+    creation of the pool, thus the tasks consist of index ranges only.
+    The container keywords of the array itself are validated locally.
+    The errors of the chunks are provided in the order of the items.
+
+    Args:
+        data:
+            JSON-Data.
+        schema:
+            JSON-Schema for validation.
+        validator: [draft3, draft4, off, ]
+            Validator to be applied.
+
+            default:= MODE_SCHEMA_DRAFT4
+        maxerrors:
+            Maximum number of errors to be provided, None for all.
+
+            default:=None
+        **kargs:
+            processes: Number of worker processes, values < 2 
+                validate within the calling process.
+
+                default:=None
+            chunksize: Number of array items per worker task.
+
+                default:=1024
+
+    Returns:
+        Yields tuples of '(path, schema_path, message)', where
+        the paths are lists of keys and indexes.
+
+    Raises:
+        SchemaError: Checked before the first error.
+        JSONDataValue:
+    """
+    cls = _validator_class(validator)
+    if not cls:
+        return
+    cls.check_schema(schema)
+
+    processes = kargs.get('processes',None)
+    chunksize = kargs.get('chunksize',1024)
+    if processes > 1 and type(data) is list and type(schema) is dict \
+        and type(schema.get('items')) is dict and len(data) > chunksize:
+        errors = _iter_errors_parallel(cls,data,schema,processes,chunksize)
+    else:
+        errors = ((list(e.path),list(e.schema_path),e.message) for e in cls(schema).iter_errors(data))
+
+    if maxerrors != None:
+        errors = islice(errors,maxerrors)
+    for e in errors:
+        yield e
+
+def _validator_class(validator):
+    """Maps the validator mode onto the class of 'jsonschema', None for MODE_SCHEMA_OFF."""
+    if validator == MODE_SCHEMA_DRAFT4:
+        return jsonschema.Draft4Validator
+    elif validator == MODE_SCHEMA_DRAFT3:
+        return jsonschema.Draft3Validator
+    elif validator == MODE_SCHEMA_OFF:
+        return None
+    raise JSONDataValue("unknown","validator",str(validator))
+
+def _iter_errors_parallel(cls,data,schema,processes,chunksize):
+    """Validates the items of the array 'data' by a pool of processes."""
+    container = dict((k,v) for k,v in schema.items() if k != 'items')
+    for e in cls(container).iter_errors(data):
+        yield list(e.path),list(e.schema_path),e.message
+
+    spans = ((i,min(i+chunksize,len(data))) for i in xrange(0,len(data),chunksize))
+    pool = multiprocessing.Pool(processes,_items_init,(cls,data,schema))
+    try:
+        for errors in pool.imap(_items_chunk,spans):
+            for e in errors:
+                yield e
+    finally:
+        pool.terminate()
+
+# the worker state of _iter_errors_parallel
+_items_data = None
+_items_validator = None
+
+def _items_init(cls,data,schema):
+    """Initializes a worker, compiles the validator for the array items."""
+    global _items_data
+    global _items_validator
+    _items_data = data
+    _items_validator = cls(schema['items'],resolver=jsonschema.RefResolver.from_schema(schema))
+
+def _items_chunk(span):
+    """Validates the array items of the range 'span' within a worker."""
+    ret = []
+    for i in xrange(*span):
+        for e in _items_validator.iter_errors(_items_data[i]):
+            ret.append(([i]+list(e.path),['items']+list(e.schema_path),e.message))
+    return ret
+
    
 from jsondata.JSONPointer import JSONPointer 
 # avoid nested recursion problems
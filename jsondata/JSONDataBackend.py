@@ -0,0 +1,336 @@
+# -*- coding:utf-8   -*-
+"""Registry of the JSON packages for scan, parse, and encoding.
+
+The package 'jsondata' applies by default the JSON package selected
+at the time of import, which is 'ujson' when already loaded by the
+application, else 'json'. The registry provides the selection of
+alternative packages for each instance of 'JSONData', and for each
+call of the file interfaces.
+
+* **JSONBackend**:
+    Adapter for the common interface of a JSON package.
+
+* **get_backend**:
+    Gets a backend by name, including the automatic selection.
+
+* **conformance**:
+    Checks a backend for the basic compliance to RFC7159.
+
+* **register_backend**:
+    Registers an additional JSON package.
+
+The registered packages are 'json', 'simplejson', 'ujson', and
+'rapidjson', these are loaded on demand when installed.
+"""
+__author__ = 'Arno-Can Uestuensoez'
+__maintainer__ = 'Arno-Can Uestuensoez'
+__license__ = "Artistic-License-2.0 + Forced-Fairplay-Constraints"
+__copyright__ = "Copyright (C) 2015-2016 Arno-Can Uestuensoez @Ingenieurbuero Arno-Can Uestuensoez"
+__version__ = '0.2.18'
+__uuid__='63b597d6-4ada-4880-9f99-f5e0961351fb'
+
+import sys
+version = '{0}.{1}'.format(*sys.version_info[:2])
+if not version in ('2.6','2.7',): # pragma: no cover
+    raise Exception("Requires Python-2.6.* or higher")
+
+import time
+import threading
+try:
+    from collections import OrderedDict
+except ImportError: # Python 2.6
+    OrderedDict = dict
+
+from jsondata.JSONDataExceptions import JSONDataValue
+
+#
+# Check whether the application has selected a verified JSON package
+if sys.modules.get('json'):
+    DEFAULT_BACKEND = 'json'
+elif sys.modules.get('ujson'):
+    DEFAULT_BACKEND = 'ujson'
+else:
+    DEFAULT_BACKEND = 'json'
+"""Name of the backend used when none is selected."""
+
+BACKEND_AUTO = 'auto'
+"""Selects the fastest installed backend which passes 'conformance'."""
+
+
+class JSONBackend(object):
+    """Adapter for the common interface of a JSON package.
+
+    The adapted package has to provide 'loads' and 'dumps' compatible
+    to the standard package 'json'.
+
+    Attributes:
+        **name**: Registered name.
+        **module**: The adapted package.
+        **version**: Version of the package.
+    """
+
+    def __init__(self, name, module):
+        """Creates an adapter.
+
+        Args:
+            name: Registered name.
+
+            module: The package.
+
+        Returns:
+            Results in an initialized object.
+
+        Raises:
+            None.
+        """
+        self.name = name
+        self.module = module
+        self.version = str(getattr(module,'__version__',''))
+
+    def __repr__(self):
+        return "<JSONBackend "+self.name+" "+self.version+">"
+
+    def __copy__(self):
+        # stateless, shared by the copies of 'JSONData'
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def loads(self, s):
+        """Parses a JSON document from 'str' encoded as UTF-8, or 'unicode'."""
+        return self.module.loads(s)
+
+    def dumps(self, obj, indent=None, sort_keys=False):
+        """Encodes a JSON document."""
+        if indent == None and not sort_keys:
+            return self.module.dumps(obj)
+        return self.module.dumps(obj,indent=indent,sort_keys=sort_keys)
+
+    def iterencode(self, obj):
+        """Encodes a JSON document in chunks, the default is one chunk."""
+        return (self.dumps(obj),)
+
+
+class JSONEncoderBackend(JSONBackend):
+    """Adapter for packages with the 'JSONEncoder' class of 'json'."""
+
+    def iterencode(self, obj):
+        """Encodes a JSON document in chunks by 'JSONEncoder.iterencode'."""
+        return self.module.JSONEncoder().iterencode(obj)
+
+
+_registry = OrderedDict()
+_backends = {}
+_auto = None
+_lock = threading.Lock()
+
+def register_backend(name, module, cls=JSONBackend):
+    """Registers an additional JSON package.
+
+    Args:
+        name: Name for the selection.
+
+        module: The package, or the name of the package to be
+            imported on demand.
+
+        cls: The adapter class.
+
+            default:= JSONBackend
+
+    Returns:
+        None.
+
+    Raises:
+        None.
+    """
+    global _auto
+    with _lock:
+        _registry[name] = (module,cls)
+        _backends.pop(name,None)
+        _auto = None
+
+register_backend('json','json',JSONEncoderBackend)
+register_backend('simplejson','simplejson',JSONEncoderBackend)
+register_backend('ujson','ujson')
+register_backend('rapidjson','rapidjson')
+
+def get_backend(backend=None):
+    """Gets a backend.
+
+    Args:
+        backend: One of:
+
+            None: The default 'DEFAULT_BACKEND'.
+
+            'auto': The fastest installed backend which passes
+                'conformance', see 'select_backend'.
+
+            <name>: A registered name.
+
+            JSONBackend: Returned as is.
+
+            <module>: A JSON package, wrapped by 'JSONBackend'.
+
+            default:= None
+
+    Returns:
+        The backend.
+
+    Raises:
+        JSONDataValue:
+    """
+    if isinstance(backend,JSONBackend):
+        return backend
+    if backend == None:
+        backend = DEFAULT_BACKEND
+    elif backend == BACKEND_AUTO:
+        return select_backend()
+    elif not isinstance(backend,basestring): # a package
+        return JSONBackend(getattr(backend,'__name__',str(backend)),backend)
+
+    try:
+        return _backends[backend]
+    except KeyError:
+        pass
+    if backend not in _registry:
+        raise JSONDataValue("unknown","backend",str(backend))
+    module,cls = _registry[backend]
+    if isinstance(module,basestring):
+        try:
+            module = __import__(module)
+        except ImportError as e:
+            raise JSONDataValue("missing","backend",str(backend),str(e))
+    b = cls(backend,module)
+    _backends[backend] = b
+    return b
+
+def list_backends():
+    """Lists the names of the installed backends.
+
+    Returns:
+        List of names in the order of registration.
+
+    Raises:
+        None.
+    """
+    ret = []
+    for name in _registry.keys():
+        try:
+            get_backend(name)
+        except JSONDataValue:
+            continue
+        ret.append(name)
+    return ret
+
+_VALID = (
+    ('{"a": [1, -0.5, 1e3, true, false, null, "x"]}', {u'a': [1, -0.5, 1000.0, True, False, None, u'x']}),
+    (' \t\n[ {} , [] ]\r\n', [{}, []]),
+    ('"\\u00e4\\n\\"\\\\\\/\\t"', u'\xe4\n"\\/\t'),
+    ('"\\ud834\\udd1e"', u'\U0001d11e'),
+    ('"\xc3\xa4\xe2\x82\xac"', u'\xe4\u20ac'),
+    ('123456789012345678901234567890', 123456789012345678901234567890),
+    ('-0.1', -0.1),
+    ('1.7976931348623157e308', 1.7976931348623157e308),
+    ('5e-324', 5e-324),
+    ('[[[[[[[[[[1]]]]]]]]]]', [[[[[[[[[[1]]]]]]]]]]),
+)
+
+_INVALID = (
+    '', '[', '[1,]', '{"a":1,}', "{'a': 1}", '[01]', '{"a" 1}', '[1 2]',
+    '{1: 2}', '"\x01"', '[.5]', '[1.]', '"\\x41"', 'tru', 'nul',
+)
+
+_ROUNDTRIP = (
+    {u'f': [0.1, 1/3.0, 1e-300, 2.5e300, -0.0], u'i': [0, -1, 2**63, 10**30]},
+    {u's': [u'', u'\xe4\u20ac\U0001d11e', u'"\\/\b\f\n\r\t\x00\x1f']},
+    [None, True, False, [], {}, [[{u'a': [{}]}]]],
+)
+
+def conformance(backend):
+    """Checks a backend for the basic compliance to RFC7159.
+
+    The check comprises the parse of valid documents including escapes,
+    surrogate pairs, UTF-8, big integers, and the range of doubles, the
+    rejection of invalid documents, and the lossless round trip of
+    encoded data.
+
+    Args:
+        backend: The backend, see 'get_backend'.
+
+    Returns:
+        'True' when compliant, else 'False'.
+
+    Raises:
+        None.
+    """
+    backend = get_backend(backend)
+    try:
+        for s,v in _VALID:
+            x = backend.loads(s)
+            if x != v or type(x) != type(v) and not isinstance(v,basestring):
+                return False
+        for s in _INVALID:
+            try:
+                backend.loads(s)
+            except Exception:
+                continue
+            return False
+        for v in _ROUNDTRIP:
+            if backend.loads(backend.dumps(v)) != v:
+                return False
+            if backend.loads(''.join(backend.iterencode(v))) != v:
+                return False
+    except Exception:
+        return False
+    return True
+
+def select_backend(sample=None, repeat=3):
+    """Selects the fastest installed backend which passes 'conformance'.
+
+    The result is cached for the process, unless a sample is provided.
+
+    Args:
+        sample: Data for the measurement of the parse and encoding.
+
+            default:= built-in sample
+
+        repeat: Number of measurements, the best is applied.
+
+            default:= 3
+
+    Returns:
+        The selected backend.
+
+    Raises:
+        None.
+    """
+    global _auto
+    cached = sample == None
+    if cached and _auto != None:
+        return _auto
+    if cached:
+        sample = [{u'id': i, u'name': u'item\xe4'+unicode(i), u'value': i*0.25,
+                   u'flags': [True, False, None], u'tags': {u'a': u'x', u'b': [1, 2, 3]}}
+                  for i in range(500)]
+    best = None
+    for name in list_backends():
+        b = get_backend(name)
+        if not conformance(b):
+            continue
+        s = b.dumps(sample)
+        t = None
+        for _r in range(repeat):
+            t0 = time.time()
+            b.loads(s)
+            b.dumps(sample)
+            t1 = time.time() - t0
+            if t == None or t1 < t:
+                t = t1
+        if best == None or t < best[0]:
+            best = (t,b)
+    if best == None: # 'json' is always present
+        best = (0,get_backend('json'))
+    if cached:
+        _auto = best[1]
+    return best[1]
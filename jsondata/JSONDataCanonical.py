@@ -0,0 +1,265 @@
+# -*- coding:utf-8   -*-
+"""Canonical encoding of JSON data in accordance to RFC8785.
+
+The canonical form is a unique text for equal data, thus suitable for
+content fingerprints, and the detection of duplicates by hashes. The
+encoding comprises:
+
+* the members of objects sorted by the UTF-16 code units of the keys,
+* the numbers in the shortest form of ECMAScript, e.g. '1e+30', '4.5',
+* the minimal escaping of strings, the text as UTF-8,
+* no whitespace.
+
+The encoder is iterative, thus the depth of the data is not limited by
+the recursion of Python, and provides the text in chunks, e.g. for the
+update of a hash without the materialization of the complete text.
+
+* **iterencode_canonical**:
+    Encodes data in chunks.
+
+* **dumps_canonical**:
+    Encodes data into a string.
+
+* **hash_canonical**:
+    Feeds the encoded chunks into a hash, or a file.
+
+* **number_canonical**:
+    Encodes a number.
+
+Integers are encoded exactly, which is the same text as for the
+IEEE-754 double within the range of these, NaN and Infinity are
+rejected.
+"""
+__author__ = 'Arno-Can Uestuensoez'
+__maintainer__ = 'Arno-Can Uestuensoez'
+__license__ = "Artistic-License-2.0 + Forced-Fairplay-Constraints"
+__copyright__ = "Copyright (C) 2015-2016 Arno-Can Uestuensoez @Ingenieurbuero Arno-Can Uestuensoez"
+__version__ = '0.2.18'
+__uuid__='63b597d6-4ada-4880-9f99-f5e0961351fb'
+
+import sys
+version = '{0}.{1}'.format(*sys.version_info[:2])
+if not version in ('2.6','2.7',): # pragma: no cover
+    raise Exception("Requires Python-2.6.* or higher")
+
+import re
+import hashlib
+
+from jsondata.JSONDataExceptions import JSONDataValue
+
+CHUNKTOKENS = 4096
+"""Number of encoded tokens joined into one chunk of 'iterencode_canonical'."""
+
+_ESCAPE = re.compile(u'[\x00-\x1f"\\\\]')
+_ESCAPES = {
+    u'"': u'\\"', u'\\': u'\\\\', u'\b': u'\\b', u'\f': u'\\f',
+    u'\n': u'\\n', u'\r': u'\\r', u'\t': u'\\t',
+}
+for _i in range(0x20):
+    _ESCAPES.setdefault(unichr(_i),u'\\u%04x' % _i)
+
+if sys.maxunicode > 0xffff:
+    # code points beyond the BMP are sorted different from UTF-16
+    _ASTRAL = re.compile(u'[\U00010000-\U0010ffff]')
+else: # pragma: no cover
+    _ASTRAL = None # narrow build, the code units of UTF-16 already
+
+def _escape(m):
+    return _ESCAPES[m.group(0)]
+
+def _string(s):
+    """Encodes a string as UTF-8 with the minimal escapes."""
+    if type(s) is not unicode:
+        s = s.decode('utf-8')
+    if _ESCAPE.search(s):
+        s = _ESCAPE.sub(_escape,s)
+    return '"'+s.encode('utf-8')+'"'
+
+def _keys(node):
+    """Gets the encoded keys with the keys of an object in canonical order."""
+    ks = []
+    for k in node:
+        if type(k) is unicode:
+            ks.append((k,k))
+        elif type(k) is str:
+            ks.append((k.decode('utf-8'),k))
+        else:
+            raise JSONDataValue("type","key",repr(k))
+    if _ASTRAL != None and _ASTRAL.search(u''.join([u for u,_k in ks])):
+        ks.sort(key=lambda x: x[0].encode('utf-16-be'))
+    else:
+        ks.sort()
+    return [(_string(u),k) for u,k in ks]
+
+def number_canonical(x):
+    """Encodes a number by the algorithm 'Number.prototype.toString' of ECMAScript.
+
+    Args:
+        x: An 'int', 'long', or 'float'.
+
+    Returns:
+        The encoded number.
+
+    Raises:
+        JSONDataValue: NaN and Infinity.
+    """
+    if type(x) is not float:
+        return str(x)
+    if x != x or x in (float('inf'),float('-inf')):
+        raise JSONDataValue("number","canonical",repr(x))
+    if x == 0:
+        return '0' # including -0
+    sign = ''
+    if x < 0:
+        sign = '-'
+        x = -x
+    r = repr(x) # the shortest round trip digits
+    if 'e' in r:
+        m,e = r.split('e')
+        e = int(e)
+    else:
+        m,e = r,0
+    i = m.find('.')
+    if i < 0:
+        i = len(m)
+    digits = m.replace('.','')
+    n = i + e # x == 0.<digits> * 10**n
+    l = len(digits)
+    digits = digits.lstrip('0')
+    n -= l - len(digits)
+    digits = digits.rstrip('0')
+    k = len(digits)
+    if k <= n <= 21:
+        return sign+digits+'0'*(n-k)
+    if 0 < n <= 21:
+        return sign+digits[:n]+'.'+digits[n:]
+    if -6 < n <= 0:
+        return sign+'0.'+'0'*(-n)+digits
+    e = n - 1
+    if k == 1:
+        return sign+digits+'e'+('+' if e > 0 else '-')+str(abs(e))
+    return sign+digits[0]+'.'+digits[1:]+'e'+('+' if e > 0 else '-')+str(abs(e))
+
+def _scalar(v):
+    """Encodes a non-container value."""
+    if v is None:
+        return 'null'
+    if v is True:
+        return 'true'
+    if v is False:
+        return 'false'
+    if isinstance(v,basestring):
+        return _string(v)
+    if isinstance(v,(int,long,float)):
+        return number_canonical(v)
+    raise JSONDataValue("type","canonical",repr(v))
+
+def iterencode_canonical(data, chunktokens=CHUNKTOKENS):
+    """Encodes data into the canonical form in chunks.
+
+    Args:
+        data: The data, the objects either 'dict', or a subclass, the
+            arrays either 'list', 'tuple', or a subclass.
+
+        chunktokens: The number of tokens of a chunk.
+
+            default:= CHUNKTOKENS
+
+    Returns:
+        Generator of the chunks, 'str' encoded as UTF-8.
+
+    Raises:
+        JSONDataValue: Values which are not JSON data.
+    """
+    out = []
+    w = out.append
+    stack = [] # [container, encoded keys or None, next index]
+    v = data
+    while True:
+        if isinstance(v,dict):
+            if v:
+                keys = _keys(v)
+                w('{')
+                w(keys[0][0])
+                w(':')
+                stack.append([v,keys,1])
+                v = v[keys[0][1]]
+                continue
+            w('{}')
+        elif isinstance(v,(list,tuple)):
+            if v:
+                w('[')
+                stack.append([v,None,1])
+                v = v[0]
+                continue
+            w('[]')
+        else:
+            w(_scalar(v))
+
+        if len(out) >= chunktokens:
+            yield ''.join(out)
+            del out[:]
+
+        # next item of the enclosing containers
+        while stack:
+            frame = stack[-1]
+            node,keys,i = frame
+            if keys != None:
+                if i < len(keys):
+                    frame[2] = i + 1
+                    w(',')
+                    w(keys[i][0])
+                    w(':')
+                    v = node[keys[i][1]]
+                    break
+                w('}')
+            else:
+                if i < len(node):
+                    frame[2] = i + 1
+                    w(',')
+                    v = node[i]
+                    break
+                w(']')
+            stack.pop()
+        else:
+            break
+    if out:
+        yield ''.join(out)
+
+def dumps_canonical(data):
+    """Encodes data into the canonical form.
+
+    Args:
+        data: The data, see 'iterencode_canonical'.
+
+    Returns:
+        The text, 'str' encoded as UTF-8.
+
+    Raises:
+        JSONDataValue:
+    """
+    return ''.join(iterencode_canonical(data))
+
+def hash_canonical(data, sink=None):
+    """Feeds the canonical form of data in chunks into a sink.
+
+    Args:
+        data: The data, see 'iterencode_canonical'.
+
+        sink: An object with the method 'update', e.g. of 'hashlib',
+            or with the method 'write', e.g. a file.
+
+            default:= hashlib.sha256()
+
+    Returns:
+        The sink, e.g. for the call of 'hexdigest'.
+
+    Raises:
+        JSONDataValue:
+    """
+    if sink == None:
+        sink = hashlib.sha256()
+    put = getattr(sink,'update',None) or sink.write
+    for chunk in iterencode_canonical(data):
+        put(chunk)
+    return sink
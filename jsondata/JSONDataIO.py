@@ -0,0 +1,1992 @@
+# -*- coding:utf-8   -*-
+"""File access for JSON based data, shared by the modules of 'jsondata'.
+
+The module provides the common read path for JSON documents and schemas,
+including the optional load cache for parsed files.
+
+* **MappedFile**:
+    Read-only memory map of a file, shared by the read functions.
+    Compressed files are decompressed transparently.
+
+* **LoadCache**:
+    Cache of parsed JSON files with LRU eviction, kept in-process,
+    and optionally on disk.
+
+* **SchemaCache**:
+    Cache of parsed JSON-Schema files shared by all callers, and
+    of the compiled validators.
+
+* **JSONStreamScanner**:
+    Incremental scanner for the selection of a sub-branch by a
+    JSONPointer, skips all other parts in bounded memory.
+
+* **AtomicWriter**:
+    Buffered atomic replacement of a file, skips unchanged contents.
+
+* **json_read**:
+    Reads and parses a JSON file by the memory map.
+
+* **json_load**:
+    Loads a JSON file, optionally by the load cache.
+
+* **json_load_pointer**:
+    Loads the sub-branch of a JSON file selected by a JSONPointer.
+
+* **ndjson_read**:
+    Reads a JSON Lines file record by record.
+
+* **ndjson_write**:
+    Writes records as a JSON Lines file atomically.
+
+* **snapshot_write**:
+    Writes a binary snapshot of JSON data, read by 'json_read' on request.
+
+* **json_write**:
+    Writes a JSON file atomically by streaming chunks, optionally
+    compressed.
+
+* **iterencode_select**:
+    Encodes the branches selected by JSONPointers and patterns in
+    chunks, nested into a valid document.
+
+* **SearchIndex**:
+    Directory listings and 'stat' results for the search of files.
+
+* **IOExecutor**:
+    Bounded pool of threads for the asynchronous file I/O, with a
+    queue for the concurrent loads.
+
+* **IOResult**:
+    Result of an asynchronous call of 'IOExecutor'.
+
+* **manifest_read**, **manifest_write**:
+    Manifest of the files resolved by a search, replaces the search
+    on later starts while unchanged.
+"""
+__author__ = 'Arno-Can Uestuensoez'
+__maintainer__ = 'Arno-Can Uestuensoez'
+__license__ = "Artistic-License-2.0 + Forced-Fairplay-Constraints"
+__copyright__ = "Copyright (C) 2015-2016 Arno-Can Uestuensoez @Ingenieurbuero Arno-Can Uestuensoez"
+__version__ = '0.2.18'
+__uuid__='63b597d6-4ada-4880-9f99-f5e0961351fb'
+
+import os,sys
+version = '{0}.{1}'.format(*sys.version_info[:2])
+if not version in ('2.6','2.7',): # pragma: no cover
+    raise Exception("Requires Python-2.6.* or higher")
+
+import re
+import copy
+import mmap
+import marshal
+import stat
+import zlib
+import bz2
+import gzip
+import hashlib
+import tempfile
+import threading
+import collections
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+try:
+    from collections import OrderedDict
+except ImportError: # Python 2.6
+    OrderedDict = None
+try:
+    import lzma
+except ImportError: # optional, Python2 requires 'backports.lzma'
+    try:
+        from backports import lzma
+    except ImportError:
+        lzma = None
+
+from jsondata.JSONDataBackend import get_backend
+from jsondata.JSONDataExceptions import JSONDataKeyError,JSONDataValue
+from jsondata.JSONPointer import JSONPointer
+
+CHUNKSIZE = 65536
+"""Default size of read blocks for the incremental scanner."""
+
+MMAP = True
+"""Reads files by memory maps, when False by the file buffering."""
+
+COMPRESSLEVEL = 9
+"""Default compression level for written files."""
+
+_MAGIC = (
+    ('\x1f\x8b', 'gz'),
+    ('BZh', 'bz2'),
+    ('\xfd7zXZ\x00', 'xz'),
+)
+_SUFFIX = {'.gz':'gz', '.bz2':'bz2', '.xz':'xz'}
+
+# read once at import, the umask is process wide and not changed by threads
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+SNAPSHOT_MAGIC = '\x00JSONDATA-SNAPSHOT\x00'
+"""Header of binary snapshots, never the start of JSON text."""
+
+def compression_of(filepath, magic=True):
+    """Gets the compression format of a file.
+
+    Args:
+        filepath: Name of the file.
+
+        magic: Checks the magic bytes of an existing file, else the
+            suffix only.
+
+            default:= True
+
+    Returns:
+        One of 'gz', 'bz2', 'xz', or None for uncompressed files.
+
+    Raises:
+        None.
+    """
+    if magic:
+        try:
+            with open(filepath,'rb') as fp:
+                head = fp.read(6)
+        except IOError:
+            head = None
+        if head != None:
+            for m,c in _MAGIC:
+                if head.startswith(m):
+                    return c
+            return None
+    return _SUFFIX.get(os.path.splitext(filepath)[1].lower())
+
+def _compressor(compression, compresslevel=COMPRESSLEVEL):
+    """Creates an incremental compressor with 'compress' and 'flush'."""
+    if compression == 'gz': # zero mtime, thus reproducible contents
+        return zlib.compressobj(compresslevel,zlib.DEFLATED,16+zlib.MAX_WBITS)
+    elif compression == 'bz2':
+        return bz2.BZ2Compressor(compresslevel)
+    elif compression == 'xz':
+        if not lzma:
+            raise JSONDataValue("unsupported","compression","xz requires 'lzma'")
+        return lzma.LZMACompressor(preset=compresslevel)
+    raise JSONDataValue("unknown","compression",str(compression))
+
+_WS = re.compile(r'[ \t\n\r]*')
+_STRING = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL) # up to the closing quote
+_SCALAR = re.compile(r'[^,:\]}\[{"\s]*')
+_STRUCT = re.compile(r'["\[\]{}]')
+
+
+class MappedFile(object):
+    """Read-only memory map of a file.
+
+    The incremental scanner works directly on the mapped pages, thus
+    skipped parts of the file are never copied. The complete parse
+    by 'json' requires a string, which is copied in one step from the
+    mapping without the intermediate file buffering.
+
+    Files which could not be mapped, e.g. empty files and pipes, or
+    when disabled by 'MMAP', are provided as the file object opened in
+    binary mode. Compressed files, detected by the magic bytes, are
+    provided as a decompressing file object. Thus the user has to
+    support both, the buffer and the file interface, e.g. by
+    'JSONStreamScanner'.
+    """
+
+    def __init__(self, filepath):
+        """Opens and maps the file.
+
+        Args:
+            filepath: File to be mapped.
+
+        Returns:
+            Results in an initialized object.
+
+        Raises:
+            IOError:
+        """
+        self.fp = open(filepath,'rb')
+        self.buf = None
+        self.compression = compression_of(filepath)
+        if self.compression:
+            raw = self.fp
+            try:
+                if self.compression == 'gz':
+                    self.fp = gzip.GzipFile(fileobj=raw,mode='rb')
+                    self.raw = raw
+                    return
+                raw.close()
+                if self.compression == 'bz2':
+                    self.fp = bz2.BZ2File(filepath,'rb')
+                elif lzma:
+                    self.fp = lzma.LZMAFile(filepath,'rb')
+                else:
+                    raise JSONDataValue("unsupported","compression","xz requires 'lzma'")
+            except:
+                raw.close()
+                raise
+        elif MMAP:
+            try:
+                self.buf = mmap.mmap(self.fp.fileno(),0,access=mmap.ACCESS_READ)
+            except (ValueError,EnvironmentError,): # empty file, pipe, etc.
+                self.buf = None
+
+    def __enter__(self):
+        if self.buf != None:
+            return self.buf
+        return self.fp
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Unmaps and closes the file."""
+        if self.buf != None:
+            self.buf.close()
+            self.buf = None
+        self.fp.close()
+        if self.compression == 'gz':
+            self.raw.close()
+
+    def peek(self, n):
+        """Reads the first 'n' bytes without a change of the position."""
+        if self.buf != None:
+            return self.buf[:n]
+        data = self.fp.read(n)
+        self.fp.seek(0)
+        return data
+
+    def read(self):
+        """Reads the complete content.
+
+        Returns:
+            The content as 'str'.
+
+        Raises:
+            IOError:
+        """
+        if self.buf != None:
+            return self.buf[:]
+        return self.fp.read()
+
+def json_read(filepath, backend=None, snapshot=False):
+    """Reads and parses a JSON file by 'MappedFile'.
+
+    Args:
+        filepath: JSON file to be loaded.
+
+        backend: The JSON package, see
+            'jsondata.JSONDataBackend.get_backend'.
+
+            default:= None
+
+        snapshot: Decodes a binary snapshot written by 'snapshot_write',
+            else the file is parsed as JSON text. Snapshots are 'marshal'
+            records, thus have to be read from trusted files only.
+
+            default:= False
+
+    Returns:
+        The parsed data.
+
+    Raises:
+        IOError:
+
+        forwarded from 'json'
+    """
+    m = MappedFile(filepath)
+    try:
+        content = m.read()
+    finally:
+        m.close()
+    if snapshot and content.startswith(SNAPSHOT_MAGIC):
+        return snapshot_decode(content)
+    return get_backend(backend).loads(content)
+
+def snapshot_decode(content):
+    """Decodes a binary snapshot.
+
+    Args:
+        content: Contents of a snapshot file including the header.
+
+    Returns:
+        The data.
+
+    Raises:
+        ValueError:
+    """
+    n = len(SNAPSHOT_MAGIC)
+    if not content.startswith(SNAPSHOT_MAGIC) or len(content) <= n:
+        raise ValueError("Not a snapshot")
+    if ord(content[n]) != marshal.version:
+        raise ValueError("Snapshot format "+str(ord(content[n]))+" not supported, requires "+str(marshal.version))
+    return marshal.loads(content[n+1:])
+
+def snapshot_write(filepath, data, force=False, compression=None, compresslevel=COMPRESSLEVEL,
+                   backend=None):
+    """Writes a binary snapshot of JSON data atomically.
+
+    The snapshot is a 'marshal' record of the in-memory data, prefixed
+    by the header 'SNAPSHOT_MAGIC' and the format version. It is read
+    by 'json_read' with 'snapshot' several times faster than JSON text, and results in identical data including the types
+    'unicode', 'int', 'long', and 'float'. The format is specific for
+    the Python version, thus intended for local caches and fast
+    restarts, not for exchange.
+
+    When the data could not be represented, e.g. exceeds the nesting
+    limit of 'marshal', the data is written as JSON text by 'json_write'.
+
+    Args:
+        filepath: Snapshot file to be written.
+
+        data: Data to be written.
+
+        force: Writes the file even when unchanged.
+
+            default:= False
+
+        compression: Compression format, see 'AtomicWriter'.
+
+            default:= by suffix of 'filepath'
+
+        compresslevel: Compression level.
+
+            default:= COMPRESSLEVEL
+
+        backend: The JSON package for the fallback to JSON text.
+
+            default:= None
+
+    Returns:
+        'True' when the file is written, 'False' when unchanged.
+
+    Raises:
+        IOError:
+
+        OSError:
+
+        JSONDataValue:
+    """
+    try:
+        record = marshal.dumps(data)
+    except ValueError: # fall back to JSON text
+        return json_write(filepath,data,force,compression,compresslevel,backend)
+
+    w = AtomicWriter(filepath,force,compression=compression,compresslevel=compresslevel)
+    try:
+        w.write(SNAPSHOT_MAGIC+chr(marshal.version))
+        w.write(record)
+    except:
+        w.abort()
+        raise
+    return w.commit()
+
+
+class LoadCache(object):
+    """Cache of parsed JSON files.
+
+    The entries are keyed by the tuple '(realpath, mtime, size, inode)' of
+    the file, thus any change of the file invalidates the entry. The parsed
+    data is stored as a 'marshal' record, each hit returns a fresh copy of
+    the data, which could be modified by the caller without side effects
+    onto the cache. The in-process entries are evicted in LRU order when
+    either the number of entries, or the total size exceeds the limits.
+
+    When a cache directory is provided, the records are additionally
+    stored on disk, thus short-lived processes could reuse the parsed
+    data of previous calls. The 'marshal' format is specific to the
+    Python version, records of other versions are silently ignored.
+
+    Attributes:
+        **hits**: Number of loads from the cache.
+        **misses**: Number of loads from the JSON file.
+    """
+
+    def __init__(self, maxentries=256, maxsize=64*1024*1024):
+        """Creates an empty cache.
+
+        Args:
+            maxentries: Maximum number of in-process entries.
+
+                default:= 256
+
+            maxsize: Maximum sum of the size of in-process records in bytes.
+
+                default:= 64MiB
+
+        Returns:
+            Results in an initialized object.
+
+        Raises:
+            None.
+        """
+        self.maxentries = maxentries
+        self.maxsize = maxsize
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        if OrderedDict:
+            self.entries = OrderedDict()
+        else:
+            self.entries = {}
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        """Number of in-process entries."""
+        return len(self.entries)
+
+    def clear(self):
+        """Drops all in-process entries."""
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    @staticmethod
+    def key(filepath):
+        """Gets the cache key of a file.
+
+        Args:
+            filepath: Name of an existing file.
+
+        Returns:
+            The tuple '(realpath, mtime, size, inode)'.
+
+        Raises:
+            OSError:
+        """
+        filepath = os.path.realpath(filepath)
+        st = os.stat(filepath)
+        return (filepath, st.st_mtime, st.st_size, st.st_ino)
+
+    def load(self, filepath, cachedir=None, backend=None):
+        """Loads a JSON file by the cache.
+
+        Args:
+            filepath: JSON file to be loaded.
+
+            cachedir: Directory for the persistent records, None for
+                in-process caching only.
+
+                default:= None
+
+            backend: The JSON package for the parse on a miss.
+
+                default:= None
+
+        Returns:
+            The parsed data.
+
+        Raises:
+            OSError:
+
+            IOError:
+
+            forwarded from 'json'
+        """
+        key = self.key(filepath)
+
+        with self.lock:
+            record = self.entries.pop(key,None)
+            if record != None:
+                self.entries[key] = record # mark as recently used
+        if record == None and cachedir:
+            record = self._disk_get(key,cachedir)
+            if record != None:
+                self._put(key,record)
+        if record != None:
+            self.hits += 1
+            return marshal.loads(record)
+
+        self.misses += 1
+        data = json_read(key[0],backend)
+        try:
+            record = marshal.dumps(data)
+        except ValueError: # contains types not supported by marshal
+            return data
+        self._put(key,record)
+        if cachedir:
+            self._disk_put(key,record,cachedir)
+        return data
+
+    def _put(self, key, record):
+        """Adds an in-process entry and evicts the least recently used."""
+        with self.lock:
+            if key in self.entries:
+                self.size -= len(self.entries.pop(key))
+            self.entries[key] = record
+            self.size += len(record)
+            while self.entries and (len(self.entries) > self.maxentries or self.size > self.maxsize):
+                if OrderedDict:
+                    self.size -= len(self.entries.popitem(False)[1])
+                else:
+                    self.size -= len(self.entries.pop(self.entries.keys()[0]))
+
+    @staticmethod
+    def _disk_name(key, cachedir):
+        """Maps the realpath onto the name of the record file."""
+        name = key[0]
+        if type(name) is unicode:
+            name = name.encode('utf-8')
+        return os.path.join(cachedir,hashlib.sha1(name).hexdigest()+'.marshal')
+
+    def _disk_get(self, key, cachedir):
+        """Reads a persistent record, returns None when missing or outdated."""
+        try:
+            with open(self._disk_name(key,cachedir),'rb') as fp:
+                dkey,record = marshal.load(fp)
+        except (IOError,EOFError,ValueError,TypeError):
+            return None
+        if tuple(dkey) != key:
+            return None
+        return record
+
+    def _disk_put(self, key, record, cachedir):
+        """Writes a persistent record, errors are ignored - it is a cache only."""
+        try:
+            if not os.path.isdir(cachedir):
+                os.makedirs(cachedir)
+            fd,tmpname = tempfile.mkstemp(dir=cachedir)
+            with os.fdopen(fd,'wb') as fp:
+                marshal.dump((key,record),fp)
+            os.rename(tmpname,self._disk_name(key,cachedir))
+        except (IOError,OSError):
+            pass
+
+loadcache = LoadCache()
+"""The process-wide load cache shared by all instances."""
+
+class SchemaCache(object):
+    """Cache of parsed JSON-Schema files, and of the compiled validators.
+
+    The entries are keyed by 'LoadCache.key' of the file, thus any change
+    of the file invalidates the entry. Different from 'LoadCache' each hit
+    returns the same parsed object, which therefore must not be modified.
+    Each entry keeps the validators compiled for the schema, the schema
+    is checked once for each validator class. The validators are kept
+    for each thread, because the reference resolution is not thread-safe.
+    The entries are evicted in LRU order.
+
+    Attributes:
+        **hits**: Number of loads from the cache.
+        **misses**: Number of loads from the schema file.
+    """
+
+    def __init__(self, maxentries=64):
+        """Creates an empty cache.
+
+        Args:
+            maxentries: Maximum number of entries.
+
+                default:= 64
+
+        Returns:
+            Results in an initialized object.
+
+        Raises:
+            None.
+        """
+        self.maxentries = maxentries
+        self.hits = 0
+        self.misses = 0
+        if OrderedDict:
+            self.entries = OrderedDict()
+        else:
+            self.entries = {}
+        self.schemas = {} # id(schema) -> key
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        """Number of entries."""
+        return len(self.entries)
+
+    def clear(self):
+        """Drops all entries."""
+        with self.lock:
+            self.entries.clear()
+            self.schemas.clear()
+
+    def load(self, filepath, backend=None, loadcached=False):
+        """Loads a JSON-Schema file by the cache.
+
+        Args:
+            filepath: JSON-Schema file to be loaded.
+
+            backend: The JSON package for the parse on a miss.
+
+                default:= None
+
+            loadcached: Use of the load cache on a miss, see 'json_load'.
+
+                default:= False
+
+        Returns:
+            The parsed schema, shared by all callers. Callers which keep
+            or modify the schema use a private copy, see 'copy'.
+
+        Raises:
+            OSError:
+
+            IOError:
+
+            forwarded from 'json'
+        """
+        return self._entry(filepath,backend,loadcached)[0]
+
+    def validator(self, filepath, cls, backend=None, loadcached=False):
+        """Gets the compiled validator of a JSON-Schema file.
+
+        Args:
+            filepath: JSON-Schema file to be loaded.
+
+            cls: The validator class, e.g. 'jsonschema.Draft4Validator'.
+
+            backend: The JSON package for the parse on a miss.
+
+                default:= None
+
+            loadcached: Use of the load cache on a miss, see 'json_load'.
+
+                default:= False
+
+        Returns:
+            The validator for the calling thread.
+
+        Raises:
+            OSError:
+
+            IOError:
+
+            jsonschema.SchemaError:
+
+            forwarded from 'json'
+        """
+        entry = self._entry(filepath,backend,loadcached)
+        return self._compile(entry,cls)
+
+    def compiled(self, schema, cls):
+        """Gets the compiled validator of a schema provided by 'load'.
+
+        Args:
+            schema: The parsed schema.
+
+            cls: The validator class.
+
+        Returns:
+            The validator for the calling thread, or None when 'schema'
+            is not an entry of the cache.
+
+        Raises:
+            jsonschema.SchemaError:
+        """
+        with self.lock:
+            entry = self.entries.get(self.schemas.get(id(schema)))
+        if entry == None or entry[0] is not schema:
+            return None
+        return self._compile(entry,cls)
+
+    def copy(self, schema, backend=None):
+        """Creates a private copy of a schema provided by 'load'.
+
+        The copy is parsed from the cached content of the file, thus
+        equal to a separate load including the order of the members.
+
+        Args:
+            schema: The parsed schema.
+
+            backend: The JSON package for the parse.
+
+                default:= None
+
+        Returns:
+            The copy, which could be modified without side effects onto
+            the cache.
+
+        Raises:
+            forwarded from 'json'
+        """
+        with self.lock:
+            entry = self.entries.get(self.schemas.get(id(schema)))
+        if entry == None or entry[0] is not schema or entry[3] == None:
+            return copy.deepcopy(schema)
+        return get_backend(backend).loads(entry[3])
+
+    def _entry(self, filepath, backend, loadcached):
+        """Gets the entry '[schema, checked, validators, content]' of a file."""
+        key = LoadCache.key(filepath)
+        with self.lock:
+            entry = self.entries.pop(key,None)
+            if entry != None:
+                self.entries[key] = entry # mark as recently used
+                self.hits += 1
+                return entry
+
+        self.misses += 1
+        if loadcached: # no content, copied by 'deepcopy'
+            entry = [json_load(key[0],loadcached,backend=backend),set(),{},None]
+        else:
+            m = MappedFile(key[0])
+            try:
+                content = m.read()
+            finally:
+                m.close()
+            entry = [get_backend(backend).loads(content),set(),{},content]
+        with self.lock:
+            self.entries[key] = entry
+            self.schemas[id(entry[0])] = key
+            while len(self.entries) > self.maxentries:
+                if OrderedDict:
+                    k,e = self.entries.popitem(False)
+                else:
+                    k = self.entries.keys()[0]
+                    e = self.entries.pop(k)
+                if self.schemas.get(id(e[0])) == k:
+                    self.schemas.pop(id(e[0]))
+        return entry
+
+    def _compile(self, entry, cls):
+        """Gets the validator of an entry for the calling thread."""
+        tkey = (cls,threading.current_thread().ident)
+        v = entry[2].get(tkey)
+        if v == None:
+            if cls not in entry[1]:
+                cls.check_schema(entry[0])
+                entry[1].add(cls)
+            v = entry[2][tkey] = cls(entry[0])
+        return v
+
+schemacache = SchemaCache()
+"""The process-wide schema cache shared by all instances."""
+
+def json_load(filepath, loadcached=False, pointer=None, backend=None, snapshot=False):
+    """Loads a JSON file.
+
+    Args:
+        filepath: JSON file to be loaded.
+
+        loadcached: Use of the load cache:
+
+            False: Read and parse the file.
+
+            True: Use the in-process cache 'loadcache'.
+
+            <directory>: Use the in-process cache, and store the
+                records persistently into the directory.
+
+            default:= False
+
+        pointer: Loads the selected sub-branch only, see
+            'json_load_pointer'. The load cache is not used.
+
+            default:= None
+
+        backend: The JSON package, see
+            'jsondata.JSONDataBackend.get_backend'.
+
+            default:= None
+
+        snapshot: Decodes a binary snapshot, see 'json_read'. The load
+            cache is not used.
+
+            default:= False
+
+    Returns:
+        The parsed data.
+
+    Raises:
+        OSError:
+
+        IOError:
+
+        forwarded from 'json'
+    """
+    if pointer is not None:
+        return json_load_pointer(filepath,pointer,backend=backend,snapshot=snapshot)
+    if snapshot:
+        return json_read(filepath,backend,True)
+    if loadcached:
+        if loadcached is True:
+            return loadcache.load(filepath,None,backend)
+        return loadcache.load(filepath,loadcached,backend)
+    return json_read(filepath,backend)
+
+
+class JSONStreamScanner(object):
+    """Incremental scanner for JSON documents.
+
+    The scanner reads the document in blocks of 'chunksize' and locates
+    a sub-branch by its path. All preceding values are skipped by a
+    lexical scan of strings and nesting levels only, thus the memory
+    is bounded by the block size, the largest string token, and the
+    selected sub-branch. The sub-branch itself is parsed by 'json'.
+
+    The scan stops at the end of the selected sub-branch, thus the
+    remaining document is not checked for syntax errors. For duplicate
+    keys the first occurrence is selected.
+    """
+
+    def __init__(self, fp, chunksize=CHUNKSIZE, backend=None):
+        """Creates a scanner on a file opened in binary mode.
+
+        Args:
+            fp: File object to be read, or a buffer object with the
+                complete document, e.g. a 'mmap'.
+
+            chunksize: Size of read blocks.
+
+                default:= CHUNKSIZE
+
+            backend: The JSON package for the parse of the values.
+
+                default:= None
+
+        Returns:
+            Results in an initialized object.
+
+        Raises:
+            None.
+        """
+        if hasattr(fp,'read') and not hasattr(fp,'find'):
+            self.fp = fp
+            self.buf = ''
+        else: # complete in-memory buffer
+            self.fp = None
+            self.buf = fp
+        self.chunksize = chunksize
+        self.backend = get_backend(backend)
+        self.pos = 0
+        self.offset = 0 # absolute position of 'buf'
+        self.captured = None
+        self.capstart = 0
+
+    def _more(self):
+        """Reads the next block, drops the consumed part of the buffer."""
+        if not self.fp:
+            return False
+        data = self.fp.read(self.chunksize)
+        if not data:
+            return False
+        if self.captured != None:
+            self.captured.append(self.buf[self.capstart:self.pos])
+            self.capstart = 0
+        self.offset += self.pos
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def _error(self, msg):
+        return ValueError(msg+": char "+str(self.offset+self.pos))
+
+    def _begin(self):
+        """Starts the recording of the scanned text."""
+        self.captured = []
+        self.capstart = self.pos
+
+    def _end(self):
+        """Stops the recording and returns the scanned text."""
+        self.captured.append(self.buf[self.capstart:self.pos])
+        ret = ''.join(self.captured)
+        self.captured = None
+        return ret
+
+    def _nextchar(self):
+        """Skips whitespace, returns the next character or '' at EOF."""
+        while True:
+            self.pos = _WS.match(self.buf,self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._more():
+                return ''
+
+    def _expect(self, c):
+        if self._nextchar() != c:
+            raise self._error("Expecting '"+c+"'")
+        self.pos += 1
+
+    def _string(self):
+        """Scans a string token including the quotes."""
+        self._expect('"')
+        while True:
+            self.pos = _STRING.match(self.buf,self.pos).end()
+            if self.pos < len(self.buf) and self.buf[self.pos] == '"':
+                self.pos += 1
+                return
+            if not self._more(): # incomplete, or a split escape sequence
+                raise self._error("Unterminated string")
+
+    def skip(self):
+        """Skips the next value.
+
+        Returns:
+            None.
+
+        Raises:
+            ValueError:
+        """
+        c = self._nextchar()
+        if c == '"':
+            self._string()
+        elif c in ('{','[',):
+            depth = 0
+            while True:
+                m = _STRUCT.search(self.buf,self.pos)
+                if not m:
+                    self.pos = len(self.buf)
+                    if not self._more():
+                        raise self._error("Unterminated container")
+                    continue
+                c = m.group()
+                if c == '"':
+                    self.pos = m.start()
+                    self._string()
+                    continue
+                self.pos = m.end()
+                if c in ('{','[',):
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        return
+        elif c:
+            start = self.offset+self.pos
+            while True:
+                self.pos = _SCALAR.match(self.buf,self.pos).end()
+                if self.pos < len(self.buf) or not self._more():
+                    break
+            if self.offset+self.pos == start:
+                raise self._error("Expecting value")
+        else:
+            raise self._error("Expecting value")
+
+    def value(self):
+        """Scans and parses the next value.
+
+        Returns:
+            The parsed value.
+
+        Raises:
+            ValueError:
+        """
+        self._nextchar()
+        self._begin()
+        try:
+            self.skip()
+        finally:
+            raw = self._end()
+        return self.backend.loads(raw)
+
+    def find(self, path):
+        """Moves to the value addressed by the path.
+
+        Args:
+            path: List of keys and indexes, e.g. a 'JSONPointer'.
+
+        Returns:
+            None, the next value is the addressed value.
+
+        Raises:
+            JSONDataKeyError:
+
+            ValueError:
+        """
+        for i,key in enumerate(path):
+            c = self._nextchar()
+            if c == '{':
+                if type(key) is str:
+                    key = key.decode('utf-8')
+                elif type(key) is not unicode:
+                    key = unicode(key)
+                self.pos += 1
+                if self._nextchar() == '}':
+                    raise JSONDataKeyError("missing","pointer",path[:i+1])
+                while True:
+                    self._nextchar()
+                    self._begin()
+                    try:
+                        self._string()
+                    finally:
+                        raw = self._end()
+                    self._expect(':')
+                    if self.backend.loads(raw) == key:
+                        break
+                    self.skip()
+                    c = self._nextchar()
+                    self.pos += 1
+                    if c == '}':
+                        raise JSONDataKeyError("missing","pointer",path[:i+1])
+                    elif c != ',':
+                        raise self._error("Expecting ',' delimiter")
+
+            elif c == '[':
+                if type(key) is not int:
+                    raise JSONDataKeyError("type","pointer",path[:i+1])
+                self.pos += 1
+                if self._nextchar() == ']':
+                    raise JSONDataKeyError("missing","pointer",path[:i+1])
+                for _n in range(key):
+                    self.skip()
+                    c = self._nextchar()
+                    self.pos += 1
+                    if c == ']':
+                        raise JSONDataKeyError("missing","pointer",path[:i+1])
+                    elif c != ',':
+                        raise self._error("Expecting ',' delimiter")
+
+            else:
+                raise JSONDataKeyError("missing","pointer",path[:i+1])
+
+def json_load_pointer(filepath, pointer, chunksize=CHUNKSIZE, backend=None, snapshot=False):
+    """Loads the sub-branch of a JSON file selected by a pointer.
+
+    The file is scanned incrementally by 'JSONStreamScanner', thus
+    only the selected sub-branch is parsed and kept in memory. When
+    mapped by 'MappedFile', the scan is performed on the mapping
+    without a copy, else by read blocks of 'chunksize'.
+
+    Args:
+        filepath: JSON file to be loaded.
+
+        pointer: A JSONPointer, or a pointer string in accordance
+            to RFC6901.
+
+        chunksize: Size of read blocks.
+
+            default:= CHUNKSIZE
+
+        backend: The JSON package, see
+            'jsondata.JSONDataBackend.get_backend'.
+
+            default:= None
+
+        snapshot: Decodes a binary snapshot completely, and selects the
+            sub-branch, see 'json_read'.
+
+            default:= False
+
+    Returns:
+        The parsed sub-branch.
+
+    Raises:
+        JSONDataKeyError:
+
+        IOError:
+
+        ValueError:
+    """
+    if not isinstance(pointer,JSONPointer):
+        pointer = JSONPointer(pointer)
+    m = MappedFile(filepath)
+    try:
+        if snapshot and m.peek(len(SNAPSHOT_MAGIC)) == SNAPSHOT_MAGIC:
+            data = snapshot_decode(m.read())
+            try:
+                return pointer.get_node_or_value(data)
+            except Exception:
+                raise JSONDataKeyError("missing","pointer",pointer)
+        with m as fp:
+            scanner = JSONStreamScanner(fp,chunksize,backend)
+            scanner.find(pointer)
+            return scanner.value()
+    finally:
+        m.close()
+
+
+class AtomicWriter(object):
+    """Buffered atomic replacement of a file.
+
+    The data is written into a temporary file within the directory of
+    the target, which is synced and renamed onto the target by 'commit'.
+    Thus a crash leaves either the previous, or the new file, never a
+    truncated one.
+
+    While the written data equals the present contents of the target,
+    no temporary file is created at all. The data is compared in blocks
+    with the present file, when the contents are unchanged the file
+    is not touched.
+
+    The data is optionally compressed, the compressed contents are
+    reproducible, thus the comparison applies to compressed files too.
+    """
+
+    def __init__(self, filepath, force=False, bufsize=CHUNKSIZE, compression=None,
+                 compresslevel=COMPRESSLEVEL):
+        """Prepares the replacement of a file.
+
+        Args:
+            filepath: Target file, symbolic links are resolved, thus
+                the link target is replaced.
+
+            force: Writes the file even when unchanged.
+
+                default:= False
+
+            bufsize: Size of the write blocks.
+
+                default:= CHUNKSIZE
+
+            compression: Compression format, one of 'gz', 'bz2', 'xz',
+                or False for uncompressed.
+
+                default:= by suffix of 'filepath'
+
+            compresslevel: Compression level, 1 to 9.
+
+                default:= COMPRESSLEVEL
+
+        Returns:
+            Results in an initialized object.
+
+        Raises:
+            JSONDataValue:
+        """
+        if compression == None:
+            compression = compression_of(filepath,False)
+        if compression:
+            self.compressor = _compressor(compression,compresslevel)
+        else:
+            self.compressor = None
+        self.filepath = os.path.realpath(filepath)
+        self.bufsize = bufsize
+        self.buf = []
+        self.buflen = 0
+        self.equal = 0 # length of the unchanged prefix
+        self.tmp = None
+        self.tmpname = None
+        self.old = None
+        if not force and os.path.isfile(self.filepath):
+            try:
+                self.old = open(self.filepath,'rb')
+            except IOError:
+                self.old = None
+
+    def write(self, data):
+        """Writes a chunk of data, 'unicode' is encoded as UTF-8."""
+        if type(data) is unicode:
+            data = data.encode('utf-8')
+        if self.compressor:
+            data = self.compressor.compress(data)
+        self.buf.append(data)
+        self.buflen += len(data)
+        if self.buflen >= self.bufsize:
+            self._flush()
+
+    def _flush(self):
+        """Compares, or writes the buffered data."""
+        data = ''.join(self.buf)
+        self.buf = []
+        self.buflen = 0
+        if self.tmp == None:
+            if self.old != None and self.old.read(len(data)) == data:
+                self.equal += len(data)
+                return
+            self._open()
+        self.tmp.write(data)
+
+    def _open(self):
+        """Creates the temporary file with the unchanged prefix."""
+        fd,self.tmpname = tempfile.mkstemp(prefix='.'+os.path.basename(self.filepath)+'.',
+            dir=os.path.dirname(self.filepath))
+        self.tmp = os.fdopen(fd,'wb')
+        if self.old != None:
+            self.old.seek(0)
+            n = self.equal
+            while n > 0:
+                data = self.old.read(min(n,self.bufsize))
+                self.tmp.write(data)
+                n -= len(data)
+
+    def _close_old(self):
+        if self.old != None:
+            st = os.fstat(self.old.fileno())
+            self.old.close()
+            self.old = None
+            return st
+
+    def commit(self):
+        """Completes the write.
+
+        Returns:
+            'True' when the file is written, 'False' when unchanged.
+
+        Raises:
+            IOError:
+
+            OSError:
+        """
+        try:
+            if self.compressor:
+                self.buf.append(self.compressor.flush())
+            self._flush()
+            if self.tmp == None:
+                if self.old != None and self.old.read(1) == '':
+                    self._close_old()
+                    return False
+                self._open() # new file, or truncated contents
+            st = self._close_old()
+            self.tmp.flush()
+            os.fsync(self.tmp.fileno())
+            self.tmp.close()
+            if st != None:
+                mode = stat.S_IMODE(st.st_mode)
+            else:
+                mode = 0666 & ~_UMASK
+            os.chmod(self.tmpname,mode)
+            os.rename(self.tmpname,self.filepath)
+            self.tmpname = None
+        except:
+            self.abort()
+            raise
+        try: # persist the directory entry
+            fd = os.open(os.path.dirname(self.filepath),os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        except OSError:
+            pass
+        return True
+
+    def abort(self):
+        """Drops the written data, the target file remains unchanged."""
+        self._close_old()
+        if self.tmp != None:
+            self.tmp.close()
+        if self.tmpname:
+            try:
+                os.unlink(self.tmpname)
+            except OSError:
+                pass
+            self.tmpname = None
+
+def json_write(filepath, data, force=False, compression=None, compresslevel=COMPRESSLEVEL,
+               backend=None, select=None):
+    """Writes a JSON file atomically.
+
+    The data is encoded in chunks by the 'iterencode' method of the
+    backend into an 'AtomicWriter', thus for 'json' the encoded document
+    is not kept in memory as a whole. The format is the same as by 'dump'
+    of the JSON package.
+
+    Args:
+        filepath: JSON file to be written.
+
+        data: Data to be written.
+
+        force: Writes the file even when unchanged.
+
+            default:= False
+
+        compression: Compression format, see 'AtomicWriter'.
+
+            default:= by suffix of 'filepath'
+
+        compresslevel: Compression level.
+
+            default:= COMPRESSLEVEL
+
+        backend: The JSON package, see
+            'jsondata.JSONDataBackend.get_backend'.
+
+            default:= None
+
+        select: List of JSONPointers, or patterns, of the branches to
+            be written, see 'iterencode_select'.
+
+            default:= None, the complete data
+
+    Returns:
+        'True' when the file is written, 'False' when unchanged.
+
+    Raises:
+        IOError:
+
+        OSError:
+
+        JSONDataValue:
+
+        forwarded from 'json'
+    """
+    backend = get_backend(backend)
+    if select == None:
+        chunks = backend.iterencode(data)
+    else:
+        chunks = iterencode_select(data,select,backend)
+    w = AtomicWriter(filepath,force,compression=compression,compresslevel=compresslevel)
+    try:
+        for chunk in chunks:
+            w.write(chunk)
+    except:
+        w.abort()
+        raise
+    return w.commit()
+
+SELECT_ANY = u'*'
+"""Pattern of a path element of 'iterencode_select', matches each key and index."""
+
+def iterencode_select(data, pointers, backend=None):
+    """Encodes the branches selected by pointers in chunks.
+
+    The selected branches are encoded by the 'iterencode' method of the
+    backend, nested into the containers on their paths, thus the result
+    is a valid JSON document with the structure of 'data' containing the
+    selected branches only. Neither an intermediate tree is built, nor
+    are values copied. For example the pattern '/users/*/name' of::
+
+        {"users": [{"name": "a", "id": 1}, {"name": "b", "id": 2}], "n": 2}
+
+    results in::
+
+        {"users": [{"name": "a"}, {"name": "b"}]}
+
+    The items of the containers are written in the order of 'data'.
+    The items of an array which are not on a selected path are omitted,
+    thus the remaining items are renumbered. Paths which are not present
+    are ignored, as well as the paths through non-container values,
+    and the containers on the paths are written even when empty.
+
+    Args:
+        data: The document.
+
+        pointers: List of JSONPointers, either as 'JSONPointer', or
+            as string in accordance to RFC6901. The path element
+            SELECT_ANY matches each key and index, a path element of
+            '-' matches nothing. The empty pointer selects the document.
+
+        backend: The JSON package, see
+            'jsondata.JSONDataBackend.get_backend'.
+
+            default:= None
+
+    Returns:
+        Iterator of the encoded chunks, the separators are the
+        defaults of 'json.dumps'.
+
+    Raises:
+        JSONDataValue:
+
+        forwarded from 'json'
+    """
+    backend = get_backend(backend)
+    trie = _select_trie(pointers)
+    if trie is True:
+        return iter(backend.iterencode(data))
+    if type(data) not in (dict,list):
+        return iter(('null',))
+    return _select_chunks(data,trie,backend)
+
+def _select_trie(pointers):
+    """Gets the tree of the path elements of 'iterencode_select'.
+
+    Each node is a dict by the path elements, the value 'True'
+    selects the complete branch.
+    """
+    root = {}
+    for p in pointers:
+        if not isinstance(p,JSONPointer):
+            p = JSONPointer(p)
+        path = [unicode(x) for x in p]
+        if not path:
+            return True
+        n = root
+        for x in path[:-1]:
+            n = n.setdefault(x,{})
+            if n is True:
+                break
+        else:
+            n[path[-1]] = True
+    return root
+
+def _select_child(trie, key):
+    """Gets the selection of an item of a container, None when not selected."""
+    if key == SELECT_ANY:
+        return trie.get(key)
+    return _select_merge(trie.get(key),trie.get(SELECT_ANY))
+
+def _select_merge(a, b):
+    """Gets the union of two selections."""
+    if b == None or a is True:
+        return a
+    if a == None or b is True:
+        return b
+    ret = dict(a)
+    for k,v in b.items():
+        ret[k] = _select_merge(ret.get(k),v)
+    return ret
+
+def _select_chunks(node, trie, backend):
+    """Encodes a container on a selected path of 'iterencode_select'."""
+    isdict = type(node) is dict
+    if isdict:
+        yield '{'
+        items = node.iteritems()
+    else:
+        yield '['
+        items = enumerate(node)
+    first = True
+    for k,v in items:
+        sub = _select_child(trie,unicode(k))
+        if sub == None or sub is not True and type(v) not in (dict,list):
+            continue
+        if first:
+            first = False
+        else:
+            yield ', '
+        if isdict:
+            yield backend.dumps(k)
+            yield ': '
+        if sub is True:
+            for chunk in backend.iterencode(v):
+                yield chunk
+        else:
+            for chunk in _select_chunks(v,sub,backend):
+                yield chunk
+    yield '}' if isdict else ']'
+
+def ndjson_read(filepath, backend=None):
+    """Reads a JSON Lines file record by record.
+
+    Each non-empty line contains one JSON document, see
+    'http://jsonlines.org'. The file is read by 'MappedFile', thus
+    compressed files are supported.
+
+    Args:
+        filepath: JSON Lines file to be read.
+
+        backend: The JSON package, see
+            'jsondata.JSONDataBackend.get_backend'.
+
+            default:= None
+
+    Returns:
+        Generator of the records.
+
+    Raises:
+        IOError:
+
+        ValueError: Including the line number.
+    """
+    backend = get_backend(backend)
+    with MappedFile(filepath) as fp:
+        n = 0
+        for line in iter(fp.readline,''):
+            n += 1
+            if not line.strip():
+                continue
+            try:
+                yield backend.loads(line)
+            except ValueError as e:
+                raise ValueError(str(e)+": line "+str(n))
+
+def ndjson_write(filepath, records, force=False, compression=None, compresslevel=COMPRESSLEVEL,
+                 backend=None):
+    """Writes records as a JSON Lines file atomically.
+
+    The records are encoded one at a time into an 'AtomicWriter', thus
+    the memory does not depend on the number of records.
+
+    Args:
+        filepath: JSON Lines file to be written.
+
+        records: Iterable of records, e.g. a 'list' or a generator.
+
+        force: Writes the file even when unchanged.
+
+            default:= False
+
+        compression: Compression format, see 'AtomicWriter'.
+
+            default:= by suffix of 'filepath'
+
+        compresslevel: Compression level.
+
+            default:= COMPRESSLEVEL
+
+        backend: The JSON package, see
+            'jsondata.JSONDataBackend.get_backend'.
+
+            default:= None
+
+    Returns:
+        'True' when the file is written, 'False' when unchanged.
+
+    Raises:
+        IOError:
+
+        OSError:
+
+        JSONDataValue:
+
+        forwarded from 'json'
+    """
+    backend = get_backend(backend)
+    w = AtomicWriter(filepath,force,compression=compression,compresslevel=compresslevel)
+    try:
+        for r in records:
+            w.write(backend.dumps(r))
+            w.write('\n')
+    except:
+        w.abort()
+        raise
+    return w.commit()
+
+
+class SearchIndex(object):
+    """Index of directory listings for the search of files.
+
+    Each directory is listed once, and the listing is kept as long as the
+    'mtime' and the inode of the directory are unchanged. Thus the search
+    of multiple filenames within a search path requires a single 'stat'
+    for each directory, instead of one for each pair of path and filename.
+    The file types of the entries are cached with the listing, and
+    dropped on any change of the directory. The 'stat' of a file is not
+    cached.
+
+    Attributes:
+        **hits**: Number of listings served from the index.
+        **misses**: Number of directories listed.
+    """
+
+    def __init__(self):
+        """Creates an empty index.
+
+        Returns:
+            Results in an initialized object.
+
+        Raises:
+            None.
+        """
+        self.dirs = {}
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        """Number of indexed directories."""
+        return len(self.dirs)
+
+    def clear(self):
+        """Drops all entries."""
+        with self.lock:
+            self.dirs.clear()
+
+    def _entry(self, dirpath):
+        """Gets the validated entry '[key, names, types]' of a directory."""
+        try:
+            st = os.stat(dirpath)
+        except OSError:
+            with self.lock:
+                self.dirs.pop(dirpath,None)
+            return None
+        key = (st.st_mtime, st.st_ino)
+        with self.lock:
+            e = self.dirs.get(dirpath)
+        if e != None and e[0] == key:
+            self.hits += 1
+            return e
+        self.misses += 1
+        try:
+            names = frozenset(os.listdir(dirpath))
+        except OSError:
+            names = frozenset()
+        e = [key, names, {}]
+        with self.lock:
+            self.dirs[dirpath] = e
+        return e
+
+    def listdir(self, dirpath):
+        """Lists a directory by the index.
+
+        Args:
+            dirpath: Directory to be listed.
+
+        Returns:
+            The 'frozenset' of the names, empty for missing directories.
+
+        Raises:
+            None.
+        """
+        e = self._entry(os.path.normpath(dirpath))
+        if e == None:
+            return frozenset()
+        return e[1]
+
+    def stat(self, filepath):
+        """Gets the current 'stat' of a file.
+
+        The listing of the index filters missing files, the present files
+        are checked by 'os.stat' on each call. Thus the result is never
+        stale, e.g. for files rewritten in place.
+
+        Args:
+            filepath: Name of the file.
+
+        Returns:
+            The result of 'os.stat', None when missing.
+
+        Raises:
+            None.
+        """
+        d,f = os.path.split(os.path.normpath(filepath))
+        e = self._entry(d)
+        if e == None or f not in e[1]:
+            return None
+        try:
+            return os.stat(filepath)
+        except OSError:
+            return None
+
+    def isfile(self, filepath):
+        """Same as 'os.path.isfile', by the index.
+
+        The file type is cached with the listing, it changes only by a
+        new entry, which changes the directory.
+        """
+        d,f = os.path.split(os.path.normpath(filepath))
+        e = self._entry(d)
+        if e == None or f not in e[1]:
+            return False
+        try:
+            return e[2][f]
+        except KeyError:
+            pass
+        st = self.stat(filepath)
+        e[2][f] = isfile = st != None and stat.S_ISREG(st.st_mode)
+        return isfile
+
+    def resolve(self, pathlist, filelist):
+        """Searches filenames within a list of directories.
+
+        Absolute filenames are accepted as provided. Relative names are
+        searched in each directory of 'pathlist', all matches are
+        returned.
+
+        Args:
+            pathlist: List of directories in the order of the search.
+
+            filelist: List of filenames.
+
+        Returns:
+            The tuple '(filepathlist, missing)', where 'missing' is the
+            list of relative names not found at all.
+
+        Raises:
+            None.
+        """
+        listings = [(p, self.listdir(p)) for p in pathlist]
+        filepathlist = []
+        missing = []
+        for f in filelist:
+            if os.path.isabs(f):
+                filepathlist.append(f)
+                continue
+            found = False
+            for p,names in listings:
+                if f not in names and not os.path.dirname(f):
+                    continue
+                fx = os.path.join(p,f)
+                if self.isfile(fx): # relative names with directories by 'stat'
+                    filepathlist.append(fx)
+                    found = True
+            if not found:
+                missing.append(f)
+        return filepathlist, missing
+
+searchindex = SearchIndex()
+"""The process-wide search index shared by all instances."""
+
+
+def _mtime(filepath):
+    """Gets the 'mtime' of a file, None when missing."""
+    try:
+        return os.stat(filepath).st_mtime
+    except OSError:
+        return None
+
+def manifest_read(filepath, pathlist, filelist):
+    """Reads a manifest of resolved files, written by 'manifest_write'.
+
+    The manifest is valid when the search parameters are the same, and
+    the 'mtime' of each directory of the search path, and of each file is
+    unchanged. Thus a valid manifest replaces the search, no directory
+    is listed.
+
+    Args:
+        filepath: The manifest file.
+
+        pathlist: List of directories in the order of the search.
+
+        filelist: List of filenames.
+
+    Returns:
+        The tuple '(filepathlist, missing, schemas)', see 'manifest_write',
+        or None when missing or outdated.
+
+    Raises:
+        None.
+    """
+    try:
+        m = json_read(filepath)
+        if m.get('version') != 1:
+            return None
+        if m['pathlist'] != list(pathlist) or m['filelist'] != list(filelist):
+            return None
+        for d,t in m['dirs']:
+            if _mtime(d) != t:
+                return None
+        filepathlist = []
+        schemas = {}
+        for f,t,s,st in m['files']:
+            if _mtime(f) != t:
+                return None
+            if s != None and _mtime(s) != st:
+                return None
+            filepathlist.append(f)
+            schemas[f] = s
+        missing = list(m['missing'])
+    except (IOError,OSError,ValueError,TypeError,KeyError,AttributeError):
+        return None
+    return filepathlist, missing, schemas
+
+def manifest_write(filepath, pathlist, filelist, filepathlist, missing, schemas):
+    """Writes a manifest of resolved files for 'manifest_read'.
+
+    The file is replaced atomically, and only when changed, thus the
+    manifest could be updated by each start.
+
+    Args:
+        filepath: The manifest file.
+
+        pathlist: List of directories in the order of the search.
+
+        filelist: List of filenames.
+
+        filepathlist: The resolved files.
+
+        missing: The filenames not found.
+
+        schemas: Dictionary of the co-located schema file of each
+            data file, or None.
+
+    Returns:
+        'True' when the file is written, 'False' when unchanged.
+
+    Raises:
+        IOError:
+
+        OSError:
+    """
+    m = {
+        'version': 1,
+        'pathlist': list(pathlist),
+        'filelist': list(filelist),
+        'dirs': [[d,_mtime(d)] for d in pathlist],
+        'files': [],
+        'missing': list(missing),
+    }
+    for f in filepathlist:
+        s = schemas.get(f)
+        m['files'].append([f, _mtime(f), s, s and _mtime(s)])
+    return json_write(filepath,m)
+
+class IOResult(object):
+    """Result of a call submitted to 'IOExecutor'.
+
+    Provides the interface of 'multiprocessing.pool.AsyncResult', thus
+    could be polled, or waited for.
+    """
+
+    def __init__(self, callback=None):
+        self._callback = callback
+        self._event = threading.Event()
+        self._success = None
+        self._value = None
+
+    def ready(self):
+        """Checks whether the call is completed."""
+        return self._event.is_set()
+
+    def successful(self):
+        """Checks whether the call is completed without an exception.
+
+        Raises:
+            AssertionError: Not yet completed.
+        """
+        assert self.ready()
+        return self._success
+
+    def wait(self, timeout=None):
+        """Waits for the completion of the call."""
+        self._event.wait(timeout)
+
+    def get(self, timeout=None):
+        """Gets the result of the call.
+
+        Args:
+            timeout: Maximum time to wait in seconds.
+
+                default:= None
+
+        Returns:
+            The result of the call.
+
+        Raises:
+            multiprocessing.TimeoutError:
+
+            forwarded from the call
+        """
+        self.wait(timeout)
+        if not self.ready():
+            raise multiprocessing.TimeoutError
+        if self._success:
+            return self._value
+        raise self._value
+
+    def _set(self, success, value):
+        """Completes the result, calls the callback when successful."""
+        self._success = success
+        self._value = value
+        try:
+            if success and self._callback != None:
+                self._callback(value)
+        finally:
+            self._event.set()
+
+class IOExecutor(object):
+    """Bounded pool of threads for the asynchronous file I/O.
+
+    The asynchronous methods of 'JSONDataSerializer' and 'JSONPatch'
+    submit the complete call including the read, parse, validation,
+    and encoding. Python2 provides no 'asyncio', thus the calls return
+    an 'IOResult', which could be polled, or waited for by an event
+    loop within a thread, or completed by a callback. The number of
+    concurrent loads is limited additionally, which bounds the memory
+    for the parse of many files. The loads beyond the limit are queued
+    by the executor, and started by the completion of a previous load.
+    Thus neither the caller, nor the threads of the pool wait for a
+    load, and the exports proceed. The pool is started by the first
+    call.
+
+    Attributes:
+        **workers**: Number of threads.
+        **maxloads**: Maximum number of concurrent loads.
+    """
+
+    def __init__(self, workers=None, maxloads=None):
+        """Creates an executor.
+
+        Args:
+            workers: Number of threads.
+
+                default:= cpu_count()
+
+            maxloads: Maximum number of concurrent loads.
+
+                default:= workers
+
+        Returns:
+            Results in an initialized object.
+
+        Raises:
+            None.
+        """
+        if workers == None:
+            try:
+                workers = multiprocessing.cpu_count()
+            except NotImplementedError:
+                workers = 1
+        self.workers = max(1,workers)
+        self.maxloads = maxloads or self.workers
+        self.pool = None
+        self.lock = threading.Lock()
+        self.idle = threading.Condition(self.lock) # no load running or queued
+        self._loads = 0 # running loads
+        self._queued = collections.deque() # loads beyond 'maxloads'
+
+    def __copy__(self):
+        # shared by the copies of 'JSONDataSerializer'
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def submit(self, func, args=(), kargs=None, callback=None, load=False):
+        """Calls a function by a thread of the pool.
+
+        Args:
+            func: The function.
+
+            args: The positional parameters.
+
+                default:= ()
+
+            kargs: The keyword parameters.
+
+                default:= None
+
+            callback: Called with the result when successful, by the
+                thread of the pool, thus has to return fast.
+
+                default:= None
+
+            load: Counts the call as a load, which is queued while
+                'maxloads' loads are running.
+
+                default:= False
+
+        Returns:
+            The 'IOResult' of the call, 'get' returns the result, or
+            raises the exception of the call.
+
+        Raises:
+            None.
+        """
+        result = IOResult(callback)
+        call = (func,args,kargs or {},load,result)
+        with self.lock:
+            if self.pool == None:
+                self.pool = ThreadPool(self.workers)
+            if load:
+                if self._loads >= self.maxloads:
+                    self._queued.append(call)
+                    return result
+                self._loads += 1
+            pool = self.pool
+        pool.apply_async(self._call,call)
+        return result
+
+    def _call(self, func, args, kargs, load, result):
+        """Executes a call within a thread of the pool, starts the next queued load."""
+        try:
+            try:
+                value = func(*args,**kargs)
+            except Exception as e:
+                result._set(False,e)
+            else:
+                result._set(True,value)
+        finally:
+            if load:
+                with self.lock:
+                    if self._queued:
+                        call = self._queued.popleft()
+                        pool = self.pool
+                    else:
+                        call = None
+                        self._loads -= 1
+                        if not self._loads:
+                            self.idle.notify_all()
+                if call != None:
+                    pool.apply_async(self._call,call)
+
+    def close(self):
+        """Completes the submitted calls, and terminates the threads.
+
+        A later call of 'submit' starts a new pool.
+        """
+        with self.lock:
+            while self._loads: # the queued loads require the pool
+                self.idle.wait()
+            pool,self.pool = self.pool,None
+        if pool != None:
+            pool.close()
+            pool.join()
+
+ioexecutor = IOExecutor()
+"""The process-wide executor of the asynchronous calls."""
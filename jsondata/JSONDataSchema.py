@@ -0,0 +1,381 @@
+# -*- coding:utf-8   -*-
+"""Local registry of JSON-Schema files for the resolution of '$ref'.
+
+The package 'jsonschema' resolves each reference lazily by the URI,
+which may read files repeatedly, and fetches remote documents. The
+registry indexes the schema files of a set of directories once by
+the file URI and by the 'id' of the schemas and sub-schemas. The
+references are pre-resolved into direct references of the Python
+objects, thus the validation requires no I/O at all, and the network
+is never accessed. Unknown references raise an exception.
+
+* **SchemaRegistry**:
+    Index of the schema files, and the resolved schemas.
+
+The meta-schemas provided by 'jsonschema' are registered by their 'id'.
+"""
+__author__ = 'Arno-Can Uestuensoez'
+__maintainer__ = 'Arno-Can Uestuensoez'
+__license__ = "Artistic-License-2.0 + Forced-Fairplay-Constraints"
+__copyright__ = "Copyright (C) 2015-2016 Arno-Can Uestuensoez @Ingenieurbuero Arno-Can Uestuensoez"
+__version__ = '0.2.18'
+__uuid__='63b597d6-4ada-4880-9f99-f5e0961351fb'
+
+import sys
+version = '{0}.{1}'.format(*sys.version_info[:2])
+if not version in ('2.6','2.7',): # pragma: no cover
+    raise Exception("Requires Python-2.6.* or higher")
+
+import os
+import copy
+import urllib
+import threading
+import warnings
+from urlparse import urljoin,urldefrag
+
+from jsonschema.validators import meta_schemas
+
+from jsondata.JSONDataExceptions import JSONDataValue,JSONDataSourceFile
+from jsondata.JSONDataIO import schemacache,searchindex
+
+SCHEMA_SUFFIX = '.jsd'
+"""Suffix of the indexed schema files."""
+
+# keywords with sub-schemas as values of a map
+_MAPS = (u'properties',u'patternProperties',u'definitions',u'dependencies',)
+
+# keywords with values which are not schemas
+_VALUES = (u'enum',u'default',)
+
+def fileuri(filepath):
+    """Gets the 'file' URI of the realpath of a file."""
+    return 'file://'+urllib.pathname2url(os.path.realpath(filepath))
+
+class SchemaRegistry(object):
+    """Index of local JSON-Schema files, and the resolved schemas.
+
+    The schemas are resolved on the first request after a change of
+    the index. The resolved schemas are copies, the parsed files are
+    shared with 'jsondata.JSONDataIO.schemacache'. The files are read
+    at the time of the registration, later changes require a new
+    registration.
+
+    Attributes:
+        **documents**: The registered schemas by the URI, each as the
+            tuple '(filepath, schema)', the filepath is None for the
+            schemas registered from memory.
+    """
+
+    def __init__(self, pathlist=None, recursive=False, backend=None, loadcached=False):
+        """Creates a registry, and indexes the schema files of the directories.
+
+        Args:
+            pathlist: List of directories, either a PATH like string, or
+                a list of single paths. Missing directories are ignored.
+
+                default:= None
+
+            recursive: Indexes the subdirectories.
+
+                default:= False
+
+            backend: The JSON package for the parse, see
+                'jsondata.JSONDataBackend.get_backend'.
+
+                default:= None
+
+            loadcached: Use of the load cache, see
+                'jsondata.JSONDataIO.json_load'.
+
+                default:= False
+
+        Returns:
+            Results in an initialized object.
+
+        Raises:
+            None.
+        """
+        self.backend = backend
+        self.loadcached = loadcached
+        self.documents = {}
+        self.lock = threading.RLock()
+        self._nodes = None # the resolved schemas by URI
+        self._compiled = {} # id(resolved) -> [resolved, origin, checked, validators]
+
+        for cls in meta_schemas.values():
+            u = urldefrag(cls.META_SCHEMA.get(u'id',u''))[0]
+            if u:
+                self.documents[u] = (None,cls.META_SCHEMA)
+
+        if pathlist:
+            if type(pathlist) != list:
+                pathlist = pathlist.split(os.pathsep)
+            for p in pathlist:
+                if p:
+                    self.add_path(p,recursive)
+
+    def add_path(self, path, recursive=False):
+        """Indexes the schema files of a directory.
+
+        The directories of the search path may contain arbitrary files,
+        thus files which could not be read or parsed are skipped with a
+        warning. A required file is indexed by 'add_file', or by
+        'resolve', which raise an exception for these.
+
+        Args:
+            path: The directory, ignored when missing.
+
+            recursive: Indexes the subdirectories.
+
+                default:= False
+
+        Returns:
+            The number of indexed files.
+
+        Raises:
+            None.
+        """
+        path = os.path.realpath(os.path.expandvars(os.path.expanduser(path)))
+        if recursive:
+            filepaths = [os.path.join(d,f) for d,_dirs,files in os.walk(path)
+                         for f in sorted(files) if f.endswith(SCHEMA_SUFFIX)]
+        else:
+            filepaths = [os.path.join(path,f) for f in sorted(searchindex.listdir(path))
+                         if f.endswith(SCHEMA_SUFFIX) and searchindex.isfile(os.path.join(path,f))]
+        n = 0
+        for f in filepaths:
+            try:
+                self.add_file(f)
+            except JSONDataSourceFile as e:
+                warnings.warn("Skipped schema file: "+str(e))
+                continue
+            n += 1
+        return n
+
+    def add_file(self, filepath):
+        """Indexes a schema file.
+
+        Args:
+            filepath: The schema file.
+
+        Returns:
+            The URI of the file.
+
+        Raises:
+            JSONDataSourceFile:
+        """
+        uri = fileuri(filepath)
+        try:
+            schema = schemacache.load(filepath,self.backend,self.loadcached)
+        except (IOError,OSError,ValueError,) as e:
+            raise JSONDataSourceFile("read","schemafile",str(filepath),str(e))
+        with self.lock:
+            if self.documents.get(uri,(None,None))[1] is not schema:
+                self.documents[uri] = (os.path.realpath(filepath),schema)
+                self._reset()
+        return uri
+
+    def add_schema(self, schema, uri):
+        """Registers an in-memory schema.
+
+        Args:
+            schema: The schema, which must not be modified later.
+
+            uri: The base URI of the schema.
+
+        Returns:
+            None.
+
+        Raises:
+            None.
+        """
+        with self.lock:
+            self.documents[urldefrag(uri)[0]] = (None,schema)
+            self._reset()
+
+    def resolve(self, ref):
+        """Gets a resolved schema.
+
+        Args:
+            ref: One of:
+
+                <filepath>: A schema file, indexed when not yet present.
+
+                <uri>: The URI of a schema, or of a sub-schema by the
+                    fragment.
+
+        Returns:
+            The schema with direct references instead of '$ref'.
+
+        Raises:
+            JSONDataValue:
+
+            JSONDataSourceFile:
+        """
+        if not ':' in ref.split('/')[0]: # a filepath
+            if not os.path.isfile(ref):
+                raise JSONDataSourceFile("open","schemafile",str(ref))
+            uri = fileuri(ref)
+            if uri not in self.documents:
+                self.add_file(ref)
+            ref = uri
+        with self.lock:
+            if self._nodes == None:
+                self._build()
+            r = self._target({u'$ref': ref},u'',self._nodes)
+            if id(r) not in self._compiled: # a sub-schema, checked by the document
+                origin = self.documents.get(urldefrag(ref)[0],(None,None))[1]
+                self._compiled[id(r)] = [r,origin,set(),{}]
+            return r
+
+    def validator(self, ref, cls):
+        """Gets the compiled validator of a resolved schema.
+
+        Args:
+            ref: The schema, see 'resolve'.
+
+            cls: The validator class, e.g. 'jsonschema.Draft4Validator'.
+
+        Returns:
+            The validator for the calling thread.
+
+        Raises:
+            JSONDataValue:
+
+            JSONDataSourceFile:
+
+            jsonschema.SchemaError:
+        """
+        return self.compiled(self.resolve(ref),cls)
+
+    def compiled(self, schema, cls):
+        """Gets the compiled validator of a schema provided by 'resolve'.
+
+        The schema is checked once by the unresolved document.
+
+        Args:
+            schema: The resolved schema.
+
+            cls: The validator class.
+
+        Returns:
+            The validator for the calling thread, or None when 'schema'
+            is not provided by the registry.
+
+        Raises:
+            jsonschema.SchemaError:
+        """
+        with self.lock:
+            entry = self._compiled.get(id(schema))
+        if entry == None or entry[0] is not schema:
+            return None
+        tkey = (cls,threading.current_thread().ident)
+        v = entry[3].get(tkey)
+        if v == None:
+            if cls not in entry[2]:
+                if entry[1] != None:
+                    cls.check_schema(entry[1])
+                entry[2].add(cls)
+            v = entry[3][tkey] = cls(schema)
+        return v
+
+    def _reset(self):
+        """Drops the resolved schemas after a change of the index."""
+        self._nodes = None
+        self._compiled = {}
+
+    def _build(self):
+        """Resolves all registered schemas."""
+        copies = {}
+        for uri,(_f,doc) in self.documents.items():
+            copies[uri] = copy.deepcopy(doc)
+        nodes = dict(copies)
+        for uri,c in copies.items():
+            self._index(c,uri,nodes,True)
+        for uri,c in copies.items():
+            self._replace(c,uri,nodes,set(),True)
+        for uri,c in copies.items():
+            r = self._target(c,uri,nodes)
+            self._compiled[id(r)] = [r,self.documents[uri][1],set(),{}]
+        self._nodes = nodes
+
+    def _index(self, node, base, nodes, keywords):
+        """Registers the sub-schemas with an 'id'."""
+        if type(node) is dict:
+            if keywords:
+                i = node.get(u'id')
+                if isinstance(i,basestring):
+                    u = urljoin(base,i)
+                    nodes.setdefault(u,node)
+                    d,frag = urldefrag(u)
+                    if not frag:
+                        base = d
+            for k,v in node.items():
+                if keywords and k in _VALUES:
+                    continue
+                if type(v) in (dict,list):
+                    self._index(v,base,nodes,not (keywords and k in _MAPS))
+        elif type(node) is list:
+            for v in node:
+                if type(v) in (dict,list):
+                    self._index(v,base,nodes,True)
+
+    def _replace(self, node, base, nodes, seen, keywords):
+        """Replaces the '$ref' objects by the referenced schemas."""
+        if id(node) in seen:
+            return
+        seen.add(id(node))
+        if type(node) is dict:
+            if keywords:
+                i = node.get(u'id')
+                if isinstance(i,basestring):
+                    base = urldefrag(urljoin(base,i))[0] or base
+            items = node.items()
+        else:
+            items = enumerate(node)
+        for k,v in items:
+            if type(node) is dict and keywords and k in _VALUES:
+                continue
+            sub = not (type(node) is dict and keywords and k in _MAPS)
+            if sub and type(v) is dict and isinstance(v.get(u'$ref'),basestring):
+                node[k] = self._target(v,base,nodes)
+            elif type(v) in (dict,list):
+                self._replace(v,base,nodes,seen,sub)
+
+    def _target(self, node, base, nodes):
+        """Follows a chain of '$ref' objects to the referenced schema."""
+        n = 0
+        while type(node) is dict and isinstance(node.get(u'$ref'),basestring):
+            uri = urljoin(base,node[u'$ref'])
+            n += 1
+            if n > 64:
+                raise JSONDataValue("cyclic","$ref",str(uri))
+            if uri in nodes: # document, or sub-schema by 'id'
+                node = nodes[uri]
+                base = urldefrag(uri)[0]
+                continue
+            base,frag = urldefrag(uri)
+            if base not in nodes:
+                raise JSONDataValue("unresolved","$ref",str(uri))
+            node = _fragment(nodes[base],frag,uri)
+        return node
+
+def _fragment(node, frag, uri):
+    """Gets the node of a JSONPointer fragment."""
+    frag = urllib.unquote(frag)
+    if type(frag) is str:
+        frag = frag.decode('utf-8')
+    if not frag:
+        return node
+    if frag[0] != u'/':
+        raise JSONDataValue("unresolved","$ref",str(uri))
+    for x in frag[1:].split(u'/'):
+        x = x.replace(u'~1',u'/').replace(u'~0',u'~')
+        try:
+            if type(node) is list:
+                node = node[int(x)]
+            else:
+                node = node[x]
+        except (KeyError,IndexError,ValueError,TypeError,):
+            raise JSONDataValue("unresolved","$ref",str(uri))
+    return node
@@ -15,14 +15,13 @@ if not version in ('2.6','2.7',): # pragma: no cover
 # if version < '2.7': # pragma: no cover
 #     raise Exception("Requires Python-2.7.* or higher")
 
-#
-# Check whether the application has selected a verified JSON package
-if sys.modules.get('json'):
-    import json as myjson #@UnusedImport
-elif sys.modules.get('ujson'):
-    import ujson as myjson
-else:
-    import json as myjson
+import copy
+import marshal
+import threading
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+import cPickle as pickle
+import urllib
 
 from jsondata.JSONData import MODE_SCHEMA_OFF,MODE_SCHEMA_DRAFT3,MODE_SCHEMA_DRAFT4
 from jsondata.JSONData import MATCH_NO,MATCH_KEY,MATCH_CHLDATTR,MATCH_INDEX,MATCH_MEM
@@ -32,7 +31,24 @@ _interactive = False
 
 # generic exceptions for 'jsondata'
 from jsondata.JSONDataExceptions import JSONDataException,JSONDataValue,JSONDataSourceFile,JSONDataTargetFile
-from jsondata.JSONData import JSONData,JSONDataAmbiguity
+from jsondata.JSONDataExceptions import JSONDataNodeType
+from jsondata.JSONData import JSONData,JSONDataAmbiguity,_validator_class
+from jsonschema.validators import validator_for
+from jsondata.JSONDataIO import json_load,json_read,json_write,snapshot_write,COMPRESSLEVEL
+from jsondata.JSONDataIO import ndjson_read,ndjson_write
+from jsondata.JSONDataIO import searchindex,manifest_read,manifest_write,compression_of
+from jsondata.JSONDataIO import LoadCache,schemacache,ioexecutor
+from jsondata.JSONDataBackend import get_backend
+from jsondata.JSONDataSchema import SchemaRegistry
+
+# serializes the modifications by the asynchronous calls
+_asynclock = threading.RLock()
+
+SUBDATA_POINTER = '$pointer'
+"""Reserved member of sub-data files, the JSONPointer of the target branch."""
+
+SPLIT_INDEX = 'index.json'
+"""Layout and root data of a directory written by 'split_export'."""
 
 class JSONDataSerializer(JSONData):
     """Persistency of JSON based data for the class jsondata.JSONData.
@@ -170,12 +186,38 @@ class JSONDataSerializer(JSONData):
                 interactive: Hints on command line call for optional change of display format. 
                     
                     default:= False
-                loadcached: Caching of load for JSON data files.
-                    Loads either completely into cache before transferring to
-                    production entries, or immediately into production parameters,
-                    which may take an effect on the remaining parameters to be loaded.
+                backend: The JSON package for scan, parse, and encoding,
+                    see 'jsondata.JSONDataBackend.get_backend'. The value
+                    'auto' selects the fastest installed package which
+                    passes the conformance check.
+                    
+                    default:= DEFAULT_BACKEND
+                executor: The executor of the asynchronous calls, see
+                    'json_import_async'.
+                    
+                    default:= jsondata.JSONDataIO.ioexecutor
+                loadcached: Caching of load for JSON data and schema files.
+                    The parsed files are cached by the key '(realpath, mtime, 
+                    size, inode)', thus unchanged files are not parsed again,
+                    see 'jsondata.JSONDataIO.LoadCache'. The values are:
+                    
+                    False: Read and parse each file.
+
+                    True: Use the process-wide in-memory cache.
+
+                    <directory>: Use the in-memory cache, and store the parsed
+                        files persistently within the directory for reuse by
+                        later processes.
                     
                     default:= False
+                manifest: File for the manifest of the files resolved by
+                    the search of 'filelist' within 'pathlist', including
+                    the co-located schema files and the 'mtime' of each.
+                    While the search path and the files are unchanged,
+                    the manifest replaces the search on later starts,
+                    else it is updated, see 'jsondata.JSONDataIO.manifest_read'.
+                    
+                    default:= None
                 nodefaultpath: Ignores the default paths, the exception is the
                     base configuration, which still is searched within the default
                     paths exclusively.
@@ -187,6 +229,25 @@ class JSONDataSerializer(JSONData):
                     Either a PATH like string, or a list of single paths.
                     
                     default:= ../dirname(__file__)/etc/:dirname(__file__)/:/etc/:$HOME/etc/
+                pluginspathlist: List of directories with sub-data files,
+                    loaded after the data and inserted as additional
+                    branches, see 'subdata_import'. Either a PATH like
+                    string, or a list of single paths.
+                    
+                    default:= []
+                processes: Number of worker processes for the load of
+                    the sub-data files. When provided, the multiple files
+                    found by 'filelist' and 'filepathlist' are parsed and
+                    validated by the processes too, instead of the
+                    threads of 'workers'.
+                    
+                    default:= cpu_count()
+                reloadable: Keeps the loaded version of each data and
+                    sub-data file for the incremental reload of changed
+                    files, see 'reload' and 'watch'. The versions are
+                    kept as 'marshal' records.
+                    
+                    default:= False
                 requires: [all, base, one]
                     Defines how to handle missing or invalid files.
                     
@@ -197,12 +258,34 @@ class JSONDataSerializer(JSONData):
                 schemafile: Filepathname of JSONschema file.
                     
                     default:= <appname>.jsd
+                schemaregistry: Resolves '$ref' within the schemas by a
+                    local registry of the schema files, see
+                    'jsondata.JSONDataSchema.SchemaRegistry'. The
+                    references are resolved once, the network is never
+                    accessed. The values are:
+
+                    True: Indexes the schema files within 'pathlist',
+                        and the directory of each loaded schema file.
+
+                    <registry>: Applies the provided registry, which
+                        could be shared by multiple instances.
+
+                    default:= None
                 validator: [default, draft3, off, ]
                     Sets schema validator for the data file.
                     The values are: default=validate, draft3=Draft3Validator,
                     off=None
                     
                     default:= validate
+                workers: Number of threads for the concurrent load and
+                    validation of multiple files found by 'filelist' and
+                    'filepathlist'. The loaded data is hooked-in in the
+                    order of the files, a value less than 2 loads
+                    sequentially. The threads overlap the I/O only, the
+                    parse and the validation in parallel require
+                    'processes'.
+
+                    default:= min(#files, cpu_count())
 
                 printdata: branch=None
                     Pretty print resulting final data of branch.
@@ -251,8 +334,19 @@ class JSONDataSerializer(JSONData):
         kimp={}
         
         self.nodefaultpath = False
-        self.nodesubdata = False
+        self.nosubdata = False
+        self.pluginspathlist = []
+        self.processes = None
+        self.reloadable = False
+        self._sources = [] # [filepath, key, prefix, record, loader]
+        self.executor = ioexecutor
+        self._splitdir = None
+        self._splitspec = None # None for each top-level item
+        self._splitfiles = {}
+        self._splitcompression = None
         self.requires = False
+        self.workers = None
+        self.manifest = None
 
         # Either provided explicitly, or for search.
         self.datafile = None
@@ -303,22 +397,34 @@ class JSONDataSerializer(JSONData):
                 self.datafile = v
             elif k == 'filepathlist':
                 self.filepathlist = v
+            elif k == 'executor':
+                self.executor = v
             elif k == 'filepriority':
                 self.filepriority = v
             elif k == 'indent_str':
                 self.indent_str = v
             elif k == 'loadcached':
                 self.loadcached = v
+            elif k == 'manifest':
+                self.manifest = v
             elif k == 'nodefaultpath':
                 self.nodefaultpath = v
-            elif k == 'nodesubdata':
-                self.nodesubdata = v
+            elif k in ('nosubdata','nodesubdata',):
+                self.nosubdata = v
+            elif k == 'pluginspathlist':
+                self.pluginspathlist = v
+            elif k == 'processes':
+                self.processes = v
+            elif k == 'reloadable':
+                self.reloadable = v
             elif k == 'requires':
                 self.requires = v
             elif k == 'schemafile':
                 self.schemafile = v
             elif k == 'validator':
                 self.validator = v
+            elif k == 'workers':
+                self.workers = v
 
         if __debug__:
             if self.debug:
@@ -350,19 +456,14 @@ class JSONDataSerializer(JSONData):
         # canonical
         self.pathlist = [os.path.realpath(os.path.abspath(p))+os.sep for p in self.pathlist]
 
+        # local '$ref' by the schema files of the search path
+        if self.schemaregistry is True:
+            self.schemaregistry = SchemaRegistry(self.pathlist,backend=self.backend,loadcached=self.loadcached)
+
+        self._schemapairs = {}
         if not self.datafile: # No explicit given
             if self.filelist:
-                for f in self.filelist:
-                    if os.path.isabs(f):
-                        self.filepathlist.append(f)
-                        self.filelist.remove(f)
-                    else:
-                        for p in self.pathlist:
-                            fx=p+os.sep+f
-                            if os.path.isfile(fx):
-                                self.filepathlist.append(fx)
-                                if f in self.filelist: # could occur under multiple paths
-                                    self.filelist.remove(f)
+                self._resolve_files()
 
         elif not os.path.isfile(self.datafile): # a provided datafile has to exist
             raise JSONDataSourceFile("open","datafile",str(self.datafile))
@@ -381,8 +482,9 @@ class JSONDataSerializer(JSONData):
                         self.schemafile = os.path.splitext(self.datafile)[0]+'.jsd'
                 elif self.filepathlist: # search, use the first found
                     for f in self.filepathlist:
-                        if os.path.isfile(f) and os.path.isfile(os.path.splitext(f)[0]+".jsd"):
-                            self.schemafile = os.path.splitext(f)[0]+".jsd"
+                        sf = self._schemapair(f)
+                        if sf:
+                            self.schemafile = sf
                             break # just use the first valid-pair
                         raise JSONDataSourceFile("open","schemafile",str(self.filepathlist))
                 else:
@@ -411,9 +513,21 @@ class JSONDataSerializer(JSONData):
         onenok = False
         if not self.datafile: # No explicit given
             if self.filepathlist:
-                for f in self.filepathlist:
-                    if self.json_import(self.branch,None,f,self.schemafile,**kimp):
+                # the schema is already loaded by setSchema, thus shared
+                schemafile = self.schemafile
+                if schemafile and self.schema:
+                    kimp['schema'] = self.schema
+                    schemafile = None
+
+                # load and validate concurrently, hook-in in the given order
+                branches = self._import_branches(self.filepathlist,schemafile,self.workers,self.processes,**kimp)
+                for f,(ok,jval) in zip(self.filepathlist,branches):
+                    if not ok:
+                        raise jval[0],jval[1],jval[2]
+                    if self._hook_branch(self.branch,None,jval):
                         confok=True
+                        if self.reloadable and self.data is jval:
+                            self._track(f,[],jval,('data',schemafile,dict(kimp)))
                     else:
                         onenok = True
 
@@ -438,12 +552,75 @@ class JSONDataSerializer(JSONData):
             if os.path.exists(self.datafile):
                 if not self.schemafile and self.schema:
                     kimp['schema'] = self.schema
-                self.json_import(self.branch, None, self.datafile, self.schemafile,**kimp)
+                jval = self._import_branch(self.datafile, self.schemafile,**kimp)
+                self._hook_branch(self.branch, None, jval)
+                if self.reloadable and self.data is jval:
+                    self._track(self.datafile,[],jval,('data',self.schemafile,dict(kimp)))
+
+        #
+        # load sub-data, e.g. of plugins
+        #
+        if not self.nosubdata and self.pluginspathlist:
+            self.subdata_import(self.pluginspathlist)
+
+    def _resolve_files(self):
+        """Searches the 'filelist' within the 'pathlist'.
+
+        The directories are listed once by the shared index
+        'jsondata.JSONDataIO.searchindex', and the result is read from,
+        or written to the optional manifest. The found files are appended
+        to 'filepathlist', and removed from 'filelist'.
+
+        Returns:
+            None.
+
+        Raises:
+            None.
+        """
+        filelist = list(self.filelist)
+        if self.manifest:
+            m = manifest_read(self.manifest,self.pathlist,filelist)
+            if m != None:
+                filepathlist,self.filelist,self._schemapairs = m
+                self.filepathlist.extend(filepathlist)
+                return
+
+        filepathlist,self.filelist = searchindex.resolve(self.pathlist,filelist)
+        self.filepathlist.extend(filepathlist)
+
+        if self.manifest:
+            for f in filepathlist:
+                self._schemapair(f)
+            try:
+                manifest_write(self.manifest,self.pathlist,filelist,filepathlist,self.filelist,self._schemapairs)
+            except (IOError,OSError): # it is a cache only
+                pass
+
+    def _schemapair(self, datafile):
+        """Gets the co-located schema file of a data file, or None."""
+        try:
+            return self._schemapairs[datafile]
+        except KeyError:
+            pass
+        sf = os.path.splitext(datafile)[0]+".jsd"
+        if not searchindex.isfile(datafile) or not searchindex.isfile(sf):
+            sf = None
+        self._schemapairs[datafile] = sf
+        return sf
 
     def json_export(self, sourcenode, fname, **kargs):
         """ Exports current data for later import.
 
-        The exported data is a snapshot of current state.
+        The exported data is a snapshot of current state. The file is
+        replaced atomically, and not touched at all when the contents
+        are unchanged, see 'jsondata.JSONDataIO.json_write'. Files with
+        the suffix '.gz', '.bz2', or '.xz' are compressed.
+
+        The export could be restricted to a set of branches selected by
+        JSONPointers, or patterns, e.g. '/services' and '/users/*/name'.
+        These are streamed into the file nested into the containers on
+        their paths, without a temporary copy, see
+        'jsondata.JSONDataIO.iterencode_select'.
 
         Args:
             fname: File name for the exported data.
@@ -452,7 +629,30 @@ class JSONDataSerializer(JSONData):
                 None for complete JSON document.
 
             **kargs:
-                ffs.
+                force: Writes the file even when the contents are
+                    unchanged.
+
+                    default:= False
+
+                compression: Compression format, one of 'gz', 'bz2',
+                    'xz', or False for uncompressed.
+
+                    default:= by suffix of 'fname'
+
+                compresslevel: Compression level, 1 to 9.
+
+                    default:= 9
+
+                backend: The JSON package for the encoding, see
+                    'jsondata.JSONDataBackend.get_backend'.
+
+                    default:= self.backend
+
+                pointers: List of JSONPointers relative to 'sourcenode'
+                    of the exported branches, the path element '*'
+                    matches each key and index.
+
+                    default:= None, the complete 'sourcenode'
 
         Returns:
             When successful returns 'True', else returns either 'False',
@@ -461,16 +661,91 @@ class JSONDataSerializer(JSONData):
         Raises:
             JSONDataTargetFile:
         """
+        force = kargs.get('force',False)
+        compression = kargs.get('compression',None)
+        compresslevel = kargs.get('compresslevel',COMPRESSLEVEL)
+        backend = get_backend(kargs.get('backend',self.backend))
+        pointers = kargs.get('pointers',None)
         if not sourcenode:
             sourcenode = self.data
         try:
-            with open(fname, 'w') as fp:
-                #ret = 
-                myjson.dump(sourcenode, fp)
+            json_write(fname,sourcenode,force,compression,compresslevel,backend,pointers)
         except Exception as e:
             raise JSONDataTargetFile("open-"+str(e),"data.dump",str(fname))
         return True
 
+    def json_export_async(self, sourcenode, fname, **kargs):
+        """ Exports data asynchronously by a thread of the executor.
+
+        The data is encoded and written by the executor, exclusive to the
+        insertion by the asynchronous imports. For the parameters refer
+        to 'json_export'.
+
+        Args:
+            **kargs: Additional to 'json_export':
+                callback: Called with the result when successful, see
+                    'jsondata.JSONDataIO.IOExecutor.submit'.
+
+                    default:= None
+
+                executor: The executor.
+
+                    default:= self.executor
+
+        Returns:
+            The 'IOResult' of the call, 'get' returns the result of
+            'json_export', or raises its exception.
+
+        Raises:
+            None.
+        """
+        executor = kargs.pop('executor',self.executor)
+        callback = kargs.pop('callback',None)
+        return executor.submit(self._locked,(self.json_export,sourcenode,fname),kargs,callback)
+
+    def json_import_async(self, targetnode, key, datafile, schemafile=None, **kargs):
+        """ Imports and validates data asynchronously by a thread of the executor.
+
+        The file is read, parsed, and validated by the executor, the
+        number of concurrent loads is limited by its queue, the call
+        returns immediately. The insertion into the data is exclusive
+        to the other asynchronous calls. Thus the import of many files is started by one call each,
+        and proceeds concurrently. For the parameters refer to
+        'json_import'.
+
+        Args:
+            **kargs: Additional to 'json_import':
+                callback: Called with the result when successful, see
+                    'jsondata.JSONDataIO.IOExecutor.submit'.
+
+                    default:= None
+
+                executor: The executor.
+
+                    default:= self.executor
+
+        Returns:
+            The 'IOResult' of the call, 'get' returns the result of
+            'json_import', or raises its exception.
+
+        Raises:
+            None.
+        """
+        executor = kargs.pop('executor',self.executor)
+        callback = kargs.pop('callback',None)
+        return executor.submit(self._json_import_async,(targetnode,key,datafile,schemafile),kargs,callback,True)
+
+    def _json_import_async(self, targetnode, key, datafile, schemafile=None, **kargs):
+        """Worker of 'json_import_async'."""
+        jval = self._import_branch(datafile, schemafile, **kargs)
+        with _asynclock:
+            return self._hook_branch(targetnode, key, jval)
+
+    def _locked(self, func, *args, **kargs):
+        """Calls 'func' exclusive to the asynchronous modifications."""
+        with _asynclock:
+            return func(*args,**kargs)
+
     def json_import(self, targetnode, key, datafile, schemafile=None, **kargs):
         """ Imports and validates JSON based data.
 
@@ -487,6 +762,9 @@ class JSONDataSerializer(JSONData):
                 The hook within the targetnode,
             datafile:
                 JSON data filename containing the subtree for the target branch.
+                Files compressed by 'gzip', 'bzip2', or 'xz' are decompressed
+                transparently, binary snapshots written by 'snapshot_export'
+                are read by 'snapshot' only.
             schemafile:
                 JSON-Schema filename for validation of the subtree/branch.
             **kargs:
@@ -506,6 +784,34 @@ class JSONDataSerializer(JSONData):
                     
                     default:= validate
 
+                processes: Number of worker processes for the parallel
+                    validation of the items of a top-level array,
+                    see 'JSONData.validate'.
+
+                    default:= None
+
+                chunksize: Number of array items per worker task.
+
+                    default:= 1024
+
+                pointer: Imports the sub-branch of 'datafile' selected by
+                    a JSONPointer only. The file is scanned incrementally,
+                    all other parts are skipped in bounded memory, see
+                    'jsondata.JSONDataIO.JSONStreamScanner'. The 'schemafile'
+                    applies to the sub-branch.
+
+                    default:= None
+
+                backend: The JSON package for the parse of 'datafile'
+                    and 'schemafile', see 'jsondata.JSONDataBackend'.
+
+                    default:= self.backend
+
+                snapshot: Decodes 'datafile' when it is a binary snapshot,
+                    else it is parsed as JSON text, see 'snapshot_import'.
+
+                    default:= False
+
         Returns:
             When successful returns 'True', else returns either 'False', or
             raises an exception.
@@ -517,6 +823,31 @@ class JSONDataSerializer(JSONData):
 
             JSONDataSourceFile:
 
+        """
+        jval = self._import_branch(datafile, schemafile, **kargs)
+
+        #
+        # TARGET-CONTAINER: manage new branch data
+        #
+        return self._hook_branch(targetnode, key, jval)
+
+    def _import_branch(self, datafile, schemafile=None, **kargs):
+        """Loads and validates the data of a file for 'json_import'.
+
+        The call does not modify the current data, thus could be
+        called concurrently for multiple files. For the parameters
+        refer to 'json_import'.
+
+        Returns:
+            The validated data.
+
+        Raises:
+            JSONData:
+
+            JSONDataValue:
+
+            JSONDataSourceFile:
+
         """
         if self.verbose:
             print "VERB:json_import:datafile=   "+str(datafile)
@@ -524,7 +855,11 @@ class JSONDataSerializer(JSONData):
 
         jval = None
         sval = None
+        pointer = None
+        snapshot = False
+        backend = self.backend
         matchcondition = []
+        kval = {}
 
         #
         #*** Fetch parameters
@@ -556,6 +891,14 @@ class JSONDataSerializer(JSONData):
                     raise JSONDataValue("unknown",k,str(v))
             elif k == 'schema':
                 sval = v
+            elif k in ('processes','chunksize',):
+                kval[k] = v
+            elif k == 'pointer':
+                pointer = v
+            elif k == 'snapshot':
+                snapshot = v
+            elif k == 'backend':
+                backend = get_backend(v)
 
         # INPUT-BRANCH: schema for validation
         if validator != MODE_SCHEMA_OFF: # validation requested, requires schema
@@ -566,8 +909,13 @@ class JSONDataSerializer(JSONData):
                 schemafile = os.path.abspath(schemafile)
                 if not os.path.isfile(schemafile):
                     raise JSONDataSourceFile("open","schemafile",str(schemafile))
-                with open(schemafile) as schema_file:
-                    sval = myjson.load(schema_file)
+                if self.schemaregistry != None:
+                    sval = self.schemaregistry.resolve(schemafile)
+                else:
+                    try:
+                        sval = schemacache.load(schemafile,backend,self.loadcached)
+                    except (IOError,OSError,ValueError,) as e:
+                        raise JSONDataSourceFile("read","schemafile",str(schemafile),str(e))
                 if not sval:
                     raise JSONDataSourceFile("read","schemafile",str(schemafile))
 
@@ -576,19 +924,93 @@ class JSONDataSerializer(JSONData):
         if not os.path.isfile(datafile):
             raise JSONDataSourceFile("open","datafile",str(datafile))
         try:
-            with open(datafile) as data_file: # load data
-                jval = myjson.load(data_file)
+            jval = json_load(datafile,self.loadcached,pointer,backend,snapshot) # load data
         except Exception as e:
             raise JSONDataSourceFile("open","datafile",str(datafile),str(e))
         if not jval:
             raise JSONDataSourceFile("read","datafile",str(datafile))
 
         # INPUT-BRANCH: validate data
-        self.validate(jval,sval,validator)
+        self.validate(jval,sval,validator,**kval)
+        return jval
 
-        #
-        # TARGET-CONTAINER: manage new branch data
-        #
+    def _import_branches(self, filepathlist, schemafile=None, workers=None, processes=None, **kargs):
+        """Loads and validates multiple files concurrently.
+
+        The files are loaded by a pool of threads by default, thus only
+        the I/O overlaps, the parse and the validation are serialized by
+        the GIL. When 'processes' is provided, the files are parsed and
+        validated by a pool of processes, see '_pool_map'. This requires
+        the schema by a file, the threads are applied for the schemas of
+        a 'schemaregistry', and for additional parameters of the import.
+
+        Args:
+            filepathlist: List of JSON data files.
+
+            schemafile: JSON-Schema filename for the validation.
+
+            workers: Maximum number of threads, values less than 2
+                load the files sequentially.
+
+                default:= min(len(filepathlist), cpu_count())
+
+            processes: Maximum number of processes, values less than 2
+                load the files sequentially, None applies the threads.
+
+                default:= None
+
+            **kargs: Passed to '_import_branch'.
+
+        Returns:
+            List with an entry for each file in the order of 'filepathlist'.
+            Each entry is either '(True, data)', or '(False, exc_info)'.
+
+        Raises:
+            JSONDataValue:
+
+        """
+        if processes != None and self.schemaregistry == None and set(kargs) <= set(('schema',)):
+            validator = self.validator
+            if validator == 'default' or validator == MODE_SCHEMA_DRAFT4:
+                validator = MODE_SCHEMA_DRAFT4
+            elif validator == 'draft3' or validator == MODE_SCHEMA_DRAFT3:
+                validator = MODE_SCHEMA_DRAFT3
+            elif validator == 'off' or validator == MODE_SCHEMA_OFF:
+                validator = MODE_SCHEMA_OFF
+            else:
+                raise JSONDataValue("unknown","validator",str(validator))
+            sf = schemafile or self.schemafile
+            if validator == MODE_SCHEMA_OFF or sf:
+                if sf:
+                    sf = os.path.abspath(sf)
+                tasks = [(f,sf,validator,self.backend.name,self.loadcached) for f in filepathlist]
+                return [(True, r) if ok else (False, (type(r), r, None))
+                        for ok,r in self._pool_map(_branch_load,tasks,processes,self.backend)]
+
+        def _load(f):
+            try:
+                return (True, self._import_branch(f, schemafile, **kargs))
+            except Exception:
+                return (False, sys.exc_info())
+
+        if workers == None:
+            try:
+                workers = multiprocessing.cpu_count()
+            except NotImplementedError:
+                workers = 1
+        workers = min(workers, len(filepathlist))
+        if workers < 2:
+            return [_load(f) for f in filepathlist]
+
+        pool = ThreadPool(workers)
+        try:
+            return pool.map(_load, filepathlist, 1)
+        finally:
+            pool.close()
+            pool.join()
+
+    def _hook_branch(self, targetnode, key, jval):
+        """Hooks loaded data into the target container for 'json_import'."""
         if not targetnode: # use defaults
             if not self.data: # the initial load, thus OK in any case
                 self.data = jval
@@ -604,6 +1026,231 @@ class JSONDataSerializer(JSONData):
 
         return ret # jval != None
 
+    def ndjson_export(self, sourcenode, fname, **kargs):
+        """ Exports an array branch as a JSON Lines file.
+
+        Each item of the array is written as one line, the encoding is
+        performed item by item, thus the memory is constant. The file is
+        replaced atomically, see 'jsondata.JSONDataIO.ndjson_write'.
+
+        Args:
+            sourcenode: Array to be exported, either the node, or a
+                JSONPointer. None for the complete JSON document.
+
+            fname: File name for the exported data.
+
+            **kargs:
+                force: Writes the file even when the contents are
+                    unchanged.
+
+                    default:= False
+
+                compression: Compression format, one of 'gz', 'bz2',
+                    'xz', or False for uncompressed.
+
+                    default:= by suffix of 'fname'
+
+                compresslevel: Compression level, 1 to 9.
+
+                    default:= 9
+
+                backend: The JSON package for the encoding, see
+                    'jsondata.JSONDataBackend.get_backend'.
+
+                    default:= self.backend
+
+        Returns:
+            When successful returns 'True', else returns either 'False',
+            or raises an exception.
+
+        Raises:
+            JSONDataNodeType:
+
+            JSONDataTargetFile:
+        """
+        force = kargs.get('force',False)
+        compression = kargs.get('compression',None)
+        compresslevel = kargs.get('compresslevel',COMPRESSLEVEL)
+        backend = get_backend(kargs.get('backend',self.backend))
+        if isinstance(sourcenode,JSONPointer):
+            sourcenode = sourcenode.get_node(self.data)
+        elif sourcenode == None:
+            sourcenode = self.data
+        if type(sourcenode) is not list:
+            raise JSONDataNodeType("type","sourcenode",str(type(sourcenode)))
+        try:
+            ndjson_write(fname,sourcenode,force,compression,compresslevel,backend)
+        except Exception as e:
+            raise JSONDataTargetFile("open-"+str(e),"data.dump",str(fname))
+        return True
+
+    def ndjson_import(self, targetnode, key, datafile, schemafile=None, **kargs):
+        """ Imports and validates the records of a JSON Lines file.
+
+        The records are either appended to a target array, or passed
+        to a callback. The validation is performed for each record,
+        thus the schema describes a single record. When a record fails,
+        the target array remains unchanged.
+
+        Args:
+            targetnode:
+                Target container, either the node, or a JSONPointer.
+                For the default:='None' the 'self.data' is used.
+            key:
+                The hook within the targetnode, the array is created
+                when missing in an object. For 'None' the targetnode
+                has to be an array.
+            datafile:
+                JSON Lines filename.
+            schemafile:
+                JSON-Schema filename for validation of each record.
+            **kargs:
+                callback: Function called with each record, the
+                    records are not added to the data, thus the
+                    memory is constant. The targetnode and key
+                    are ignored.
+
+                    default:= None
+
+                schema: In-memory JSON-Schema for the records.
+
+                    default:= self.schema
+
+                validator: [default, draft3, off, ]
+                    Sets schema validator for the records.
+                    The values are: default=validate, draft3=Draft3Validator,
+                    off=None.
+
+                    default:= validate
+
+        Returns:
+            When successful returns the number of records, else raises
+            an exception.
+
+        Raises:
+            JSONDataNodeType:
+
+            JSONDataSourceFile:
+
+            jsonschema.ValidationError:
+
+        """
+        callback = kargs.get('callback',None)
+        records = self.ndjson_iter(datafile,schemafile,**kargs)
+
+        if callback:
+            n = 0
+            for r in records:
+                callback(r)
+                n += 1
+            return n
+
+        if isinstance(targetnode,JSONPointer):
+            targetnode = targetnode.get_node(self.data)
+        elif targetnode == None:
+            targetnode = self.data
+        if key == None:
+            target = targetnode
+        elif type(targetnode) is dict:
+            target = targetnode.setdefault(key,[])
+        elif type(targetnode) is list:
+            target = targetnode[key]
+        else:
+            raise JSONDataNodeType("type","targetnode",str(type(targetnode)))
+        if type(target) is not list:
+            raise JSONDataNodeType("type","target",str(type(target)))
+
+        branch = list(records)
+        target.extend(branch)
+        return len(branch)
+
+    def ndjson_iter(self, datafile, schemafile=None, **kargs):
+        """ Reads and validates the records of a JSON Lines file.
+
+        Args:
+            datafile:
+                JSON Lines filename, compressed files are supported.
+            schemafile:
+                JSON-Schema filename for validation of each record.
+            **kargs:
+                schema: In-memory JSON-Schema for the records.
+
+                    default:= self.schema
+
+                validator: [default, draft3, off, ]
+                    Sets schema validator for the records.
+
+                    default:= validate
+
+                backend: The JSON package for the parse of the records.
+
+                    default:= self.backend
+
+        Returns:
+            Generator of the validated records.
+
+        Raises:
+            JSONDataException:
+
+            JSONDataSourceFile:
+
+            JSONDataValue:
+
+            jsonschema.ValidationError:
+
+        """
+        validator = self.validator
+        sval = kargs.get('schema',None)
+        backend = get_backend(kargs.get('backend',self.backend))
+        v = kargs.get('validator',None)
+        if v != None:
+            if v == 'default' or v == MODE_SCHEMA_DRAFT4:
+                validator = MODE_SCHEMA_DRAFT4
+            elif v == 'draft3' or v == MODE_SCHEMA_DRAFT3:
+                validator = MODE_SCHEMA_DRAFT3
+            elif v == 'off' or v == MODE_SCHEMA_OFF:
+                validator = MODE_SCHEMA_OFF
+            else:
+                raise JSONDataValue("unknown","validator",str(v))
+
+        cls = _validator_class(validator)
+        if cls:
+            if schemafile:
+                if not os.path.isfile(schemafile):
+                    raise JSONDataSourceFile("open","schemafile",str(schemafile))
+                if self.schemaregistry != None:
+                    cls = self.schemaregistry.validator(schemafile,cls)
+                else:
+                    cls = schemacache.validator(schemafile,cls,backend,self.loadcached)
+            else:
+                if sval == None:
+                    sval = self.schema
+                if not sval:
+                    raise JSONDataException("value","schema",sval)
+                v = self._compiled(sval,cls)
+                if v == None:
+                    cls.check_schema(sval)
+                    v = cls(sval)
+                cls = v
+
+        if not os.path.isfile(datafile):
+            raise JSONDataSourceFile("open","datafile",str(datafile))
+        return self._ndjson_iter(datafile,cls,backend)
+
+    def _ndjson_iter(self, datafile, validator, backend):
+        """Generator for 'ndjson_iter'."""
+        reader = ndjson_read(datafile,backend)
+        while True:
+            try:
+                r = next(reader)
+            except StopIteration:
+                return
+            except (IOError,ValueError,) as e:
+                raise JSONDataSourceFile("read","datafile",str(datafile),str(e))
+            if validator:
+                validator.validate(r)
+            yield r
+
     def printData(self, pretty=True, **kargs):
         """Prints structured data.
 
@@ -635,15 +1282,14 @@ class JSONDataSerializer(JSONData):
                 "source="+str(source)
                 )
         if sourcefile:
-            source = open(sourcefile)
-            source = myjson.load(source)
+            source = json_read(sourcefile,self.backend)
         elif not source:
             source = self.data # yes, almost the same...
 
         if pretty:
-            print myjson.dumps(source,indent=self.indent)
+            print self.backend.dumps(source,indent=self.indent)
         else:
-            print myjson.dumps(source)
+            print self.backend.dumps(source)
 
     def printSchema(self, pretty=True, **kargs):
         """Prints structured schema.
@@ -676,15 +1322,579 @@ class JSONDataSerializer(JSONData):
                 "source="+str(source)
                 )
         if sourcefile:
-            source = open(sourcefile)
-            source = myjson.load(source)
+            source = json_read(sourcefile,self.backend)
         elif not source:
             source = self.schema # yes, almost the same...
 
         if pretty:
-            print myjson.dumps(source,indent=self.indent)
+            print self.backend.dumps(source,indent=self.indent)
         else:
-            print myjson.dumps(source)
+            print self.backend.dumps(source)
+
+    def snapshot_export(self, sourcenode, fname, **kargs):
+        """ Exports current data as a binary snapshot for fast reload.
+
+        The snapshot is read by 'snapshot_import' several times faster
+        than JSON text, see 'jsondata.JSONDataIO.snapshot_write'.
+        The format depends on the Python version, thus is intended as a
+        local cache for restarts. Data which could not be represented is
+        written as JSON text.
+
+        Args:
+            fname: File name for the exported data.
+
+            sourcenode: Base of sub-tree for export.
+                None for complete JSON document.
+
+            **kargs:
+                force: Writes the file even when the contents are
+                    unchanged.
+
+                    default:= False
+
+                compression: Compression format, one of 'gz', 'bz2',
+                    'xz', or False for uncompressed.
+
+                    default:= by suffix of 'fname'
+
+                compresslevel: Compression level, 1 to 9.
+
+                    default:= 9
+
+                backend: The JSON package for the encoding, see
+                    'jsondata.JSONDataBackend.get_backend'.
+
+                    default:= self.backend
+
+        Returns:
+            When successful returns 'True', else returns either 'False',
+            or raises an exception.
+
+        Raises:
+            JSONDataTargetFile:
+        """
+        force = kargs.get('force',False)
+        compression = kargs.get('compression',None)
+        compresslevel = kargs.get('compresslevel',COMPRESSLEVEL)
+        backend = get_backend(kargs.get('backend',self.backend))
+        if not sourcenode:
+            sourcenode = self.data
+        try:
+            snapshot_write(fname,sourcenode,force,compression,compresslevel,backend)
+        except Exception as e:
+            raise JSONDataTargetFile("open-"+str(e),"data.dump",str(fname))
+        return True
+
+    def snapshot_import(self, targetnode, key, datafile, schemafile=None, **kargs):
+        """ Imports and validates a binary snapshot.
+
+        Same as 'json_import' with the decode of snapshots enabled. The
+        generic imports read JSON text only, because snapshots are
+        'marshal' records, which have to be read from trusted files
+        only. Files written as JSON text by the fallback of
+        'snapshot_export' are read transparently.
+
+        Args:
+            For the parameters refer to 'json_import'.
+
+        Returns:
+            When successful returns 'True', else returns either 'False', or
+            raises an exception.
+
+        Raises:
+            JSONData:
+
+            JSONDataValue:
+
+            JSONDataSourceFile:
+
+        """
+        kargs['snapshot'] = True
+        return self.json_import(targetnode, key, datafile, schemafile, **kargs)
+
+    def split_export(self, dirpath, branches=None, **kargs):
+        """ Exports the data into a directory with a file for each branch.
+
+        Each split branch is written into a separate file, the remaining
+        data - the root - together with the layout into the file
+        'index.json', see SPLIT_INDEX. Within the root and within the
+        enclosing branches the split branches are replaced by 'null'.
+
+        The export starts the tracking of the changes by the methods
+        'branch_*' and by 'JSONPatch.apply', see 'dirty'. Thus the
+        following exports into the same directory write the changed
+        branches only, and a small change of large data rewrites a small
+        file. Changes of 'data' by other means are not tracked, these
+        require 'force'. Each file is replaced atomically, unchanged
+        contents are not written, see 'jsondata.JSONDataIO.json_write'.
+        The files of removed branches are deleted.
+
+        Args:
+            dirpath: Directory for the files, created when missing.
+
+            branches: List of JSONPointers of the split branches, these
+                are kept for the following exports. Missing branches
+                are ignored.
+
+                default:= the previous layout, else each top-level item
+
+            **kargs:
+                force: Writes all files, even when the contents are
+                    unchanged.
+
+                    default:= False
+
+                compression: Compression format of the branch files,
+                    one of 'gz', 'bz2', 'xz', or False for uncompressed.
+
+                    default:= the present format of the directory, else False
+
+                compresslevel: Compression level, 1 to 9.
+
+                    default:= 9
+
+                backend: The JSON package for the encoding, see
+                    'jsondata.JSONDataBackend.get_backend'.
+
+                    default:= self.backend
+
+        Returns:
+            When successful returns the number of written files, else
+            raises an exception.
+
+        Raises:
+            JSONDataTargetFile:
+        """
+        force = kargs.get('force',False)
+        compresslevel = kargs.get('compresslevel',COMPRESSLEVEL)
+        backend = get_backend(kargs.get('backend',self.backend))
+        dirpath = os.path.realpath(os.path.expanduser(dirpath))
+        if self._splitdir == dirpath:
+            present = self._splitfiles.values(),self._splitcompression
+        else:
+            present = _split_present(dirpath,backend)
+        compression = kargs.get('compression',present[1]) or None
+
+        if branches != None:
+            self._splitspec = [tuple(unicode(x) for x in JSONPointer(b)) for b in branches]
+        if self._splitspec != None:
+            paths = []
+            for p in self._splitspec:
+                if not p: # the root
+                    continue
+                try:
+                    _split_get(self.data,p)
+                except (KeyError,IndexError,ValueError,TypeError,):
+                    continue
+                paths.append(p)
+        elif type(self.data) is dict:
+            paths = sorted((unicode(k),) for k in self.data)
+        elif type(self.data) is list:
+            paths = [(unicode(i),) for i in xrange(len(self.data))]
+        else:
+            paths = []
+
+        suffix = '.json'
+        if compression:
+            suffix += '.'+compression
+        files = dict((p, urllib.quote(_split_pointer(p).encode('utf-8'),'')+suffix) for p in paths)
+
+        if force or self.dirty == None or self._splitdir != dirpath \
+                or self._splitcompression != compression:
+            write = paths
+            windex = True
+        else:
+            write = [p for p in paths if p in self.dirty or p not in self._splitfiles]
+            windex = () in self.dirty or paths != self.splitbranches
+
+        n = 0
+        try:
+            if not os.path.isdir(dirpath):
+                os.makedirs(dirpath)
+            for p in write:
+                if json_write(os.path.join(dirpath,files[p]),_split_prune(_split_get(self.data,p),p,paths),
+                              force,compression,compresslevel,backend):
+                    n += 1
+            if windex:
+                index = {
+                    u'version': 1,
+                    u'layout': None if self._splitspec == None else [_split_pointer(p) for p in self._splitspec],
+                    u'compression': compression,
+                    u'branches': [[_split_pointer(p),files[p]] for p in paths],
+                    u'root': _split_prune(self.data,(),paths),
+                }
+                if json_write(os.path.join(dirpath,SPLIT_INDEX),index,force,False,compresslevel,backend):
+                    n += 1
+            for f in set(present[0]) - set(files.values()):
+                if os.path.basename(f) != f: # foreign index
+                    continue
+                try:
+                    os.unlink(os.path.join(dirpath,f))
+                except OSError:
+                    pass
+        except Exception as e:
+            raise JSONDataTargetFile("open-"+str(e),"data.dump",str(dirpath))
+
+        self._splitdir = dirpath
+        self._splitfiles = files
+        self._splitcompression = compression
+        self.splitbranches = paths
+        self.dirty = set()
+        return n
+
+    def split_import(self, dirpath, **kargs):
+        """ Imports and validates the data of a directory of 'split_export'.
+
+        The branch files are loaded concurrently by a pool of processes,
+        and reassembled with the root. The result replaces the data, and
+        is validated as a whole by the current schema. The layout is kept
+        for the following calls of 'split_export', and the tracking of
+        changes is started, see 'dirty'.
+
+        Args:
+            dirpath: Directory of the files.
+
+            **kargs:
+                processes: Number of worker processes, values less than 2
+                    load the files sequentially.
+
+                    default:= self.processes
+
+                validator: [default, draft3, off, ]
+                    Sets schema validator for the data.
+
+                    default:= self.validator
+
+                backend: The JSON package for the parse, see
+                    'jsondata.JSONDataBackend.get_backend'.
+
+                    default:= self.backend
+
+        Returns:
+            When successful returns the number of branches, else raises
+            an exception.
+
+        Raises:
+            JSONDataSourceFile:
+
+            JSONDataValue:
+
+            jsonschema.ValidationError:
+        """
+        processes = kargs.get('processes',self.processes)
+        backend = get_backend(kargs.get('backend',self.backend))
+        validator = self.validator
+        v = kargs.get('validator',None)
+        if v != None:
+            if v == 'default' or v == MODE_SCHEMA_DRAFT4:
+                validator = MODE_SCHEMA_DRAFT4
+            elif v == 'draft3' or v == MODE_SCHEMA_DRAFT3:
+                validator = MODE_SCHEMA_DRAFT3
+            elif v == 'off' or v == MODE_SCHEMA_OFF:
+                validator = MODE_SCHEMA_OFF
+            else:
+                raise JSONDataValue("unknown","validator",str(v))
+        dirpath = os.path.realpath(os.path.expanduser(dirpath))
+
+        f = os.path.join(dirpath,SPLIT_INDEX)
+        try:
+            index = json_load(f,backend=backend)
+        except (IOError,OSError,ValueError,) as e:
+            raise JSONDataSourceFile("read","split",str(f),str(e))
+        if type(index) is not dict or index.get(u'version') != 1:
+            raise JSONDataSourceFile("format","split",str(f))
+
+        branches = [(tuple(unicode(x) for x in JSONPointer(p)),bf) for p,bf in index[u'branches']]
+        tasks = [(os.path.join(dirpath,bf),backend.name,self.loadcached) for _p,bf in branches]
+        results = self._pool_map(_split_load,tasks,processes,backend)
+        for ok,r in results:
+            if not ok:
+                raise r
+
+        # parents first, the enclosing branches contain placeholders
+        data = index[u'root']
+        for (p,_bf),(_ok,r) in sorted(zip(branches,results),key=lambda x: len(x[0][0])):
+            n = _split_get(data,p[:-1])
+            n[int(p[-1]) if type(n) is list else p[-1]] = r
+
+        if validator != MODE_SCHEMA_OFF and self.schema:
+            self.validate(data,self.schema,validator)
+
+        self.data = data
+        layout = index.get(u'layout')
+        if layout == None:
+            self._splitspec = None
+        else:
+            self._splitspec = [tuple(unicode(x) for x in JSONPointer(p)) for p in layout]
+        self._splitdir = dirpath
+        self._splitfiles = dict(branches)
+        self._splitcompression = index.get(u'compression')
+        self.splitbranches = [p for p,_bf in branches]
+        self.dirty = set()
+        return len(branches)
+
+    def subdata_import(self, pluginspathlist=None, **kargs):
+        """ Imports and validates the sub-data files of plugin directories.
+
+        Each file with the suffix '.json' within the directories is loaded,
+        compressed files with an additional suffix are accepted too. The
+        files are parsed and validated concurrently by a pool of processes,
+        and inserted in a deterministic order into the data.
+
+        Each file contains an object, the reserved member '$pointer' -
+        see SUBDATA_POINTER - is the JSONPointer of the target branch, the
+        remaining members are the branch. When missing, the branch is
+        inserted at the top-level by the name of the file without the
+        suffixes. Present branches are replaced, missing parents are
+        created, see 'branch_add'. The branches are inserted in the order
+        of the length of the pointers, thus parents before the children,
+        for the same length in the order of 'pluginspathlist', and the
+        sorted filenames within each directory.
+
+        A schema file with the same name and the suffix '.jsd' is applied
+        for the validation of the branch, files without are not validated.
+
+        Args:
+            pluginspathlist: List of directories with sub-data files,
+                either a PATH like string, or a list of single paths.
+
+                default:= self.pluginspathlist
+
+            **kargs:
+                processes: Number of worker processes, values less than 2
+                    load the files sequentially.
+
+                    default:= self.processes
+
+                validator: [default, draft3, off, ]
+                    Sets schema validator for the sub-data files.
+
+                    default:= self.validator
+
+        Returns:
+            When successful returns the number of inserted branches, else
+            raises an exception.
+
+        Raises:
+            JSONDataNodeType:
+
+            JSONDataSourceFile:
+
+            JSONDataValue:
+
+            jsonschema.ValidationError:
+
+        """
+        processes = kargs.get('processes',self.processes)
+        validator = self.validator
+        v = kargs.get('validator',None)
+        if v != None:
+            if v == 'default' or v == MODE_SCHEMA_DRAFT4:
+                validator = MODE_SCHEMA_DRAFT4
+            elif v == 'draft3' or v == MODE_SCHEMA_DRAFT3:
+                validator = MODE_SCHEMA_DRAFT3
+            elif v == 'off' or v == MODE_SCHEMA_OFF:
+                validator = MODE_SCHEMA_OFF
+            else:
+                raise JSONDataValue("unknown","validator",str(v))
+
+        if pluginspathlist == None:
+            pluginspathlist = self.pluginspathlist
+        if type(pluginspathlist) != list:
+            pluginspathlist = pluginspathlist.split(os.pathsep)
+        pluginspathlist = [os.path.realpath(os.path.expandvars(os.path.expanduser(p)))
+                           for p in pluginspathlist if p]
+
+        # discover, the files of the first path first
+        tasks = []
+        for p in pluginspathlist:
+            for name in sorted(searchindex.listdir(p)):
+                base = name
+                if compression_of(name,False):
+                    base = os.path.splitext(name)[0]
+                base,ext = os.path.splitext(base)
+                if ext != '.json' or not base:
+                    continue
+                f = os.path.join(p,name)
+                if not searchindex.isfile(f):
+                    continue
+                sf = os.path.join(p,base+'.jsd')
+                if not searchindex.isfile(sf):
+                    sf = None
+                tasks.append((f,base,sf,validator,self.backend.name,self.loadcached))
+        if not tasks:
+            return 0
+
+        results = self._pool_map(_subdata_load,tasks,processes,self.backend)
+
+        # the first failure in the order of the files
+        for ok,r in results:
+            if not ok:
+                raise r
+
+        # parents first, the sort is stable
+        branches = [(JSONPointer(r[0]),r[1],t) for (_ok,r),t in zip(results,tasks)]
+        branches.sort(key=lambda x: len(x[0]))
+        for ptr,branch,t in branches:
+            self.branch_add(ptr,None,branch)
+            if self.reloadable:
+                self._track(t[0],list(ptr),branch,('subdata',t))
+        return len(branches)
+
+    def _pool_map(self, func, tasks, processes, backend):
+        """Maps the tasks by a pool of processes, or sequentially.
+
+        Args:
+            func: Module level function of the worker.
+
+            tasks: List of the parameters for 'func'.
+
+            processes: Maximum number of processes, values less than 2
+                map sequentially.
+
+                default:= cpu_count()
+
+            backend: The backend applied by the workers, which has to
+                be reproducible by name, else the tasks are mapped
+                sequentially.
+
+        Returns:
+            List of the results in the order of 'tasks'.
+
+        Raises:
+            None.
+        """
+        try:
+            if get_backend(backend.name).module is not backend.module:
+                processes = 1
+        except JSONDataValue:
+            processes = 1
+
+        if processes == None:
+            try:
+                processes = multiprocessing.cpu_count()
+            except NotImplementedError:
+                processes = 1
+        processes = min(processes,len(tasks))
+        if processes < 2:
+            return map(func,tasks)
+        pool = multiprocessing.Pool(processes)
+        try:
+            return pool.map(func,tasks,max(1,len(tasks)//(4*processes)))
+        finally:
+            pool.close()
+            pool.join()
+
+    def _track(self, filepath, prefix, data, loader):
+        """Keeps the loaded version of a file for 'reload'."""
+        try:
+            key = LoadCache.key(filepath)
+        except OSError:
+            return
+        self._sources.append([filepath,key,prefix,_snapshot(data),loader])
+
+    def reload(self):
+        """Applies the changes of the loaded files onto the data.
+
+        The data and sub-data files are polled by 'stat', only the changed
+        files are parsed and validated again. Each is compared with its
+        previously loaded version, and the differences are applied onto
+        the data in place as a JSONPatch, see 'JSONPatch.from_diff'.
+        Thus the unchanged branches are kept, and references to these
+        remain valid. When a file fails, the data remains unchanged.
+        Removed files are ignored, their data is kept. A changed type
+        of the whole document replaces the data.
+
+        The instance has to be created with 'reloadable'. The changes
+        applied by the application to the data are kept, as long as they
+        do not conflict with the patch.
+
+        Args:
+            None.
+
+        Returns:
+            The applied JSONPatch, empty when unchanged.
+
+        Raises:
+            JSONDataException:
+
+            JSONDataSourceFile:
+
+            jsonschema.ValidationError:
+
+        """
+        from jsondata.JSONPatch import JSONPatch,JSONPatchItem
+
+        if not self.reloadable:
+            raise JSONDataException("value","reloadable",str(self.reloadable))
+
+        changed = []
+        for src in self._sources:
+            try:
+                key = LoadCache.key(src[0])
+            except OSError:
+                continue
+            if key == src[1]:
+                continue
+            if src[4][0] == 'data':
+                prefix = src[2]
+                new = self._import_branch(src[0],src[4][1],**src[4][2])
+            else:
+                ok,r = _subdata_load(src[4][1])
+                if not ok:
+                    raise r
+                prefix = list(JSONPointer(r[0]))
+                new = r[1]
+            changed.append((src,key,prefix,new))
+
+        patch = JSONPatch()
+        root = []
+        for src,key,prefix,new in changed:
+            old = _restore(src[3])
+            if prefix != src[2]: # sub-data moved to another branch
+                patch.patch.append(JSONPatchItem('remove',JSONPointer(src[2],False)))
+                patch.patch.append(JSONPatchItem('add',JSONPointer(prefix,False),new))
+            elif not prefix and (type(old) is not type(new) or type(new) not in (dict,list)):
+                root = [new] # not a patch of the document
+            else:
+                patch.patch.extend(JSONPatch.from_diff(old,new,prefix=prefix).patch)
+        if root:
+            self.data = root[0]
+            self._mark_dirty('') # the whole document
+        _n,status = patch.apply(self)
+        if status:
+            raise JSONDataException("value","reload",str(status))
+
+        for src,key,prefix,new in changed:
+            src[1] = key
+            src[2] = prefix
+            src[3] = _snapshot(new)
+        return patch
+
+    def watch(self, interval=1.0, callback=None):
+        """Polls the loaded files by 'reload' within a background thread.
+
+        Args:
+            interval: Seconds between the polls.
+
+                default:= 1.0
+
+            callback: Function called with each applied non-empty JSONPatch.
+
+                default:= None
+
+        Returns:
+            The started thread, which is terminated by its method 'stop'.
+            The last failure of 'reload' is kept in its attribute 'error'.
+
+        Raises:
+            JSONDataException:
+        """
+        if not self.reloadable:
+            raise JSONDataException("value","reloadable",str(self.reloadable))
+        w = _Watcher(self,interval,callback)
+        w.start()
+        return w
 
     def setSchema(self,schemafile=None, targetnode=None, **kargs):
         """Sets schema or inserts a new branch into the current assigned schema.
@@ -719,6 +1929,10 @@ class JSONDataSerializer(JSONData):
                     Requires valid 'schemafile'.
                     
                     default:=False
+                backend:
+                    The JSON package for the load of 'schemafile'.
+                    
+                    default:=self.backend
 
         Returns:
             When successful returns 'True', else returns either 'False', or
@@ -744,6 +1958,7 @@ class JSONDataSerializer(JSONData):
         validator = self.validator # use class settings as MODE_SCHEMA_DRAFT4
         persistent = False
         schema = None
+        backend = self.backend
         for k,v in kargs.items():
             if k == 'validator': # controls validation by JSONschema
                 if v == 'default' or v == MODE_SCHEMA_DRAFT4:
@@ -760,6 +1975,8 @@ class JSONDataSerializer(JSONData):
                 datafile = v
             elif k == 'persistent':
                 persistent = v
+            elif k == 'backend':
+                backend = get_backend(v)
 
         if schemafile != None: # change filename
             self.schemafile = schemafile
@@ -778,17 +1995,28 @@ class JSONDataSerializer(JSONData):
 
         # schema for validation
         if schema: # use loaded
-            pass
+            if not targetnode:
+                self._schemasource = None
 
         elif schemafile: # load from file
             schemafile = os.path.abspath(schemafile)
             self.schemafile = schemafile
             if not os.path.isfile(schemafile):
                 raise JSONDataSourceFile("open","schemafile",str(schemafile))
-            with open(schemafile) as schema_file:
-                schema = myjson.load(schema_file)
+            source = None
+            if self.schemaregistry != None: # with the siblings for '$ref'
+                self.schemaregistry.add_path(os.path.dirname(schemafile))
+                schema = self.schemaregistry.resolve(schemafile) # a copy of the registry
+            else:
+                try:
+                    source = schemacache.load(schemafile,backend,self.loadcached)
+                    schema = schemacache.copy(source,backend) # the cached schema is shared
+                except (IOError,OSError,ValueError,) as e:
+                    raise JSONDataSourceFile("read","schemafile",str(schemafile),str(e))
             if schema == None:
                 raise JSONDataSourceFile("read","schemafile",str(schemafile))
+            if not targetnode:
+                self._schemasource = source
 
         else: # missing at all
             raise JSONDataSourceFile("open","schemafile",str(schemafile))
@@ -810,5 +2038,167 @@ class JSONDataSerializer(JSONData):
 
         return schema != None
 
+def _snapshot(data):
+    """Creates a record of data, independent of later changes."""
+    try:
+        return ('marshal',marshal.dumps(data))
+    except ValueError: # contains types not supported by marshal
+        return ('copy',copy.deepcopy(data))
+
+def _restore(record):
+    """Gets the data of a record of '_snapshot'."""
+    if record[0] == 'marshal':
+        return marshal.loads(record[1])
+    return copy.deepcopy(record[1])
+
+class _Watcher(threading.Thread):
+    """Background thread of 'JSONDataSerializer.watch'."""
+
+    def __init__(self, serializer, interval, callback):
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self.serializer = serializer
+        self.interval = interval
+        self.callback = callback
+        self.error = None
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                patch = self.serializer.reload()
+            except Exception as e: # the data is kept, retried by the next poll
+                self.error = e
+                continue
+            if self.callback and len(patch):
+                self.callback(patch)
+
+    def stop(self):
+        """Terminates the polling, and waits for the thread."""
+        self._stop_event.set()
+        self.join()
+
+def _branch_load(task):
+    """Loads and validates a data file within a worker of '_import_branches'.
+
+    Returns:
+        Either '(True, data)', or '(False, exception)'.
+    """
+    f,sf,validator,backend,loadcached = task
+    try:
+        if not os.path.isfile(f):
+            raise JSONDataSourceFile("open","datafile",str(f))
+        try:
+            data = json_load(f,loadcached,backend=backend)
+        except Exception as e:
+            raise JSONDataSourceFile("open","datafile",str(f),str(e))
+        if not data:
+            raise JSONDataSourceFile("read","datafile",str(f))
+        if validator != MODE_SCHEMA_OFF:
+            try:
+                schema = schemacache.load(sf,backend,loadcached)
+            except (IOError,OSError,ValueError,) as e:
+                raise JSONDataSourceFile("read","schemafile",str(sf),str(e))
+            if validator == MODE_SCHEMA_DRAFT4: # same class as by 'JSONData.validate'
+                cls = validator_for(schema)
+            else:
+                cls = _validator_class(validator)
+            schemacache.compiled(schema,cls).validate(data)
+        return (True, data)
+    except Exception as e:
+        try:
+            pickle.dumps(e)
+        except Exception: # has to pass the process boundary
+            e = JSONDataSourceFile("read","datafile",str(f),str(e))
+        return (False, e)
+
+def _subdata_load(task):
+    """Loads and validates a sub-data file within a worker of 'subdata_import'.
+
+    Returns:
+        Either '(True, (pointer, branch))', or '(False, exception)'.
+    """
+    f,base,sf,validator,backend,loadcached = task
+    try:
+        try:
+            data = json_load(f,loadcached,backend=backend)
+        except (IOError,OSError,ValueError,) as e:
+            raise JSONDataSourceFile("read","subdata",str(f),str(e))
+        if type(data) is not dict:
+            raise JSONDataNodeType("type","subdata",str(f),str(type(data)))
+        pointer = data.pop(SUBDATA_POINTER,None)
+        if pointer == None:
+            pointer = [base]
+        if sf:
+            cls = _validator_class(validator)
+            if cls:
+                schemacache.validator(sf,cls,backend,loadcached).validate(data)
+        return (True, (pointer, data))
+    except Exception as e:
+        try:
+            pickle.dumps(e)
+        except Exception: # has to pass the process boundary
+            e = JSONDataSourceFile("read","subdata",str(f),str(e))
+        return (False, e)
+
+def _split_pointer(path):
+    """Gets the JSONPointer string of a path of 'split_export'."""
+    if not path:
+        return u''
+    return u'/'+u'/'.join(x.replace(u'~',u'~0').replace(u'/',u'~1') for x in path)
+
+def _split_get(data, path):
+    """Gets the node of a path of 'split_export'."""
+    n = data
+    for x in path:
+        n = n[int(x)] if type(n) is list else n[x]
+    return n
+
+def _split_prune(node, path, paths):
+    """Gets 'node' with the split branches below 'path' replaced by None.
+
+    The containers on the paths to the split branches are copied, the
+    remaining items are shared with 'node'.
+    """
+    l = len(path)
+    below = [p for p in paths if len(p) > l and p[:l] == path]
+    if not below or type(node) not in (dict,list):
+        return node
+    ret = type(node)(node)
+    for x in set(p[l] for p in below):
+        k = int(x) if type(ret) is list else x
+        if path+(x,) in below:
+            ret[k] = None
+        else:
+            ret[k] = _split_prune(ret[k],path+(x,),below)
+    return ret
+
+def _split_present(dirpath, backend):
+    """Gets the branch files and the compression of a present index of 'split_export'."""
+    try:
+        index = json_load(os.path.join(dirpath,SPLIT_INDEX),backend=backend)
+        return [bf for _p,bf in index[u'branches']],index.get(u'compression')
+    except Exception: # none, or not readable, thus nothing to remove
+        return [],None
+
+def _split_load(task):
+    """Loads a branch file within a worker of 'split_import'.
+
+    Returns:
+        Either '(True, branch)', or '(False, exception)'.
+    """
+    f,backend,loadcached = task
+    try:
+        try:
+            return (True, json_load(f,loadcached,backend=backend))
+        except (IOError,OSError,ValueError,) as e:
+            raise JSONDataSourceFile("read","split",str(f),str(e))
+    except Exception as e:
+        try:
+            pickle.dumps(e)
+        except Exception: # has to pass the process boundary
+            e = JSONDataSourceFile("read","split",str(f),str(e))
+        return (False, e)
+
 from jsondata.JSONPointer import JSONPointer 
 # avoid nested recursion problems
@@ -22,6 +22,10 @@ The module contains the following classes:
 * **JSONPatchItemRaw**:
     Representation of one patch entry read as a raw entry in accordance to RFC6902.
 
+* **JSONPatchPlan**:
+    Compiled execution plan of a patch list, for the repeated
+    application onto many documents.
+
 * **JSONPatchFilter**:
     Selection filter for the application on the current patch list
     entries JSONPatchItem.
@@ -41,6 +45,11 @@ __version__ = '0.2.18'
 __uuid__='63b597d6-4ada-4880-9f99-f5e0961351fb'
 
 import sys
+import copy
+import hashlib
+import collections
+import multiprocessing
+import cPickle as pickle
 
 version = '{0}.{1}'.format(*sys.version_info[:2])
 if not version in ('2.6','2.7',): # pragma: no cover
@@ -58,13 +67,24 @@ else:
 # for now the only one supported
 from types import NoneType
 from jsondata.JSONPointer import JSONPointer
+from jsondata.JSONData import JSONData
+from jsondata.JSONDataCanonical import dumps_canonical
 from jsondata.JSONDataSerializer import JSONDataSerializer,MODE_SCHEMA_OFF
+from jsondata.JSONDataIO import AtomicWriter,COMPRESSLEVEL,ioexecutor,json_load,json_write
+from jsondata.JSONDataBackend import get_backend
+from jsondata.JSONDataExceptions import JSONDataValue,JSONDataSourceFile
 
 # default
 _appname = "jsonpatch"
 # Sets display for inetractive JSON/JSONschema design.
 _interactive = False
 
+DIFFCOST = 1024
+"""Maximum number of edits of the comparison of arrays by 'JSONPatch.from_diff'."""
+
+BULKCHUNK = 16
+"""Number of documents of a task of 'JSONPatch.apply_bulk'."""
+
 #
 # Operations in accordance to RFC6902 
 RFC6902_ADD = 1
@@ -105,6 +125,281 @@ def getOp(x):
     return str2op.get(x,None)
 
 
+def _key(node,x):
+    """Maps a pointer component onto the key type of the container."""
+    if type(node) is list:
+        if x == '-':
+            return x
+        return int(x)
+    if type(x) is unicode:
+        return x
+    if type(x) is str:
+        return x.decode('utf-8') # keys of the parsed data are unicode
+    return unicode(x)
+
+def _node_and_child(target,jsondata):
+    """Gets the parent container and the key of the child for 'target'.
+
+    Different from 'JSONPointer.get_node_and_child' numeric components
+    are applied as keys of objects too.
+    """
+    n = jsondata
+    for x in target[:-1]:
+        n = n[_key(n,x)]
+    return n,_key(n,target[-1])
+
+def _digest(node, memo):
+    """Gets '(digest, size)' of a subtree, where 'size' is the length of the canonical text.
+
+    The digests of containers are calculated from the digests of the
+    children, and cached in 'memo' by the id of the container, thus
+    each node is encoded once.
+    """
+    if isinstance(node,dict):
+        r = memo.get(id(node))
+        if r is None:
+            h = hashlib.sha1('{')
+            size = 1
+            for ks,v in sorted((dumps_canonical(k),v) for k,v in node.iteritems()):
+                d,l = _digest(v,memo)
+                h.update(ks)
+                h.update(d)
+                size += len(ks) + l + 2
+            r = memo[id(node)] = (h.digest(),max(size,2))
+        return r
+    if isinstance(node,list):
+        r = memo.get(id(node))
+        if r is None:
+            h = hashlib.sha1('[')
+            size = 1
+            for v in node:
+                d,l = _digest(v,memo)
+                h.update(d)
+                size += l + 1
+            r = memo[id(node)] = (h.digest(),max(size,2))
+        return r
+    s = dumps_canonical(node)
+    return hashlib.sha1(s).digest(),len(s)
+
+def _lcs(a, b, maxcost):
+    """Gets the matching index pairs of the longest common subsequence by the algorithm of Myers.
+
+    Returns:
+        The list of the pairs '(i, j)' in ascending order, or None when
+        more than 'maxcost' insertions and deletions are required.
+    """
+    n,m = len(a),len(b)
+    maxd = min(n+m,maxcost)
+    off = maxd + 1
+    v = [0]*(2*maxd+3) # v[off+k] := x of the furthest path on diagonal k
+    trace = []
+    for d in xrange(maxd+1):
+        trace.append(v[off-d-1:off+d+2])
+        for k in xrange(-d,d+1,2):
+            if k == -d or k != d and v[off+k-1] < v[off+k+1]:
+                x = v[off+k+1]
+            else:
+                x = v[off+k-1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[off+k] = x
+            if x >= n and y >= m:
+                break
+        else:
+            continue
+        break
+    else:
+        return None
+
+    matches = []
+    x,y = n,m
+    for d in xrange(len(trace)-1,-1,-1):
+        vd = trace[d] # vd[k+d+1] := v[off+k] before the step d
+        k = x - y
+        if k == -d or k != d and vd[k+d] < vd[k+d+2]:
+            pk = k + 1
+        else:
+            pk = k - 1
+        px = vd[pk+d+1]
+        py = px - pk
+        while x > px and y > py:
+            x -= 1
+            y -= 1
+            matches.append((x,y))
+        x,y = px,py
+    matches.reverse()
+    return matches
+
+class _Differ(object):
+    """Collects the operations of 'JSONPatch.from_diff'.
+
+    The operations of each container are appended after the operations
+    of the children, thus the paths are valid with the indexes of 'a'
+    for the parents. The members removed from, and added to objects
+    are recorded for the detection of moves.
+    """
+
+    def __init__(self, maxcost):
+        self.maxcost = maxcost
+        self.memo = {}
+        self.ops = []
+        self.removed = {} # digest: [index of 'remove' in ops]
+        self.added = [] # (index of 'add' in ops, value)
+
+    def digest(self, node):
+        return _digest(node,self.memo)[0]
+
+    def diff(self, a, b, path):
+        """Appends the operations transforming 'a' into 'b' at 'path'."""
+        if self.digest(a) == self.digest(b):
+            return
+        if isinstance(a,dict) and isinstance(b,dict):
+            self.diff_dict(a,b,path)
+        elif isinstance(a,list) and isinstance(b,list):
+            self.diff_list(a,b,path)
+        else:
+            self.ops.append(JSONPatchItem('replace',JSONPointer(path,False),b))
+
+    def diff_dict(self, a, b, path):
+        """Compares objects by the keys, and the digests of the members."""
+        ops = self.ops
+        for k,v in a.iteritems():
+            if k not in b:
+                self.removed.setdefault(self.digest(v),[]).append(len(ops))
+                ops.append(JSONPatchItem('remove',JSONPointer(path+[k],False)))
+        for k,v in b.iteritems():
+            if k not in a:
+                self.added.append((len(ops),v))
+                ops.append(JSONPatchItem('add',JSONPointer(path+[k],False),v))
+            else:
+                self.diff(a[k],v,path+[k])
+
+    def diff_list(self, a, b, path):
+        """Compares arrays by the longest common subsequence of the digests of the items.
+
+        The operation 'add' replaces present items, thus new items are
+        appended, and the present items following the first change
+        are moved to the end in the order of 'b'. The result is
+        compared with the operations of the comparison by index, which
+        is applied when cheaper, or when the edits exceed 'maxcost'.
+        """
+        da = [self.digest(x) for x in a]
+        db = [self.digest(x) for x in b]
+        n,m = len(a),len(b)
+        s = 0
+        while s < n and s < m and da[s] == db[s]:
+            s += 1
+        e = 0
+        while e < n-s and e < m-s and da[n-1-e] == db[m-1-e]:
+            e += 1
+        matches = _lcs(da[s:n-e],db[s:m-e],self.maxcost)
+        if matches != None and self.diff_lcs(a,b,da,db,path,
+                [(i,i) for i in xrange(s)]
+                + [(i+s,j+s) for i,j in matches]
+                + [(n-e+i,m-e+i) for i in xrange(e)]):
+            return
+
+        # by index
+        for i in xrange(min(n,m)):
+            if da[i] != db[i]:
+                self.diff(a[i],b[i],path+[i])
+        for i in xrange(n-1,m-1,-1):
+            self.ops.append(JSONPatchItem('remove',JSONPointer(path+[i],False)))
+        for v in b[n:]:
+            self.ops.append(JSONPatchItem('add',JSONPointer(path+['-'],False),v))
+
+    def diff_lcs(self, a, b, da, db, path, matches):
+        """Appends the operations for the matching pairs, returns False when more expensive than by index."""
+        n,m = len(a),len(b)
+        kept = dict(matches) # index of a: index of b
+
+        # relocated items, the removed items equal to inserted items
+        matched = set(j for _i,j in matches)
+        pool = {}
+        for i in xrange(n):
+            if i not in kept:
+                pool.setdefault(da[i],[]).append(i)
+        for j in xrange(m):
+            if j not in matched and pool.get(db[j]):
+                kept[pool[db[j]].pop(0)] = j
+                matched.add(j)
+
+        # replaced items, pairs of the remaining changes between the same matches
+        subst = []
+        ai = bj = 0
+        for i,j in matches+[(n,m)]:
+            dels = [x for x in xrange(ai,i) if x not in kept]
+            ins = [x for x in xrange(bj,j) if x not in matched]
+            for x,y in zip(dels,ins):
+                kept[x] = y
+                subst.append((x,y))
+            ai,bj = i+1,j+1
+        removes = [i for i in xrange(n-1,-1,-1) if i not in kept]
+
+        # the prefix of 'b' kept in place, the remaining items are appended
+        pos = {}
+        for c,i in enumerate(sorted(kept)):
+            pos[kept[i]] = c
+        q = 0
+        last = -1
+        while q < m and pos.get(q,-1) > last:
+            last = pos[q]
+            q += 1
+
+        byindex = abs(n-m)
+        for i in xrange(min(n,m)):
+            if da[i] != db[i]:
+                byindex += 1
+        if len(subst)+len(removes)+m-q > byindex:
+            return False
+
+        ops = self.ops
+        for i,j in subst:
+            self.diff(a[i],b[j],path+[i])
+        for i in removes:
+            ops.append(JSONPatchItem('remove',JSONPointer(path+[i],False)))
+
+        # index of the kept items by a binary indexed tree of the present positions
+        size = len(kept)
+        tree = [0]*(size+1)
+        for x in xrange(1,size+1):
+            tree[x] += 1
+            p = x + (x & -x)
+            if p <= size:
+                tree[p] += tree[x]
+        end = JSONPointer(path+['-'],False)
+        for j in xrange(q,m):
+            c = pos.get(j)
+            if c is None:
+                ops.append(JSONPatchItem('add',end,b[j]))
+                continue
+            idx = 0
+            x = c
+            while x > 0:
+                idx += tree[x]
+                x -= x & -x
+            x = c + 1
+            while x <= size:
+                tree[x] -= 1
+                x += x & -x
+            ops.append(JSONPatchItem('move',end,JSONPointer(path+[idx],False)))
+        return True
+
+    def patch(self):
+        """Gets the operations, with the moves of equal members of objects prepended."""
+        ops = self.ops
+        moves = []
+        for i,v in self.added:
+            d,size = _digest(v,self.memo)
+            l = self.removed.get(d)
+            if l and size > len(unicode(ops[l[0]].target)):
+                j = l.pop(0)
+                moves.append(JSONPatchItem('move',ops[i].target,ops[j].target))
+                ops[i] = ops[j] = None
+        return moves + [x for x in ops if x is not None]
+
 class JSONPatchException(Exception):
     pass
 
@@ -160,7 +455,6 @@ class JSONPatchItem(object):
             pass
 
         elif self.op in (RFC6902_COPY,RFC6902_MOVE):
-            self.op = op
             self.src = param
 
         else:
@@ -310,40 +604,55 @@ class JSONPatchItem(object):
         """
              
         if self.op is RFC6902_ADD:
-            #n,b = self.target.get_node_and_child(jsondata)
-
-            nbranch = jsondata.branch_add(
-                    self.target, # target pointer
-                    None,
-                    self.value) # value
+            if isinstance(jsondata,JSONDataSerializer):
+                #n,b = self.target.get_node_and_child(jsondata)
+
+                nbranch = jsondata.branch_add(
+                        self.target, # target pointer
+                        None,
+                        self.value) # value
+                return True
+
+            # in-memory data, the value is inserted without a copy
+            n,b = _node_and_child(self.target,jsondata)
+            if b == '-':
+                n.append(self.value)
+            else:
+                n[b] = self.value
             return True
 
         if isinstance(jsondata,JSONDataSerializer):
+            if self.op is RFC6902_MOVE:
+                jsondata._mark_dirty(JSONPointer(self.src))
+            if self.op is not RFC6902_TEST:
+                jsondata._mark_dirty(self.target)
             jsondata = jsondata.data
         
         if self.op is RFC6902_REPLACE:
-            n,b = self.target.get_node_and_child(jsondata)
-            n[unicode(b)] = unicode(self.value)
+            n,b = _node_and_child(self.target,jsondata)
+            if type(self.value) is str:
+                n[b] = unicode(self.value)
+            else:
+                n[b] = self.value
 
         elif self.op is RFC6902_TEST:
-            n,b = JSONPointer(self.target,False).get_node_and_child(jsondata)
+            n,b = _node_and_child(self.target,jsondata)
             if type(self.value) is str:
                 self.value = unicode(self.value)
-            if type(n) is list:
-                return n[b] == self.value
-            return n[unicode(b)] == self.value
+            return n[b] == self.value
+
         elif self.op is RFC6902_COPY:
             val =  JSONPointer(self.src).get_node_or_value(jsondata)
-            tn,tc = self.target.get_node_and_child(jsondata)
+            tn,tc = _node_and_child(self.target,jsondata)
             tn[tc] = val
 
         elif self.op is RFC6902_MOVE:
             val =  JSONPointer(self.src).get_node_or_value(jsondata)
-            sn,sc = JSONPointer(self.src).get_node_and_child(jsondata)
+            sn,sc = _node_and_child(JSONPointer(self.src),jsondata)
             sn.pop(sc)
-            tn,tc = self.target.get_node_and_child(jsondata)
+            tn,tc = _node_and_child(self.target,jsondata)
             if type(tn) is list:
-                if len(tn)<=tc:
+                if tc == '-' or len(tn)<=tc:
                     tn.append(val)
                 else:
                     tn[tc] = val
@@ -351,7 +660,7 @@ class JSONPatchItem(object):
                 tn[tc] = val
 
         elif self.op is RFC6902_REMOVE:
-            n,b = self.target.get_node_and_child(jsondata)
+            n,b = _node_and_child(self.target,jsondata)
             n.pop(b)
         
         return True
@@ -462,6 +771,512 @@ class JSONPatchFilter(object):
         
         pass
 
+def _component(x):
+    """Pre-converts a pointer component into '(key, index)'.
+
+    The key is applied to objects, the index to arrays, which is None
+    for components which are no valid index.
+    """
+    if type(x) is str:
+        u = x.decode('utf-8')
+    elif type(x) is unicode:
+        u = x
+    else:
+        u = unicode(x)
+    if type(x) in (int,long):
+        return (u,x)
+    if u == u'-':
+        return (u,'-')
+    try:
+        return (u,int(u))
+    except ValueError:
+        return (u,None)
+
+def _child(node, c):
+    """Gets the child of a container by a component of '_component'."""
+    if type(node) is list:
+        if c[1] is None:
+            int(c[0]) # raises the same as '_key'
+        return node[c[1]]
+    if type(node) is not dict:
+        raise JSONPatchException("Not a container: "+unicode(c[0]))
+    return node[c[0]]
+
+# inverse operations of 'JSONPatchPlan.apply'
+_UNDO_SET = 0 # container[key] = value
+_UNDO_DEL = 1 # del container[key]
+_UNDO_POP = 2 # container.pop()
+_UNDO_INSERT = 3 # container.insert(key, value)
+
+def _set(node, c, value, undo, append=False):
+    """Assigns the child of a container, and records the inverse operation.
+
+    Appends to arrays for the index '-' when 'append' is set.
+    """
+    if type(node) is list:
+        i = c[1]
+        if i == '-' and append:
+            node.append(value)
+            if undo != None:
+                undo.append((_UNDO_POP,node,None,None))
+            return
+        if i is None or i == '-':
+            int(c[0]) # raises the same as '_key'
+        old = node[i]
+        node[i] = value
+        if undo != None:
+            undo.append((_UNDO_SET,node,i,old))
+        return
+    if type(node) is not dict:
+        raise JSONPatchException("Not a container: "+unicode(c[0]))
+    k = c[0]
+    if k in node:
+        inverse = (_UNDO_SET,node,k,node[k])
+    else:
+        inverse = (_UNDO_DEL,node,k,None)
+    node[k] = value
+    if undo != None: # recorded when changed only
+        undo.append(inverse)
+
+def _pop(node, c, undo):
+    """Removes the child of a container, and records the inverse operation."""
+    if type(node) is list:
+        i = c[1]
+        if i is None or i == '-':
+            int(c[0])
+        val = node.pop(i)
+        if undo != None:
+            undo.append((_UNDO_INSERT,node,i if i >= 0 else len(node)+1+i,val))
+        return val
+    if type(node) is not dict:
+        raise JSONPatchException("Not a container: "+unicode(c[0]))
+    val = node.pop(c[0])
+    if undo != None:
+        undo.append((_UNDO_SET,node,c[0],val))
+    return val
+
+def _created(data, path):
+    """Gets the inverse operation for the creation of the missing nodes of a path."""
+    n = data
+    for c in path[0]+[path[2]]:
+        if type(n) is dict:
+            if c[0] not in n:
+                return (_UNDO_DEL,n,c[0],None)
+            n = n[c[0]]
+        elif type(n) is list:
+            if c[1] == '-' or c[1] == len(n):
+                return (_UNDO_POP,n,None,None)
+            if type(c[1]) is not int or not -len(n) <= c[1] < len(n):
+                break # not changed
+            n = n[c[1]]
+        else:
+            break
+    return (None,None,None,None)
+
+def _undo(undo):
+    """Reverts the recorded operations in reverse order."""
+    for kind,node,k,v in reversed(undo):
+        if kind == _UNDO_SET:
+            node[k] = v
+        elif kind == _UNDO_DEL:
+            del node[k]
+        elif kind == _UNDO_POP:
+            node.pop()
+        elif kind == _UNDO_INSERT:
+            node.insert(k,v)
+    del undo[:]
+
+class JSONPatchPlan(object):
+    """Compiled execution plan of a JSONPatch.
+
+    The pointers are parsed, and the keys converted once at the time of
+    the compilation. The parent containers are cached within each call
+    of 'apply' by their paths, thus consecutive operations on the same
+    container, or on siblings, resolve the path once. The entries of the
+    cache are invalidated by the precompiled lists of the paths affected
+    by each operation. The plan is independent from the document, and
+    could be applied repeatedly, the result is the same as by
+    'JSONPatch.apply', except that the values of the types 'dict' and
+    'list' are inserted as copies, thus neither shared by the patched
+    documents, nor by the source and the target of 'copy'.
+
+    Attributes:
+        **steps**: The compiled operations.
+    """
+
+    def __init__(self, patch, copyvalues=True):
+        """Compiles a patch.
+
+        Args:
+            patch: A 'JSONPatch', or a list of 'JSONPatchItem'.
+
+            copyvalues: Inserts copies of the values of the types 'dict'
+                and 'list' of the task list into in-memory documents,
+                when False the values themselves. The values of 'copy'
+                are copied always.
+
+                default:= True
+
+        Returns:
+            Results in an initialized object.
+
+        Raises:
+            JSONPatchItemException:
+        """
+        self.steps = []
+        self.copyvalues = copyvalues
+        paths = set([()])
+        for p in patch:
+            op = p.op
+            if op not in op2str:
+                raise JSONPatchItemException("Unknown operation.")
+            tptr = p.target if isinstance(p.target,JSONPointer) else JSONPointer(p.target)
+            target = self._path(tptr)
+            src = sptr = None
+            if op in (RFC6902_COPY,RFC6902_MOVE):
+                sptr = p.src if isinstance(p.src,JSONPointer) else JSONPointer(p.src)
+                src = self._path(sptr)
+            value = p.value
+            if op in (RFC6902_REPLACE,RFC6902_TEST) and type(value) is str:
+                value = unicode(value)
+            elif copyvalues and type(value) in (dict,list):
+                value = copy.deepcopy(value) # independent from the task list
+            self.steps.append([op,target,tptr,src,sptr,value,None,None])
+            paths.update(target[1])
+            if src != None:
+                paths.update(src[1])
+
+        # paths below each path, for the invalidation of the cache
+        below = {}
+        for k in paths:
+            for l in range(len(k)):
+                below.setdefault(k[:l],[]).append(k)
+        for s in self.steps:
+            s[6] = self._invalid(s[1],below)
+            if s[3] != None:
+                s[7] = self._invalid(s[3],below)
+
+    def __call__(self, jsondata, atomic=True):
+        """Applies the plan, see 'apply'."""
+        return self.apply(jsondata,atomic)
+
+    def __len__(self):
+        return len(self.steps)
+
+    @staticmethod
+    def _path(ptr):
+        """Gets '(components, prefixes)' of the parent, and the component of the child."""
+        if not len(ptr):
+            raise JSONPatchItemException("The whole document is not supported as target.")
+        comps = [_component(x) for x in ptr]
+        keys = tuple(c[0] for c in comps[:-1])
+        return (comps[:-1], [keys[:l] for l in range(len(keys)+1)], comps[-1])
+
+    @staticmethod
+    def _invalid(path, below):
+        """Gets the cached paths invalidated by a change of the child of 'path'.
+
+        Returns:
+            A tuple of the paths invalidated by the assignment of the
+            child, and of the paths invalidated by the removal from an
+            array, which shifts the following items.
+        """
+        parent = path[1][-1]
+        child = parent+(path[2][0],)
+        return (below.get(child,[]) + [child], below.get(parent,[]))
+
+    @staticmethod
+    def _parent(cache, path):
+        """Gets the parent container of a path by the cache."""
+        comps,prefixes,_c = path
+        l = len(comps)
+        n = cache.get(prefixes[l])
+        if n is not None:
+            return n
+        i = l - 1
+        while prefixes[i] not in cache:
+            i -= 1
+        n = cache[prefixes[i]]
+        while i < l:
+            n = _child(n,comps[i])
+            i += 1
+            cache[prefixes[i]] = n
+        return n
+
+    def apply(self, jsondata, atomic=True):
+        """Applies the plan on a document.
+
+        The application is atomic by default in accordance to RFC6902.
+        The inverse of each operation is recorded while executed, and
+        when an operation fails, including a failed 'test', the recorded
+        operations are reverted in reverse order. Thus the document is
+        either patched completely, or remains unchanged, without a copy
+        of the document.
+
+        Args:
+            jsondata: Document to be patched, either a 'JSONDataSerializer',
+                or the in-memory data.
+
+            atomic: Reverts the applied operations on failure, and stops
+                at the first failed 'test'. Else the failed tests are
+                skipped, and the operations before an exception remain
+                applied.
+
+                default:= True
+
+        Returns:
+            Returns a tuple of:
+                0: len of the job list
+                1: list of the indexes of the failed tasks, when atomic
+                    either empty, or the index of the failed 'test'
+
+        Raises:
+            JSONPatchException:
+
+            forwarded from the access of the containers, after the
+            rollback when atomic
+        """
+        serializer = None
+        if isinstance(jsondata,JSONDataSerializer):
+            serializer = jsondata
+            jsondata = serializer.data
+        cache = {(): jsondata}
+        status = []
+        undo = [] if atomic else None
+        parent = self._parent
+        copyvalues = self.copyvalues
+        try:
+            for i,(op,target,tptr,src,sptr,value,tinval,sinval) in enumerate(self.steps):
+                if op is RFC6902_TEST:
+                    n = parent(cache,target)
+                    if _child(n,target[2]) != value:
+                        status.append(i)
+                        if atomic:
+                            _undo(undo)
+                            break
+                    continue
+
+                if serializer != None:
+                    if op is RFC6902_MOVE:
+                        serializer._mark_dirty(sptr)
+                    serializer._mark_dirty(tptr)
+
+                if op is RFC6902_ADD:
+                    if serializer != None:
+                        # same as 'branch_add', which creates missing nodes
+                        try:
+                            n = parent(cache,target)
+                        except (KeyError,IndexError,ValueError,TypeError,JSONPatchException,):
+                            n = None
+                        c = target[2]
+                        if type(n) is dict and c[0] or \
+                                type(n) is list and (c[1] == '-' or c[1] != None and 0 <= c[1] < len(n)):
+                            _set(n,c,copy.deepcopy(value),undo,True)
+                        else:
+                            if undo != None:
+                                undo.append(_created(jsondata,target))
+                            serializer.branch_add(tptr,None,value)
+                            cache = {(): jsondata}
+                            continue
+                    else:
+                        if copyvalues and type(value) in (dict,list):
+                            _set(parent(cache,target),target[2],copy.deepcopy(value),undo,True)
+                        else:
+                            _set(parent(cache,target),target[2],value,undo,True)
+
+                elif op is RFC6902_REPLACE:
+                    if copyvalues and type(value) in (dict,list):
+                        _set(parent(cache,target),target[2],copy.deepcopy(value),undo)
+                    else:
+                        _set(parent(cache,target),target[2],value,undo)
+
+                elif op is RFC6902_REMOVE:
+                    n = parent(cache,target)
+                    _pop(n,target[2],undo)
+                    if type(n) is list:
+                        for k in tinval[1]:
+                            cache.pop(k,None)
+                        continue
+
+                elif op is RFC6902_COPY:
+                    val = _child(parent(cache,src),src[2])
+                    if type(val) in (dict,list): # never shared within the document
+                        val = copy.deepcopy(val)
+                    _set(parent(cache,target),target[2],val,undo)
+
+                elif op is RFC6902_MOVE:
+                    sn = parent(cache,src)
+                    val = _pop(sn,src[2],undo)
+                    for k in sinval[1 if type(sn) is list else 0]:
+                        cache.pop(k,None)
+                    n = parent(cache,target)
+                    c = target[2]
+                    if type(n) is list and c[1] != '-' and c[1] != None and len(n) <= c[1]:
+                        c = (c[0],'-') # appended
+                    _set(n,c,val,undo,True)
+
+                for k in tinval[0]:
+                    cache.pop(k,None)
+        except:
+            if atomic:
+                e = sys.exc_info()
+                _undo(undo)
+                raise e[0],e[1],e[2]
+            raise
+
+        return len(self.steps),status
+
+def _isindex(c):
+    """Checks whether a pointer component could address an array item."""
+    return c == u'-' or c.isdigit()
+
+def _related(p, q):
+    """Checks whether one of two footprints contains the other.
+
+    The component None of a footprint is any index of an array.
+    """
+    for x,y in zip(p,q):
+        if x != y and not (x is None and (y is None or _isindex(y))
+                           or y is None and _isindex(x)):
+            return False
+    return True
+
+def _footprints(item):
+    """Gets the locations read and written by a task, a list of '(footprint, write)'.
+
+    The removal from arrays, the append, and the target of 'move', which
+    appends beyond the end, change the indexes of the following items,
+    thus write any item of the parent.
+    """
+    t = tuple(_component(x)[0] for x in item.target)
+    if not t:
+        raise JSONPatchItemException("The whole document is not supported as target.")
+    op = item.op
+    if op is RFC6902_TEST:
+        return [(t,False)]
+    if op is RFC6902_REPLACE:
+        return [(t,True)]
+    shift = t[:-1]+(None,)
+    if op is RFC6902_REMOVE:
+        return [(shift if _isindex(t[-1]) else t,True)]
+    if op is RFC6902_ADD:
+        return [(shift if t[-1] == u'-' else t,True)]
+    s = tuple(_component(x)[0] for x in JSONPointer(item.src))
+    if op is RFC6902_COPY:
+        return [(s,False),(shift if t[-1] == u'-' else t,True)]
+    if op is RFC6902_MOVE:
+        return [(s[:-1]+(None,) if s and _isindex(s[-1]) else s,True),
+                (shift if _isindex(t[-1]) else t,True)]
+    raise JSONPatchItemException("Unknown operation.")
+
+class _Optimizer(object):
+    """Collects the tasks of 'JSONPatch.optimize'.
+
+    Each task is compared with the present tasks on related locations,
+    the latest first, until the first conflicting task, which either is
+    folded with the new task, or is a barrier. The tasks are indexed by
+    the prefixes of their locations, thus the unrelated tasks are not
+    visited.
+    """
+
+    def __init__(self):
+        self.items = [] # the tasks, None when dropped
+        self.fps = [] # the footprints of the tasks
+        self.owned = [] # the value is a private copy
+        self.below = {} # normalized prefix: [index]
+        self.at = {} # normalized footprint: [index]
+
+    def candidates(self, fps):
+        """Gets the indexes of the present tasks related to the footprints, the latest first."""
+        ret = set()
+        lists = []
+        for f,_w in fps:
+            nf = tuple(None if c is None or _isindex(c) else c for c in f)
+            lists.append((self.below,nf))
+            lists.extend((self.at,nf[:l]) for l in range(1,len(nf)))
+        for d,k in lists:
+            l = d.get(k)
+            if l:
+                l[:] = [i for i in l if self.items[i] is not None] # drops the removed
+                ret.update(l)
+        return sorted((i for i in ret
+                       if any(_related(f,g) for f,_w in fps for g,_x in self.fps[i])),
+                      reverse=True)
+
+    def conflict(self, i, fps):
+        return any((w or x) and _related(f,g) for f,w in fps for g,x in self.fps[i])
+
+    def append(self, item, fps):
+        i = len(self.items)
+        self.items.append(item)
+        self.fps.append(fps)
+        self.owned.append(False)
+        for f,_w in fps:
+            nf = tuple(None if c is None or _isindex(c) else c for c in f)
+            self.at.setdefault(nf,[]).append(i)
+            for l in range(1,len(nf)+1):
+                self.below.setdefault(nf[:l],[]).append(i)
+
+    def add(self, item):
+        """Adds a task, folded into a present task when possible."""
+        fps = _footprints(item)
+        op = item.op
+        t = tuple(_component(x)[0] for x in item.target)
+        reads = [f for f,w in fps if not w]
+        for i in self.candidates(fps):
+            if not self.conflict(i,fps):
+                continue
+            e = self.items[i]
+            et = tuple(_component(x)[0] for x in e.target)
+            if op in (RFC6902_REMOVE,RFC6902_REPLACE) and u'-' not in t and e.op is not RFC6902_TEST \
+                    and all(len(f) > len(t) and f[:len(t)] == t for f,w in self.fps[i] if w):
+                self.items[i] = None # shadowed by the removal, or the replacement of a parent
+                continue
+            if et == t and u'-' not in t:
+                if not any(_related(f,t) for f in reads) and self.fold(i,e,item):
+                    return
+            elif len(et) < len(t) and t[:len(et)] == et and u'-' not in et and not reads:
+                if self.merge(i,e,item,t[len(et):]):
+                    return
+            break
+        self.append(item,fps)
+
+    def fold(self, i, e, item):
+        """Folds a task into the present task on the same location."""
+        op = item.op
+        if e.op in (RFC6902_ADD,RFC6902_REPLACE,RFC6902_COPY):
+            if op in (RFC6902_ADD,RFC6902_REPLACE):
+                if RFC6902_ADD in (e.op,op):
+                    self.items[i] = JSONPatchItem('add',item.target,item.value)
+                else:
+                    self.items[i] = JSONPatchItem('replace',item.target,item.value)
+            elif op is RFC6902_COPY and e.op is not RFC6902_ADD:
+                self.items[i] = None # overwritten, the copy is appended
+                return False
+            else:
+                return False
+        elif e.op is RFC6902_REMOVE and op in (RFC6902_ADD,RFC6902_REPLACE) \
+                and not _isindex(_component(item.target[-1])[0]):
+            self.items[i] = JSONPatchItem('replace',item.target,item.value)
+        else:
+            return False
+        self.owned[i] = False
+        return True
+
+    def merge(self, i, e, item, rest):
+        """Applies a task on a location within the value of a present 'add', or 'replace'."""
+        if e.op not in (RFC6902_ADD,RFC6902_REPLACE) or type(e.value) not in (dict,list) \
+                or item.op not in (RFC6902_ADD,RFC6902_REPLACE,RFC6902_REMOVE):
+            return False
+        value = e.value if self.owned[i] else copy.deepcopy(e.value)
+        try:
+            JSONPatchPlan([JSONPatchItem(op2str[item.op],JSONPointer(list(rest),False),item.value)]).apply(value,False)
+        except (KeyError,IndexError,ValueError,TypeError,AttributeError,JSONPatchException,):
+            return False
+        self.items[i] = JSONPatchItem(op2str[e.op],e.target,value)
+        self.owned[i] = True
+        return True
+
 class JSONPatch(object):
     """ Representation of a JSONPatch task list for RFC6902.
     
@@ -678,25 +1493,233 @@ class JSONPatch(object):
             ret.patch.remove(x)
         return ret
 
-    def apply(self,jsondata):
+    def apply(self,jsondata,atomic=True):
         """Applies the JSONPatch task.
 
+        The task list is applied atomically in accordance to RFC6902,
+        when a task fails the previous tasks are reverted, see
+        'JSONPatchPlan.apply'. The values of the types 'dict' and 'list'
+        are inserted as copies, thus neither shared by the document and
+        the task list, nor by several documents. For the repeated
+        application refer to 'compile'.
+
         Args:
             jsondata: JSON data the joblist has to be applied on.
 
+            atomic: Reverts the applied tasks on failure.
+
+                default:= True
+
         Returns:
             Returns a tuple of:
                 0: len of the job list
-                1: list of the execution status for the tasks
+                1: list of the indexes of the failed tasks
 
         Raises:
             JSONPatchException:
         """
-        status = []
-        for p in self.patch:
-            if not p.apply(jsondata):
-                status.append(self.patch.index(p)) # should not be called frequently
-        return len(self.patch),status
+        plan = JSONPatchPlan(self.patch,False)
+        plan.copyvalues = True # copied when inserted, the plan is used once
+        return plan.apply(jsondata,atomic)
+
+    def apply_bulk(self, documents, processes=None, writeback=True, chunksize=BULKCHUNK, backend=None):
+        """Applies the patch onto many documents by a pool of processes.
+
+        The patch is compiled once by each worker process, see 'compile',
+        the documents are passed in tasks of 'chunksize', and the files
+        are read and written by the workers. The documents are consumed
+        from 'documents' while processed, at most two tasks for each
+        process are pending, thus neither the documents, nor the results
+        are held in memory as a whole. Each document is patched
+        atomically, the files are written by 'json_write', thus
+        atomically too, and only when changed.
+
+        Args:
+            documents: Iterable of the documents, each either the path
+                of a JSON file, the in-memory data, or a 'JSONData'.
+
+            processes: Maximum number of processes, values less than 2
+                apply sequentially.
+
+                default:= cpu_count()
+
+            writeback: Writes the patched files. Else the patched data
+                of the files is returned.
+
+                default:= True
+
+            chunksize: Number of documents of a task.
+
+                default:= BULKCHUNK
+
+            backend: The JSON package for the files, has to be
+                reproducible by name, else the documents are patched
+                sequentially, see 'jsondata.JSONDataBackend.get_backend'.
+
+                default:= None
+
+        Returns:
+            Generator of the status of each document in the order of
+            'documents', the tuple '(document, ok, value)':
+
+                document: The path, or the index of the in-memory
+                    document.
+
+                ok: True when patched.
+
+                value: When patched the patched data, or for a written
+                    file True, and False when unchanged. Else the list of
+                    the index of the failed 'test', or the exception.
+
+            The passed in-memory documents are not changed.
+
+        Raises:
+            JSONPatchItemException:
+        """
+        plan = JSONPatchPlan(self.patch) # raises the errors of the patch early
+        backend = get_backend(backend)
+        try:
+            if get_backend(backend.name).module is not backend.module:
+                processes = 1
+        except JSONDataValue:
+            processes = 1
+        if processes == None:
+            try:
+                processes = multiprocessing.cpu_count()
+            except NotImplementedError:
+                processes = 1
+        chunksize = max(1,chunksize)
+
+        def tasks():
+            keys = []
+            docs = []
+            for i,d in enumerate(documents):
+                if isinstance(d,basestring):
+                    keys.append(d)
+                else:
+                    keys.append(i)
+                    if isinstance(d,JSONData):
+                        d = d.data
+                docs.append(d)
+                if len(docs) == chunksize:
+                    yield keys,(docs,writeback,backend.name)
+                    keys = []
+                    docs = []
+            if docs:
+                yield keys,(docs,writeback,backend.name)
+
+        def sequential():
+            for keys,task in tasks():
+                for k,r in zip(keys,_bulk_apply(task,plan,True)):
+                    yield (k,)+r
+
+        def parallel():
+            pool = multiprocessing.Pool(processes,_bulk_init,(self.patch,))
+            pending = collections.deque()
+            done = False
+            try:
+                for keys,task in tasks():
+                    pending.append((keys,pool.apply_async(_bulk_apply,(task,))))
+                    if len(pending) < 2*processes:
+                        continue
+                    keys,res = pending.popleft()
+                    for k,r in zip(keys,res.get()):
+                        yield (k,)+r
+                while pending:
+                    keys,res = pending.popleft()
+                    for k,r in zip(keys,res.get()):
+                        yield (k,)+r
+                done = True
+            finally:
+                if done:
+                    pool.close()
+                else: # abandoned, or failed
+                    pool.terminate()
+                pool.join()
+
+        if processes < 2:
+            return sequential()
+        return parallel()
+
+    def compile(self):
+        """Compiles the task list into an execution plan.
+
+        The plan is applied repeatedly at a low cost for each document,
+        e.g. for the application of the same patch onto many documents,
+        see 'JSONPatchPlan'. Later changes of the task list are not
+        contained in a present plan.
+
+        Returns:
+            The plan 'JSONPatchPlan'.
+
+        Raises:
+            JSONPatchItemException:
+        """
+        return JSONPatchPlan(self.patch)
+
+    @classmethod
+    def from_diff(cls, a, b, maxcost=DIFFCOST, prefix=None):
+        """Creates the patch transforming 'a' into 'b'.
+
+        The subtrees are compared by the digests of their canonical form,
+        which are calculated once for each node, thus unchanged branches
+        are skipped at the cost of one comparison:
+
+        * objects by the keys, the changed members are compared recursively,
+        * arrays by the longest common subsequence of the items by the
+          algorithm of Myers, with more than 'maxcost' edits by index,
+        * members removed from an object, and added equal to an object
+          are moved,
+        * items removed from an array, and inserted equal into the same
+          array are moved.
+
+        The operation 'add' replaces present items of arrays, thus the
+        inserted items are appended, and the items following the first
+        insertion are moved to the end in their new order. When the
+        comparison by index requires less operations, it is applied
+        instead, which replaces the changed items. The values are
+        contained by reference, see 'compile' for the repeated
+        application.
+
+        Args:
+            a: The source document, either a 'JSONData', or the in-memory
+                data.
+
+            b: The target document, either a 'JSONData', or the in-memory
+                data.
+
+            maxcost: The maximum number of insertions and deletions for
+                the comparison of an array by the common subsequence.
+
+                default:= DIFFCOST
+
+            prefix: The path of 'a' within the patched document as list
+                of keys, which is prepended to the paths of the patch.
+                Thus 'a' is replaced as a whole, when the type changes.
+
+                default:= None, 'a' is the whole document
+
+        Returns:
+            The patch, empty when equal.
+
+        Raises:
+            JSONPatchException:
+
+            JSONDataValue: Values which are not JSON data.
+        """
+        if isinstance(a,JSONData):
+            a = a.data
+        if isinstance(b,JSONData):
+            b = b.data
+        differ = _Differ(maxcost)
+        if not prefix and differ.digest(a) != differ.digest(b) and not (
+                isinstance(a,dict) and isinstance(b,dict) or
+                isinstance(a,list) and isinstance(b,list)):
+            raise JSONPatchException("The whole document is not supported as target.")
+        differ.diff(a,b,list(prefix or []))
+        ret = cls()
+        ret.patch = differ.patch()
+        return ret
 
     def get(self,x=None):
         """
@@ -706,6 +1729,42 @@ class JSONPatch(object):
         #FIXME:
         return ret
 
+    def optimize(self):
+        """Creates an equivalent patch with less tasks.
+
+        The tasks are folded with the previous tasks on related
+        locations, unless a task between reads, or changes the same
+        location, including the indexes of the items of the same array:
+
+        * consecutive 'add', 'replace', and 'copy' on the same location
+          are folded into the last value, 'add' when any of them is
+          'add', a removed member added again is replaced,
+        * tasks within a location removed, or replaced later are dropped,
+        * tasks within the value of a previous 'add', or 'replace' are
+          applied onto the value, e.g. the append of items to a new array.
+
+        A 'test' is kept at its position, and reads the same values, thus
+        the result of the tests is unchanged. A 'remove' following an
+        'add' is kept with the 'add', because 'add' replaces a present
+        member, thus the previous presence is not known. The result is
+        equivalent for the documents the patch applies to without the
+        creation of missing nodes by a 'JSONDataSerializer'. The present
+        patch is not changed, the values are shared, except for the
+        values changed by the folding.
+
+        Returns:
+            The optimized 'JSONPatch'.
+
+        Raises:
+            JSONPatchItemException:
+        """
+        o = _Optimizer()
+        for p in self.patch:
+            o.add(p)
+        ret = JSONPatch()
+        ret.patch = [p for p in o.items if p is not None]
+        return ret
+
     def patch_export(self, patchfile, schema=None, **kargs):
         """Exports the current task list.
         
@@ -715,12 +1774,23 @@ class JSONPatch(object):
         Supports the formats:
             RFC6902
 
+        The file is replaced atomically, and not touched when unchanged,
+        see 'jsondata.JSONDataIO.AtomicWriter'.
+
         Args:
             patchfile:
-                JSON patch for export.
+                JSON patch for export. Files with the suffix '.gz', '.bz2',
+                or '.xz' are compressed.
             schema:
                 JSON-Schema for validation of the patch list.
             **kargs:
+                compression: [gz, bz2, xz, False]
+                    Compression format.
+                    default:= by suffix of 'patchfile'
+                compresslevel: Compression level, 1 to 9.
+                    default:= 9
+                force: Writes the file even when unchanged.
+                    default:= False
                 validator: [default, draft3, off, ]
                     Sets schema validator for the data file.
                     The values are: default=validate, draft3=Draft3Validator,
@@ -734,9 +1804,17 @@ class JSONPatch(object):
             JSONPatchException:
 
         """
+        compression = kargs.get('compression',None)
+        compresslevel = kargs.get('compresslevel',COMPRESSLEVEL)
         try:
-            with open(patchfile, 'w') as fp:
-                fp.writelines(self.repr_export())
+            w = AtomicWriter(patchfile,kargs.get('force',False),
+                compression=compression,compresslevel=compresslevel)
+            try:
+                w.write(self.repr_export())
+            except:
+                w.abort()
+                raise
+            w.commit()
         except Exception as e:
             raise JSONPatchException("open-"+str(e),"data.dump",str(patchfile))
         return True
@@ -750,14 +1828,16 @@ class JSONPatch(object):
         Args:
             patchfile:
                 JSON patch filename containing the list of patch operations.
+                Compressed files are decompressed transparently.
             schemafile:
                 JSON-Schema filename for validation of the patch list.
+                The parsed schema is shared by 'jsondata.JSONDataIO.schemacache'.
             **kargs:
                 validator: [default, draft3, off, ]
                     Sets schema validator for the data file.
                     The values are: default=validate, draft3=Draft3Validator,
                     off=None.
-                    default:= validate
+                    default:= off
 
         Returns:
             When successful returns 'True', else raises an exception.
@@ -767,25 +1847,75 @@ class JSONPatch(object):
 
         """
         appname = _appname
-        kargs = {}
-        kargs['datafile'] = patchfile
-        kargs['schemafile'] = schemafile
-        kargs['validator'] = MODE_SCHEMA_OFF
+        kserial = {}
+        kserial['datafile'] = patchfile
+        kserial['schemafile'] = schemafile
+        kserial['validator'] = MODE_SCHEMA_OFF
         for k,v in kargs.items():
             if k == 'nodefaultpath':
-                kargs['nodefaultpath'] = True
+                kserial['nodefaultpath'] = True
             elif k == 'pathlist':
-                kargs['pathlist'] = v
+                kserial['pathlist'] = v
             elif k == 'validator':
-                kargs['validator'] = v
+                kserial['validator'] = v
             elif k == 'appname':
                 appname = v
-        patchdata = JSONDataSerializer(appname,**kargs)
+        patchdata = JSONDataSerializer(appname,**kserial)
 
-        for pi in patchdata.data:
-            self += JSONPatchItemRaw(pi)
+        # appended in one step, thus contiguous for concurrent imports
+        self.patch.extend([JSONPatchItemRaw(pi) for pi in patchdata.data])
         return True
 
+    def patch_export_async(self, patchfile, schema=None, **kargs):
+        """Exports the current task list asynchronously by a thread of the executor.
+
+        For the parameters refer to 'patch_export'.
+
+        Args:
+            **kargs: Additional to 'patch_export':
+                callback: Called with the result when successful.
+                    default:= None
+                executor: The executor, see 'jsondata.JSONDataIO.IOExecutor'.
+                    default:= jsondata.JSONDataIO.ioexecutor
+
+        Returns:
+            The 'IOResult' of the call, 'get' returns the result of
+            'patch_export', or raises its exception.
+
+        Raises:
+            None.
+        """
+        executor = kargs.pop('executor',ioexecutor)
+        callback = kargs.pop('callback',None)
+        return executor.submit(self.patch_export,(patchfile,schema),kargs,callback)
+
+    def patch_import_async(self, patchfile, schemafile=None, **kargs):
+        """Imports a task list asynchronously by a thread of the executor.
+
+        The load is limited by the queue of the executor, see
+        'IOExecutor.submit'. The order
+        of the imported task lists is the order of the completion, thus
+        concurrent imports into the same patch should be applied to
+        independent tasks only. For the parameters refer to 'patch_import'.
+
+        Args:
+            **kargs: Additional to 'patch_import':
+                callback: Called with the result when successful.
+                    default:= None
+                executor: The executor, see 'jsondata.JSONDataIO.IOExecutor'.
+                    default:= jsondata.JSONDataIO.ioexecutor
+
+        Returns:
+            The 'IOResult' of the call, 'get' returns the result of
+            'patch_import', or raises its exception.
+
+        Raises:
+            None.
+        """
+        executor = kargs.pop('executor',ioexecutor)
+        callback = kargs.pop('callback',None)
+        return executor.submit(self.patch_import,(patchfile,schemafile),kargs,callback,True)
+
     def repr_export(self):
         """Prints the export representation format of a JSON patch list.
         """
@@ -798,3 +1928,46 @@ class JSONPatch(object):
         ret += "]"
         return ret
 
+_bulkplan = None
+"""The plan of a worker process of 'JSONPatch.apply_bulk'."""
+
+def _bulk_init(patch):
+    """Compiles the patch once within a worker of 'JSONPatch.apply_bulk'."""
+    global _bulkplan
+    _bulkplan = JSONPatchPlan(patch)
+
+def _bulk_apply(task, plan=None, copydata=False):
+    """Applies the plan onto the documents of a task of 'JSONPatch.apply_bulk'.
+
+    Returns:
+        List of '(ok, value)' for each document.
+    """
+    docs,writeback,backend = task
+    if plan == None:
+        plan = _bulkplan
+    ret = []
+    for d in docs:
+        try:
+            if isinstance(d,basestring):
+                try:
+                    data = json_load(d,backend=backend)
+                except (IOError,OSError,ValueError,) as e:
+                    raise JSONDataSourceFile("read","patch",str(d),str(e))
+            elif copydata:
+                data = copy.deepcopy(d)
+            else: # a copy already
+                data = d
+            _n,failed = plan.apply(data)
+            if failed:
+                ret.append((False,failed))
+            elif isinstance(d,basestring) and writeback:
+                ret.append((True,json_write(d,data,backend=backend)))
+            else:
+                ret.append((True,data))
+        except Exception as e:
+            try:
+                pickle.dumps(e)
+            except Exception: # has to pass the process boundary
+                e = JSONPatchException(str(e))
+            ret.append((False,e))
+    return ret
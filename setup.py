@@ -381,6 +381,10 @@ if 'build_doc' in sys.argv:
         'jsondata_branch_operations.html',
         'jsondata_branch_serializer.html',
         'jsondata_m_tree.html',
+        'jsondata_m_io.html',
+        'jsondata_m_backend.html',
+        'jsondata_m_schema.html',
+        'jsondata_m_canonical.html',
         'jsondata_m_serializer.html',
         'jsondata_m_patch.html',
         'jsondata_m_pointer.html',
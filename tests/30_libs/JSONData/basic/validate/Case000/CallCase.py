@@ -0,0 +1,132 @@
+"""Quiet validation by a lazy iterator of structured error records.
+"""
+from __future__ import absolute_import
+
+import unittest
+import os
+import sys
+
+if 'ujson' in sys.argv:
+    import ujson as myjson
+else:
+    import json as myjson
+import jsonschema
+from jsonschema import ValidationError,SchemaError
+from StringIO import StringIO
+
+from jsondata.JSONData import JSONData as ConfigData
+from jsondata.JSONData import MODE_SCHEMA_OFF,MODE_SCHEMA_DRAFT4
+
+# name of application, used for several filenames as MODE_SCHEMA_DRAFT4
+_APPNAME = "jsondc"
+appname = _APPNAME
+
+#
+#######################
+#
+class CallUnits(unittest.TestCase):
+    name=os.path.curdir+__file__
+
+    output=True
+    output=False
+
+    def testCase000(self):
+        """Load data and schema, create a data object without validation.
+        """
+        global jval
+        global sval
+        global configdata
+
+        datafile = os.path.abspath(os.path.dirname(__file__))+os.sep+str('testdata.json')
+        schemafile = os.path.abspath(os.path.dirname(__file__))+os.sep+str('testdata.jsd')
+        with open(datafile) as data_file:
+            jval = myjson.load(data_file)
+        with open(schemafile) as schema_file:
+            sval = myjson.load(schema_file)
+
+        kargs = {}
+        kargs['data'] = jval
+        kargs['schema'] = sval
+        kargs['validator'] = MODE_SCHEMA_OFF
+        configdata = ConfigData(**kargs)
+
+    def testCase010(self):
+        """Default mode raises the first error.
+        """
+        try:
+            configdata.validate(jval,sval,MODE_SCHEMA_DRAFT4)
+        except ValidationError:
+            pass
+        else:
+            assert False
+
+    def testCase020(self):
+        """Quiet mode returns all errors as records.
+        """
+        errs = configdata.validate(jval,sval,MODE_SCHEMA_DRAFT4,quiet=True)
+        errs = sorted(errs,key=lambda e: e['pointer'])
+
+        assert [e['pointer'] for e in errs] == [
+            u'/address/city', u'/address/houseNumber', 
+            u'/phoneNumber/1/number', u'/phoneNumber/2/type'
+        ]
+        assert errs[0]['schema_path'] == u'/properties/address/properties/city/type'
+        assert errs[0]['message'] == u"7 is not of type u'string'"
+
+    def testCase030(self):
+        """Quiet mode with cutoff.
+        """
+        errs = list(configdata.validate(jval,sval,MODE_SCHEMA_DRAFT4,quiet=True,maxerrors=1))
+        assert len(errs) == 1
+
+    def testCase040(self):
+        """Quiet mode is lazy, errors are computed on demand.
+        """
+        errs = configdata.validate(jval,sval,MODE_SCHEMA_DRAFT4,quiet=True)
+        assert iter(errs) is errs
+        assert next(errs)['pointer'] in (
+            u'/address/city', u'/address/houseNumber', 
+            u'/phoneNumber/1/number', u'/phoneNumber/2/type'
+        )
+
+    def testCase050(self):
+        """Quiet mode on valid data.
+        """
+        errs = configdata.validate(jval['phoneNumber'][0],sval['properties']['phoneNumber']['items'],MODE_SCHEMA_DRAFT4,quiet=True)
+        assert list(errs) == []
+
+    def testCase060(self):
+        """Quiet mode raises for an invalid schema, even for valid data.
+        """
+        for data in ({},{'a':1}):
+            errs = configdata.validate(data,{'type':7},MODE_SCHEMA_DRAFT4,quiet=True)
+            try:
+                next(errs)
+            except SchemaError:
+                pass
+            else:
+                assert False, "expected SchemaError"
+
+    def testCase070(self):
+        """Verbose output of non-ASCII messages.
+        """
+        oout = sys.stdout
+        sys.stdout = StringIO()
+        configdata.verbose = True
+        try:
+            configdata.validate({u'\xe4':u'\u20ac'},{'properties':{u'\xe4':{'enum':[1]}}},MODE_SCHEMA_DRAFT4)
+        except ValidationError:
+            pass
+        else:
+            assert False, "expected ValidationError"
+        finally:
+            configdata.verbose = False
+            sout = sys.stdout.getvalue()
+            sys.stdout = oout
+        assert "VERB:ValidationError:/\\xe4:u'\\u20ac' is not one of [1]" in sout
+
+#
+#######################
+#
+if __name__ == '__main__':
+    unittest.main()
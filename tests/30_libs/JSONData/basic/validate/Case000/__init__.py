@@ -0,0 +1,2 @@
+"""Quiet validation by structured error records.
+"""
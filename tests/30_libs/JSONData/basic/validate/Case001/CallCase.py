@@ -0,0 +1,108 @@
+"""Parallel validation of the items of a large top-level array.
+"""
+from __future__ import absolute_import
+
+import unittest
+import os
+import sys
+
+if 'ujson' in sys.argv:
+    import ujson as myjson
+else:
+    import json as myjson
+import jsonschema
+from jsonschema import ValidationError
+
+from jsondata.JSONData import JSONData as ConfigData
+from jsondata.JSONData import MODE_SCHEMA_OFF,MODE_SCHEMA_DRAFT4
+
+# name of application, used for several filenames as MODE_SCHEMA_DRAFT4
+_APPNAME = "jsondc"
+appname = _APPNAME
+
+#
+#######################
+#
+class CallUnits(unittest.TestCase):
+    name=os.path.curdir+__file__
+
+    output=True
+    output=False
+
+    def testCase000(self):
+        """Create a large array with some invalid items.
+        """
+        global jval
+        global sval
+        global configdata
+
+        jval = [ {u'id': i, u'name': u'n'+unicode(i)} for i in range(0,5000) ]
+        jval[17]['id'] = u'17'
+        jval[2345]['name'] = 2345
+        jval[4999]['id'] = None
+
+        sval = {
+            "$schema": "http://json-schema.org/draft-04/schema#",
+            "definitions": {
+                "name": {"type": "string"}
+            },
+            "type": "array",
+            "minItems": 1,
+            "items": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "integer"},
+                    "name": {"$ref": "#/definitions/name"}
+                }
+            }
+        }
+
+        kargs = {}
+        kargs['data'] = jval
+        kargs['schema'] = sval
+        kargs['validator'] = MODE_SCHEMA_OFF
+        configdata = ConfigData(**kargs)
+
+    def testCase010(self):
+        """Parallel and serial validation provide the same errors.
+        """
+        serial = list(configdata.validate(jval,sval,MODE_SCHEMA_DRAFT4,quiet=True))
+        parallel = list(configdata.validate(jval,sval,MODE_SCHEMA_DRAFT4,quiet=True,processes=2,chunksize=500))
+
+        assert [e['pointer'] for e in parallel] == [u'/17/id', u'/2345/name', u'/4999/id']
+        assert serial == parallel
+        assert parallel[1]['schema_path'] == u'/items/properties/name/type'
+
+    def testCase020(self):
+        """Parallel validation with cutoff.
+        """
+        parallel = list(configdata.validate(jval,sval,MODE_SCHEMA_DRAFT4,quiet=True,processes=2,chunksize=500,maxerrors=2))
+        assert [e['pointer'] for e in parallel] == [u'/17/id', u'/2345/name']
+
+    def testCase030(self):
+        """Parallel validation raises the first error.
+        """
+        try:
+            configdata.validate(jval,sval,MODE_SCHEMA_DRAFT4,processes=2,chunksize=500)
+        except ValidationError as e:
+            assert list(e.path) == [17, u'id']
+        else:
+            assert False
+
+    def testCase040(self):
+        """Parallel validation of the container keywords.
+        """
+        errs = list(configdata.validate(jval,dict(sval,maxItems=10),MODE_SCHEMA_DRAFT4,quiet=True,processes=2,chunksize=500))
+        assert [e['pointer'] for e in errs] == [u'', u'/17/id', u'/2345/name', u'/4999/id']
+        assert errs[0]['schema_path'] == u'/maxItems'
+
+    def testCase050(self):
+        """Parallel validation of valid data.
+        """
+        configdata.validate(jval[18:2000],sval,MODE_SCHEMA_DRAFT4,processes=2,chunksize=500)
+
+#
+#######################
+#
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,2 @@
+"""Parallel validation of array items.
+"""
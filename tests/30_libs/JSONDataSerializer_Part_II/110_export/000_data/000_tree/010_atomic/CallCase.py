@@ -0,0 +1,146 @@
+"""Atomic export by jsondata.JSONDataSerializer.json_export().
+"""
+from __future__ import absolute_import
+
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+
+#
+if 'ujson' in sys.argv:
+    import ujson as myjson
+else:
+    import json as myjson
+import jsonschema
+
+
+from jsondata.JSONDataSerializer import JSONDataSerializer as ConfigData
+from jsondata.JSONDataSerializer import MODE_SCHEMA_OFF,MODE_SCHEMA_DRAFT4
+from jsondata.JSONDataExceptions import JSONDataTargetFile
+from jsondata.JSONDataIO import AtomicWriter
+
+# name of application, used for several filenames as MODE_SCHEMA_DRAFT4
+_APPNAME = "jsondc"
+appname = _APPNAME
+mypath = os.path.dirname(__file__)+os.sep
+#
+#######################
+#
+class CallUnits(unittest.TestCase):
+    """Export repeatedly, the file is replaced only when changed.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        global tmpdir
+        global configdata
+        global fname
+
+        tmpdir = tempfile.mkdtemp()
+        fname = tmpdir+os.sep+'export.json'
+
+        kargs = {}
+        kargs['datafile'] = mypath+'datafile.json'
+        kargs['schemafile'] = mypath+'schema.jsd'
+        kargs['nodefaultpath'] = True
+        kargs['nosubdata'] = True
+        kargs['validator'] = MODE_SCHEMA_DRAFT4
+        configdata = ConfigData(appname,**kargs)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(tmpdir)
+
+    def testCase000(self):
+        """Initial export, same format as 'json.dump'.
+        """
+        global ino
+        assert configdata.json_export(None,fname)
+        with open(fname) as fp:
+            assert fp.read() == myjson.dumps(configdata.data)
+        ino = os.stat(fname).st_ino
+
+    def testCase010(self):
+        """Unchanged contents are not written.
+        """
+        assert configdata.json_export(None,fname)
+        assert os.stat(fname).st_ino == ino
+        assert os.listdir(tmpdir) == ['export.json']
+
+    def testCase020(self):
+        """Forced write replaces the file.
+        """
+        global ino
+        assert configdata.json_export(None,fname,force=True)
+        assert os.stat(fname).st_ino != ino
+        ino = os.stat(fname).st_ino
+
+    def testCase030(self):
+        """Changed contents replace the file.
+        """
+        configdata.data['address']['city'] = 'Boston'
+        assert configdata.json_export(None,fname)
+        assert os.stat(fname).st_ino != ino
+        with open(fname) as fp:
+            assert myjson.load(fp)['address']['city'] == 'Boston'
+
+    def testCase040(self):
+        """Failed encoding keeps the present file.
+        """
+        with open(fname) as fp:
+            data = fp.read()
+        configdata.data['address']['city'] = object()
+        try:
+            configdata.json_export(None,fname,force=True)
+        except JSONDataTargetFile:
+            pass
+        else:
+            assert False, "expected JSONDataTargetFile"
+        finally:
+            configdata.data['address']['city'] = 'Boston'
+        with open(fname) as fp:
+            assert fp.read() == data
+        assert os.listdir(tmpdir) == ['export.json']
+
+    def testCase050(self):
+        """Unchanged prefix, truncated and extended contents by small blocks.
+        """
+        f = tmpdir+os.sep+'blocks.txt'
+        for data,written in (('abcdefgh',True),('abcdefgh',False),('abcdXfgh',True),
+                             ('abcd',True),('abcdefghij',True),('abcdefghij',False)):
+            w = AtomicWriter(f,bufsize=3)
+            for c in data:
+                w.write(c)
+            assert w.commit() == written
+            with open(f) as fp:
+                assert fp.read() == data
+        os.unlink(f)
+
+    def testCase060(self):
+        """New files by the umask, the process wide umask is not changed.
+        """
+        f = tmpdir+os.sep+'mode.txt'
+        umask = os.umask(0o022)
+        os.umask(umask)
+        _umask = os.umask
+        def _nomask(mask):
+            raise AssertionError("umask changed by commit")
+        os.umask = _nomask
+        try:
+            w = AtomicWriter(f)
+            w.write('abc')
+            assert w.commit()
+        finally:
+            os.umask = _umask
+        assert os.stat(f).st_mode & 0o777 == 0o666 & ~umask
+        os.unlink(f)
+
+
+#
+#######################
+#
+
+if __name__ == '__main__':
+    unittest.main()
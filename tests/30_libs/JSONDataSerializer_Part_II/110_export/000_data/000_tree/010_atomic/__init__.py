@@ -0,0 +1,2 @@
+"""Atomic export, unchanged contents are not written.
+"""
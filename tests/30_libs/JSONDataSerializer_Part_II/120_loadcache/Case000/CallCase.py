@@ -0,0 +1,125 @@
+"""Load cache of jsondata.JSONDataSerializer for parsed data and schema files.
+"""
+from __future__ import absolute_import
+
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+
+#
+if 'ujson' in sys.argv:
+    import ujson as myjson
+else:
+    import json as myjson
+import jsonschema
+
+
+from jsondata.JSONDataSerializer import JSONDataSerializer as ConfigData
+from jsondata.JSONDataSerializer import MODE_SCHEMA_OFF,MODE_SCHEMA_DRAFT4
+from jsondata.JSONDataIO import LoadCache,loadcache,schemacache
+
+# name of application, used for several filenames as MODE_SCHEMA_DRAFT4
+_APPNAME = "jsondc"
+appname = _APPNAME
+#
+#######################
+#
+class CallUnits(unittest.TestCase):
+    """Load repeatedly, modify the file, and reload.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        global tmpdir
+        global datafile
+        global schemafile
+
+        tmpdir = tempfile.mkdtemp()
+        for f in ('datafile.json','schema.jsd',):
+            shutil.copy(os.path.dirname(__file__)+os.sep+f,tmpdir)
+        datafile = tmpdir+os.sep+'datafile.json'
+        schemafile = tmpdir+os.sep+'schema.jsd'
+        loadcache.clear()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(tmpdir)
+
+    def load(self,loadcached):
+        kargs = {}
+        kargs['datafile'] = datafile
+        kargs['schemafile'] = schemafile
+        kargs['nodefaultpath'] = True
+        kargs['nosubdata'] = True
+        kargs['validator'] = MODE_SCHEMA_DRAFT4
+        kargs['loadcached'] = loadcached
+        return ConfigData(appname,**kargs)
+
+    def testCase000(self):
+        """Initial load of data and schema into the cache.
+        """
+        global configdata
+
+        misses = loadcache.misses
+        configdata = self.load(True)
+        assert loadcache.misses == misses + 2
+        assert configdata.data["address"]["city"] == "New York"
+
+    def testCase010(self):
+        """Repeated load is served by the cache, and independent from the former.
+        """
+        hits = loadcache.hits
+        configdata.data["address"]["city"] = "Boston"
+
+        cd = self.load(True)
+        assert loadcache.hits == hits + 1 # schema is shared by 'schemacache'
+        assert cd.data["address"]["city"] == "New York"
+        assert cd.schema == configdata.schema
+
+    def testCase020(self):
+        """Changed file is parsed again.
+        """
+        with open(datafile) as fp:
+            jval = myjson.load(fp)
+        jval["address"]["city"] = "Chicago"
+        with open(datafile,'w') as fp:
+            myjson.dump(jval,fp)
+
+        misses = loadcache.misses
+        cd = self.load(True)
+        assert loadcache.misses == misses + 1
+        assert cd.data["address"]["city"] == "Chicago"
+
+    def testCase030(self):
+        """Persistent records are reused by a new cache.
+        """
+        cachedir = tmpdir+os.sep+'cache'
+        loadcache.clear()
+        schemacache.clear()
+        cd = self.load(cachedir)
+        assert len(os.listdir(cachedir)) == 2
+
+        c = LoadCache()
+        x = c.load(datafile,cachedir)
+        assert c.hits == 1 and c.misses == 0
+        assert x == cd.data
+
+    def testCase040(self):
+        """LRU eviction.
+        """
+        c = LoadCache(maxentries=1)
+        c.load(datafile)
+        c.load(schemafile)
+        assert len(c) == 1
+        c.load(datafile)
+        assert c.misses == 3
+
+
+#
+#######################
+#
+
+if __name__ == '__main__':
+    unittest.main()
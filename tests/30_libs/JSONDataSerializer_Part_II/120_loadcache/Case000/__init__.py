@@ -0,0 +1,2 @@
+"""In-process and persistent load cache.
+"""
@@ -0,0 +1,2 @@
+"""Load cache for parsed files.
+"""
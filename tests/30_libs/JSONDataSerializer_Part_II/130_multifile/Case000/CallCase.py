@@ -0,0 +1,109 @@
+"""Concurrent import of multiple files by jsondata.JSONDataSerializer.
+"""
+from __future__ import absolute_import
+
+import unittest
+import os
+import sys
+
+#
+if 'ujson' in sys.argv:
+    import ujson as myjson
+else:
+    import json as myjson
+import jsonschema
+from jsonschema import ValidationError
+
+
+from jsondata.JSONDataSerializer import JSONDataSerializer as ConfigData
+from jsondata.JSONDataSerializer import MODE_SCHEMA_OFF,MODE_SCHEMA_DRAFT4
+from jsondata.JSONDataExceptions import JSONDataSourceFile
+
+# name of application, used for several filenames as MODE_SCHEMA_DRAFT4
+_APPNAME = "jsondc"
+appname = _APPNAME
+mypath = os.path.dirname(__file__)+os.sep
+#
+#######################
+#
+class CallUnits(unittest.TestCase):
+    """Sequential and concurrent load of the same list of files.
+    """
+
+    def load(self,files,workers,processes=None):
+        kargs = {}
+        kargs['filepathlist'] = [ mypath+f for f in files ]
+        kargs['schemafile'] = mypath+'schema.jsd'
+        kargs['nodefaultpath'] = True
+        kargs['nosubdata'] = True
+        kargs['validator'] = MODE_SCHEMA_DRAFT4
+        kargs['workers'] = workers
+        kargs['processes'] = processes
+        return ConfigData(appname,**kargs)
+
+    def testCase000(self):
+        """Sequential load, the first file is the base.
+        """
+        global configdata
+        configdata = self.load(['a.json','b.json','c.json'],1)
+        assert configdata.data["address"]["city"] == "New York"
+
+    def testCase010(self):
+        """Concurrent load results in the same data.
+        """
+        cd = self.load(['a.json','b.json','c.json'],3)
+        assert cd.data == configdata.data
+
+    def testCase020(self):
+        """The order of the files is kept.
+        """
+        cd = self.load(['c.json','b.json','a.json'],None)
+        assert cd.data["address"]["city"] == "Chicago"
+
+    def testCase030(self):
+        """An invalid file fails the import.
+        """
+        for workers in (1,4,):
+            try:
+                self.load(['a.json','b.json','c.json','d.json'],workers)
+            except ValidationError as e:
+                assert list(e.path) == ['address','houseNumber']
+            else:
+                assert False, "expected ValidationError"
+
+    def testCase040(self):
+        """A missing file fails the import.
+        """
+        for workers in (1,4,):
+            try:
+                self.load(['a.json','missing.json','c.json'],workers)
+            except JSONDataSourceFile:
+                pass
+            else:
+                assert False, "expected JSONDataSourceFile"
+
+    def testCase050(self):
+        """Parse and validation by processes, same data and errors.
+        """
+        cd = self.load(['a.json','b.json','c.json'],None,2)
+        assert cd.data == configdata.data
+        try:
+            self.load(['a.json','b.json','c.json','d.json'],None,2)
+        except ValidationError as e:
+            assert list(e.path) == ['address','houseNumber']
+        else:
+            assert False, "expected ValidationError"
+        try:
+            self.load(['a.json','missing.json','c.json'],None,2)
+        except JSONDataSourceFile:
+            pass
+        else:
+            assert False, "expected JSONDataSourceFile"
+
+
+#
+#######################
+#
+
+if __name__ == '__main__':
+    unittest.main()
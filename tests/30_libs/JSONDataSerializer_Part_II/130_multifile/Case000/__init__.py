@@ -0,0 +1,2 @@
+"""Load and validate by a thread pool, hook-in in the given order.
+"""
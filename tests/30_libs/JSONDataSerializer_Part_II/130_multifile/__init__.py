@@ -0,0 +1,2 @@
+"""Concurrent import of multiple data files.
+"""
@@ -0,0 +1,108 @@
+"""Streaming import of a pointer-selected sub-branch by jsondata.JSONDataSerializer.
+"""
+from __future__ import absolute_import
+
+import unittest
+import os
+import sys
+import io
+
+#
+if 'ujson' in sys.argv:
+    import ujson as myjson
+else:
+    import json as myjson
+import jsonschema
+
+
+from jsondata.JSONDataSerializer import JSONDataSerializer as ConfigData
+from jsondata.JSONDataSerializer import MODE_SCHEMA_OFF,MODE_SCHEMA_DRAFT4
+from jsondata.JSONDataExceptions import JSONDataSourceFile,JSONDataKeyError
+from jsondata.JSONDataIO import JSONStreamScanner,json_load_pointer
+from jsondata.JSONPointer import JSONPointer
+
+# name of application, used for several filenames as MODE_SCHEMA_DRAFT4
+_APPNAME = "jsondc"
+appname = _APPNAME
+mypath = os.path.dirname(__file__)+os.sep
+#
+#######################
+#
+class CallUnits(unittest.TestCase):
+    """Import '/services/auth' into the node '/services' of a base document.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        global configdata
+        global export
+
+        kargs = {}
+        kargs['datafile'] = mypath+'base.json'
+        kargs['schemafile'] = mypath+'base.jsd'
+        kargs['nodefaultpath'] = True
+        kargs['nosubdata'] = True
+        kargs['validator'] = MODE_SCHEMA_DRAFT4
+        configdata = ConfigData(appname,**kargs)
+
+        with open(mypath+'export.json') as fp:
+            export = myjson.load(fp)
+
+    def testCase000(self):
+        """Import the sub-branch with validation by its own schema.
+        """
+        target = configdata.data['services']
+        ret = configdata.json_import(target, 'auth', mypath+'export.json', mypath+'auth.jsd',
+            pointer='/services/auth')
+        assert ret
+        assert sorted(configdata.data['services'].keys()) == ['auth','web']
+        assert configdata.data['services']['auth'] == export['services']['auth']
+
+    def testCase010(self):
+        """Missing sub-branch.
+        """
+        try:
+            configdata.json_import(configdata.data, 'x', mypath+'export.json', None,
+                pointer='/services/mail', validator=MODE_SCHEMA_OFF)
+        except JSONDataSourceFile:
+            pass
+        else:
+            assert False, "expected JSONDataSourceFile"
+
+    def testCase020(self):
+        """All paths by minimal read blocks.
+        """
+        for p in ('', '/meta/comment', '/services/web/paths/1', '/services/db',
+                  '/tail/2', '/tail/4', '/tail/5'):
+            assert json_load_pointer(mypath+'export.json', p, 1) == JSONPointer(p).get_node_or_value(export)
+
+    def testCase030(self):
+        """Array index out of range, and key for an array.
+        """
+        for p in ('/tail/6', '/tail/x', '/tail/0/0'):
+            try:
+                json_load_pointer(mypath+'export.json', p, 3)
+            except JSONDataKeyError:
+                pass
+            else:
+                assert False, "expected JSONDataKeyError:"+p
+
+    def testCase040(self):
+        """Unterminated document.
+        """
+        s = JSONStreamScanner(io.BytesIO('{"a": [1, "x]'), 4)
+        s.find(['a'])
+        try:
+            s.value()
+        except ValueError:
+            pass
+        else:
+            assert False, "expected ValueError"
+
+
+#
+#######################
+#
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,2 @@
+"""Import of a pointer-selected sub-branch into a target node.
+"""
@@ -0,0 +1,2 @@
+"""Streaming import of a sub-branch selected by a pointer.
+"""
@@ -0,0 +1,97 @@
+"""Memory-mapped read of JSON files by jsondata.JSONDataIO.
+"""
+from __future__ import absolute_import
+
+import unittest
+import os
+import sys
+import mmap
+import StringIO
+
+#
+if 'ujson' in sys.argv:
+    import ujson as myjson
+else:
+    import json as myjson
+import jsonschema
+
+
+from jsondata.JSONDataSerializer import JSONDataSerializer as ConfigData
+from jsondata.JSONDataSerializer import MODE_SCHEMA_OFF,MODE_SCHEMA_DRAFT4
+import jsondata.JSONDataIO
+from jsondata.JSONDataIO import MappedFile,json_read,json_load_pointer
+
+# name of application, used for several filenames as MODE_SCHEMA_DRAFT4
+_APPNAME = "jsondc"
+appname = _APPNAME
+mypath = os.path.dirname(__file__)+os.sep
+#
+#######################
+#
+class CallUnits(unittest.TestCase):
+    """Compare the mapped read with the standard load.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        global jval
+        with open(mypath+'datafile.json') as fp:
+            jval = myjson.load(fp)
+
+    def tearDown(self):
+        jsondata.JSONDataIO.MMAP = True
+
+    def testCase000(self):
+        """Regular file is mapped.
+        """
+        with MappedFile(mypath+'datafile.json') as buf:
+            assert type(buf) is mmap.mmap
+        assert json_read(mypath+'datafile.json') == jval
+
+    def testCase010(self):
+        """Empty file falls back to the file object.
+        """
+        with MappedFile(mypath+'empty.json') as buf:
+            assert type(buf) is file
+            assert buf.read() == ''
+        try:
+            json_read(mypath+'empty.json')
+        except ValueError:
+            pass
+        else:
+            assert False, "expected ValueError"
+
+    def testCase020(self):
+        """Pointer import, mapped and buffered.
+        """
+        x0 = json_load_pointer(mypath+'datafile.json','/services/auth')
+        jsondata.JSONDataIO.MMAP = False
+        x1 = json_load_pointer(mypath+'datafile.json','/services/auth',7)
+        assert x0 == x1 == jval['services']['auth']
+
+    def testCase030(self):
+        """printData from a file.
+        """
+        kargs = {}
+        kargs['datafile'] = mypath+'datafile.json'
+        kargs['nodefaultpath'] = True
+        kargs['validator'] = MODE_SCHEMA_OFF
+        configdata = ConfigData(appname,**kargs)
+        assert configdata.data == jval
+
+        stdout = sys.stdout
+        sys.stdout = StringIO.StringIO()
+        try:
+            configdata.printData(False,sourcefile=mypath+'datafile.json')
+            out = sys.stdout.getvalue()
+        finally:
+            sys.stdout = stdout
+        assert myjson.loads(out) == jval
+
+
+#
+#######################
+#
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,2 @@
+"""Mapped and buffered read paths.
+"""
@@ -0,0 +1,2 @@
+"""Memory-mapped read of data files.
+"""
@@ -0,0 +1,130 @@
+"""Compressed files by jsondata.JSONDataSerializer and jsondata.JSONPatch.
+"""
+from __future__ import absolute_import
+
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+import gzip
+
+#
+if 'ujson' in sys.argv:
+    import ujson as myjson
+else:
+    import json as myjson
+import jsonschema
+
+
+from jsondata.JSONDataSerializer import JSONDataSerializer as ConfigData
+from jsondata.JSONDataSerializer import MODE_SCHEMA_OFF,MODE_SCHEMA_DRAFT4
+from jsondata.JSONPatch import JSONPatch,JSONPatchItem
+from jsondata.JSONDataIO import compression_of,json_load_pointer,lzma
+
+# name of application, used for several filenames as MODE_SCHEMA_DRAFT4
+_APPNAME = "jsondc"
+appname = _APPNAME
+mypath = os.path.dirname(__file__)+os.sep
+#
+#######################
+#
+class CallUnits(unittest.TestCase):
+    """Export compressed, and import with validation.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        global tmpdir
+        global configdata
+
+        tmpdir = tempfile.mkdtemp()
+        configdata = cls.load(mypath+'datafile.json')
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(tmpdir)
+
+    @staticmethod
+    def load(datafile):
+        kargs = {}
+        kargs['datafile'] = datafile
+        kargs['schemafile'] = mypath+'schema.jsd'
+        kargs['nodefaultpath'] = True
+        kargs['nosubdata'] = True
+        kargs['validator'] = MODE_SCHEMA_DRAFT4
+        return ConfigData(appname,**kargs)
+
+    def roundtrip(self,suffix,compression):
+        fname = tmpdir+os.sep+'export.json'+suffix
+        assert configdata.json_export(None,fname,compresslevel=1)
+        assert compression_of(fname) == compression
+        assert compression_of(fname,False) == compression
+        ino = os.stat(fname).st_ino
+        assert configdata.json_export(None,fname)
+        assert os.stat(fname).st_ino != ino # level differs
+        ino = os.stat(fname).st_ino
+        assert configdata.json_export(None,fname)
+        assert os.stat(fname).st_ino == ino # reproducible, thus unchanged
+
+        cd = self.load(fname)
+        assert cd.data == configdata.data
+        assert json_load_pointer(fname,'/address/city',5) == "New York"
+
+    def testCase000(self):
+        """gzip.
+        """
+        self.roundtrip('.gz','gz')
+
+    def testCase010(self):
+        """bzip2.
+        """
+        self.roundtrip('.bz2','bz2')
+
+    def testCase020(self):
+        """xz, requires 'lzma'.
+        """
+        if lzma:
+            self.roundtrip('.xz','xz')
+
+    def testCase030(self):
+        """Detection by magic bytes, and explicit format.
+        """
+        fname = tmpdir+os.sep+'noext.json'
+        assert configdata.json_export(None,fname,compression='gz')
+        with gzip.open(fname) as fp:
+            assert myjson.load(fp) == configdata.data
+        assert compression_of(fname) == 'gz'
+        assert compression_of(fname,False) == None
+        cd = self.load(fname)
+        assert cd.data == configdata.data
+
+    def testCase040(self):
+        """Explicitly uncompressed.
+        """
+        fname = tmpdir+os.sep+'plain.json.gz'
+        assert configdata.json_export(None,fname,compression=False)
+        assert compression_of(fname) == None
+        with open(fname) as fp:
+            assert myjson.load(fp) == configdata.data
+
+    def testCase050(self):
+        """Patch export and import.
+        """
+        fname = tmpdir+os.sep+'patch.json.bz2'
+        p0 = JSONPatch()
+        for i in range(0,3):
+            p0 += JSONPatchItem("add", "/a"+unicode(i), "v"+unicode(i))
+        assert p0.patch_export(fname)
+        assert compression_of(fname) == 'bz2'
+        p1 = JSONPatch()
+        assert p1.patch_import(fname)
+        assert repr(p0) == repr(p1)
+
+
+#
+#######################
+#
+
+if __name__ == '__main__':
+    unittest.main()
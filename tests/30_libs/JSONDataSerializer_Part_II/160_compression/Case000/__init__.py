@@ -0,0 +1,2 @@
+"""Round trips by gzip, bzip2, and xz.
+"""
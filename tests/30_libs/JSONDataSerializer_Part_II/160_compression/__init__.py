@@ -0,0 +1,2 @@
+"""Compressed import and export.
+"""
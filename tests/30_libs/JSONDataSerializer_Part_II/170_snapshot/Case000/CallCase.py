@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""Binary snapshots by jsondata.JSONDataSerializer.snapshot_export().
+"""
+from __future__ import absolute_import
+
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+
+#
+if 'ujson' in sys.argv:
+    import ujson as myjson
+else:
+    import json as myjson
+import jsonschema
+
+
+from jsondata.JSONDataSerializer import JSONDataSerializer as ConfigData
+from jsondata.JSONDataSerializer import MODE_SCHEMA_OFF,MODE_SCHEMA_DRAFT4
+from jsondata.JSONDataExceptions import JSONDataSourceFile,JSONDataKeyError
+from jsondata.JSONDataIO import SNAPSHOT_MAGIC,json_read,json_load_pointer,snapshot_write
+
+# name of application, used for several filenames as MODE_SCHEMA_DRAFT4
+_APPNAME = "jsondc"
+appname = _APPNAME
+mypath = os.path.dirname(__file__)+os.sep
+#
+#######################
+#
+class CallUnits(unittest.TestCase):
+    """Export a snapshot, and import it with validation.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        global tmpdir
+        global configdata
+
+        tmpdir = tempfile.mkdtemp()
+        configdata = cls.load(mypath+'datafile.json')
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(tmpdir)
+
+    @staticmethod
+    def load(datafile):
+        kargs = {}
+        kargs['datafile'] = datafile
+        kargs['schemafile'] = mypath+'schema.jsd'
+        kargs['nodefaultpath'] = True
+        kargs['nosubdata'] = True
+        kargs['validator'] = MODE_SCHEMA_DRAFT4
+        return ConfigData(appname,**kargs)
+
+    @classmethod
+    def restore(cls, fname):
+        cd = cls.load(mypath+'datafile.json')
+        cd.data = None
+        assert cd.snapshot_import(None,None,fname,mypath+'schema.jsd')
+        return cd
+
+    def testCase000(self):
+        """Round trip of a snapshot.
+        """
+        fname = tmpdir+os.sep+'snapshot.bin'
+        assert configdata.snapshot_export(None,fname)
+        with open(fname,'rb') as fp:
+            assert fp.read().startswith(SNAPSHOT_MAGIC)
+
+        cd = self.restore(fname)
+        assert cd.data == configdata.data
+        assert repr(cd.data) == repr(configdata.data)
+        assert json_load_pointer(fname,'/phoneNumber/1/type',snapshot=True) == u'office'
+
+        ino = os.stat(fname).st_ino
+        assert configdata.snapshot_export(None,fname)
+        assert os.stat(fname).st_ino == ino
+
+    def testCase010(self):
+        """Lossless types, compressed.
+        """
+        fname = tmpdir+os.sep+'types.bin.gz'
+        jval = myjson.loads('{"f": [0.1, 1e308, -2.5e-300], "i": [0, -1, 123456789012345678901234567890],'
+            ' "s": ["\\u00e4\\u20ac", "", "a\\"b"], "c": [true, false, null, {}, []]}')
+        snapshot_write(fname,jval)
+        x = json_read(fname,snapshot=True)
+        assert x == jval
+        assert repr(x) == repr(jval)
+
+    def testCase020(self):
+        """Snapshot into a branch by 'snapshot_import'.
+        """
+        fname = tmpdir+os.sep+'branch.bin'
+        assert configdata.snapshot_export(configdata.data['address'],fname)
+        assert configdata.snapshot_import(configdata.data,'copy',fname,None,validator=MODE_SCHEMA_OFF)
+        assert configdata.data['copy'] == configdata.data['address']
+        configdata.data.pop('copy')
+
+    def testCase030(self):
+        """Unsupported snapshot format.
+        """
+        fname = tmpdir+os.sep+'future.bin'
+        with open(fname,'wb') as fp:
+            fp.write(SNAPSHOT_MAGIC+chr(99)+'xyz')
+        try:
+            self.restore(fname)
+        except JSONDataSourceFile:
+            pass
+        else:
+            assert False, "expected JSONDataSourceFile"
+
+    def testCase040(self):
+        """Fallback to JSON text beyond the nesting limit of 'marshal'.
+        """
+        fname = tmpdir+os.sep+'deep.bin'
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(20000)
+        try:
+            jval = []
+            for i in range(2500):
+                jval = [jval]
+            snapshot_write(fname,jval)
+            with open(fname) as fp:
+                assert fp.read(3) == '[[['
+            assert json_read(fname) == jval
+            assert json_read(fname,snapshot=True) == jval
+        finally:
+            sys.setrecursionlimit(limit)
+
+    def testCase050(self):
+        """Generic readers do not decode snapshots.
+        """
+        fname = tmpdir+os.sep+'snapshot.bin'
+        assert configdata.snapshot_export(None,fname)
+        for f in (json_read,lambda f: json_load_pointer(f,'/address')):
+            try:
+                f(fname)
+            except (ValueError,JSONDataKeyError,):
+                pass
+            else:
+                assert False, "expected ValueError"
+        try:
+            self.load(fname)
+        except JSONDataSourceFile:
+            pass
+        else:
+            assert False, "expected JSONDataSourceFile"
+
+
+#
+#######################
+#
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,2 @@
+"""Snapshot round trips and the fallback to JSON text.
+"""
@@ -0,0 +1,2 @@
+"""Binary snapshots for fast reload.
+"""
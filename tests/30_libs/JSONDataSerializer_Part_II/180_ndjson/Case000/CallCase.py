@@ -0,0 +1,134 @@
+"""JSON Lines by jsondata.JSONDataSerializer.ndjson_import() and ndjson_export().
+"""
+from __future__ import absolute_import
+
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+
+#
+if 'ujson' in sys.argv:
+    import ujson as myjson
+else:
+    import json as myjson
+import jsonschema
+from jsonschema import ValidationError
+
+
+from jsondata.JSONDataSerializer import JSONDataSerializer as ConfigData
+from jsondata.JSONDataSerializer import MODE_SCHEMA_OFF,MODE_SCHEMA_DRAFT4
+from jsondata.JSONDataExceptions import JSONDataSourceFile,JSONDataNodeType
+from jsondata.JSONPointer import JSONPointer
+
+# name of application, used for several filenames as MODE_SCHEMA_DRAFT4
+_APPNAME = "jsondc"
+appname = _APPNAME
+mypath = os.path.dirname(__file__)+os.sep
+#
+#######################
+#
+class CallUnits(unittest.TestCase):
+    """Import records into '/events', and export them again.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        global tmpdir
+        global configdata
+
+        tmpdir = tempfile.mkdtemp()
+        kargs = {}
+        kargs['datafile'] = mypath+'base.json'
+        kargs['schemafile'] = mypath+'base.jsd'
+        kargs['nodefaultpath'] = True
+        kargs['nosubdata'] = True
+        kargs['validator'] = MODE_SCHEMA_DRAFT4
+        configdata = ConfigData(appname,**kargs)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(tmpdir)
+
+    def testCase000(self):
+        """Generator of validated records.
+        """
+        records = configdata.ndjson_iter(mypath+'records.ndjson',mypath+'record.jsd')
+        assert [r['id'] for r in records] == [1,2,3,4]
+
+    def testCase010(self):
+        """Append to an array.
+        """
+        n = configdata.ndjson_import(configdata.data,'events',mypath+'records.ndjson',mypath+'record.jsd')
+        assert n == 4
+        assert configdata.data['events'][1] == {'id':2,'event':'login','user':'a'}
+
+        n = configdata.ndjson_import(JSONPointer('/events'),None,mypath+'records.ndjson',mypath+'record.jsd')
+        assert n == 4
+        assert len(configdata.data['events']) == 8
+
+    def testCase020(self):
+        """Callback.
+        """
+        users = []
+        def cb(r):
+            if 'user' in r:
+                users.append(r['user'])
+        n = configdata.ndjson_import(None,None,mypath+'records.ndjson',mypath+'record.jsd',callback=cb)
+        assert n == 4
+        assert users == ['a','a']
+
+    def testCase030(self):
+        """Invalid record, the target remains unchanged.
+        """
+        try:
+            configdata.ndjson_import(configdata.data,'events',mypath+'invalid.ndjson',mypath+'record.jsd')
+        except ValidationError as e:
+            assert list(e.path) == ['id']
+        else:
+            assert False, "expected ValidationError"
+        assert len(configdata.data['events']) == 8
+
+        n = configdata.ndjson_import(configdata.data,'other',mypath+'invalid.ndjson',validator=MODE_SCHEMA_OFF)
+        assert n == 3
+        configdata.data.pop('other')
+
+    def testCase040(self):
+        """Syntax error reports the line.
+        """
+        try:
+            list(configdata.ndjson_iter(mypath+'broken.ndjson',validator=MODE_SCHEMA_OFF))
+        except JSONDataSourceFile as e:
+            assert 'line 2' in str(e)
+        else:
+            assert False, "expected JSONDataSourceFile"
+
+    def testCase050(self):
+        """Export line by line, compressed and plain.
+        """
+        for f in ('events.ndjson','events.ndjson.gz',):
+            fname = tmpdir+os.sep+f
+            assert configdata.ndjson_export(JSONPointer('/events'),fname)
+            records = list(configdata.ndjson_iter(fname,mypath+'record.jsd'))
+            assert records == configdata.data['events']
+        with open(tmpdir+os.sep+'events.ndjson') as fp:
+            assert len(fp.readlines()) == 8
+
+    def testCase060(self):
+        """Export of a non-array.
+        """
+        try:
+            configdata.ndjson_export(None,tmpdir+os.sep+'x.ndjson')
+        except JSONDataNodeType:
+            pass
+        else:
+            assert False, "expected JSONDataNodeType"
+
+
+#
+#######################
+#
+
+if __name__ == '__main__':
+    unittest.main()
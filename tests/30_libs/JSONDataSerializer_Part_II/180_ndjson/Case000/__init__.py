@@ -0,0 +1,2 @@
+"""Records appended to an array, passed to a callback, and exported.
+"""
@@ -0,0 +1,2 @@
+"""JSON Lines import and export.
+"""
@@ -0,0 +1,135 @@
+"""JSON backends by jsondata.JSONDataBackend and the parameter 'backend'.
+"""
+from __future__ import absolute_import
+
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+
+#
+if 'ujson' in sys.argv:
+    import ujson as myjson
+else:
+    import json as myjson
+import jsonschema
+
+
+from jsondata.JSONDataSerializer import JSONDataSerializer as ConfigData
+from jsondata.JSONDataSerializer import MODE_SCHEMA_OFF,MODE_SCHEMA_DRAFT4
+from jsondata.JSONDataExceptions import JSONDataValue
+from jsondata.JSONDataBackend import JSONBackend,get_backend,list_backends,conformance,select_backend
+
+# name of application, used for several filenames as MODE_SCHEMA_DRAFT4
+_APPNAME = "jsondc"
+appname = _APPNAME
+mypath = os.path.dirname(__file__)+os.sep
+
+class Broken(object):
+    """Accepts trailing commas."""
+    @staticmethod
+    def loads(s):
+        return myjson.loads(s.replace(',]',']'))
+    @staticmethod
+    def dumps(obj, **kargs):
+        return myjson.dumps(obj, **kargs)
+
+#
+#######################
+#
+class CallUnits(unittest.TestCase):
+    """Load and export by the default, and by selected backends.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        global tmpdir
+        tmpdir = tempfile.mkdtemp()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(tmpdir)
+
+    def load(self,backend=None):
+        kargs = {}
+        kargs['datafile'] = mypath+'datafile.json'
+        kargs['schemafile'] = mypath+'schema.jsd'
+        kargs['nodefaultpath'] = True
+        kargs['nosubdata'] = True
+        kargs['validator'] = MODE_SCHEMA_DRAFT4
+        if backend:
+            kargs['backend'] = backend
+        return ConfigData(appname,**kargs)
+
+    def testCase000(self):
+        """Registry lookup.
+        """
+        b = get_backend('json')
+        assert b.name == 'json'
+        assert get_backend(b) is b
+        assert get_backend('json') is b
+        assert 'json' in list_backends()
+        assert isinstance(get_backend(myjson),JSONBackend)
+        try:
+            get_backend('no-such-package')
+        except JSONDataValue:
+            pass
+        else:
+            assert False, "expected JSONDataValue"
+
+    def testCase010(self):
+        """Conformance check.
+        """
+        assert conformance('json')
+        assert not conformance(Broken)
+
+    def testCase020(self):
+        """Automatic selection results in a conforming backend.
+        """
+        b = get_backend('auto')
+        assert b.name in list_backends()
+        assert conformance(b)
+        assert select_backend() is b
+
+    def testCase030(self):
+        """Per-instance selection, the data is the same.
+        """
+        cd0 = self.load()
+        assert cd0.backend is get_backend()
+        for name in list_backends():
+            if not conformance(name):
+                continue
+            cd = self.load(name)
+            assert cd.backend.name == name
+            assert cd.data == cd0.data
+            assert myjson.loads(str(cd)) == cd0.data
+
+    def testCase040(self):
+        """Per-call selection for import and export.
+        """
+        cd = self.load('auto')
+        fname = tmpdir+os.sep+'export.json'
+        assert cd.json_export(None,fname,backend='json')
+        with open(fname) as fp:
+            assert fp.read() == myjson.dumps(cd.data)
+        assert cd.json_import(cd.data,'copy',fname,validator=MODE_SCHEMA_OFF,backend='json')
+        assert cd.data['copy']['address'] == cd.data['address']
+
+    def testCase050(self):
+        """Unknown backend.
+        """
+        try:
+            self.load('no-such-package')
+        except JSONDataValue:
+            pass
+        else:
+            assert False, "expected JSONDataValue"
+
+
+#
+#######################
+#
+
+if __name__ == '__main__':
+    unittest.main()
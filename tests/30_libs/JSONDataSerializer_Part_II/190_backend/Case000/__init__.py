@@ -0,0 +1,2 @@
+"""Registry, conformance check, and per-instance and per-call selection.
+"""
@@ -0,0 +1,2 @@
+"""Selection of the JSON package.
+"""
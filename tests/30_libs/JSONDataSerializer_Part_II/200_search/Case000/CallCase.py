@@ -0,0 +1,161 @@
+"""Search of files by jsondata.JSONDataIO.SearchIndex and the manifest.
+"""
+from __future__ import absolute_import
+
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+import time
+
+#
+if 'ujson' in sys.argv:
+    import ujson as myjson
+else:
+    import json as myjson
+import jsonschema
+
+
+from jsondata.JSONDataSerializer import JSONDataSerializer as ConfigData
+from jsondata.JSONDataSerializer import MODE_SCHEMA_OFF,MODE_SCHEMA_DRAFT4
+from jsondata.JSONDataIO import SearchIndex,searchindex,manifest_read
+
+# name of application, used for several filenames as MODE_SCHEMA_DRAFT4
+_APPNAME = "jsondc"
+appname = _APPNAME
+mypath = os.path.dirname(__file__)+os.sep
+
+def extra(n):
+    with open(mypath+'datafile.json') as fp:
+        data = myjson.load(fp)
+    data['extra'] = n
+    with open(dirs[1]+os.sep+'extra.json','w') as fp:
+        myjson.dump(data,fp)
+#
+#######################
+#
+class CallUnits(unittest.TestCase):
+    """Search 'jsondc.json' and 'extra.json' within three directories.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        global tmpdir
+        global dirs
+        global manifest
+
+        tmpdir = tempfile.mkdtemp()
+        manifest = tmpdir+os.sep+'manifest.json'
+        dirs = [tmpdir+os.sep+d for d in ('etc','home','local',)]
+        for d in dirs:
+            os.mkdir(d)
+        shutil.copy(mypath+'datafile.json',dirs[0]+os.sep+'jsondc.json')
+        shutil.copy(mypath+'schema.jsd',dirs[0]+os.sep+'jsondc.jsd')
+        shutil.copy(mypath+'datafile.json',dirs[2]+os.sep+'jsondc.json')
+        extra(1)
+        os.mkdir(dirs[2]+os.sep+'extra.json') # a directory is not a file
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(tmpdir)
+
+    def load(self,**kargs):
+        kargs['filelist'] = ['jsondc.json','extra.json','missing.json',]
+        kargs['pathlist'] = list(dirs)
+        kargs['nodefaultpath'] = True
+        kargs['nosubdata'] = True
+        kargs['validator'] = MODE_SCHEMA_DRAFT4
+        return ConfigData(appname,**kargs)
+
+    def testCase000(self):
+        """Index of a directory listing.
+        """
+        idx = SearchIndex()
+        assert idx.listdir(dirs[0]) == frozenset(['jsondc.json','jsondc.jsd'])
+        assert idx.listdir(dirs[0]+os.sep) == frozenset(['jsondc.json','jsondc.jsd'])
+        assert (idx.hits,idx.misses) == (1,1)
+        assert idx.isfile(dirs[0]+os.sep+'jsondc.json')
+        assert not idx.isfile(dirs[2]+os.sep+'extra.json')
+        assert not idx.isfile(tmpdir+os.sep+'none'+os.sep+'x.json')
+        assert idx.listdir(tmpdir+os.sep+'none') == frozenset()
+
+    def testCase010(self):
+        """Search all files, all matches in the order of the search path.
+        """
+        f,missing = SearchIndex().resolve(dirs,['jsondc.json','extra.json','missing.json'])
+        assert f == [dirs[0]+os.sep+'jsondc.json',dirs[2]+os.sep+'jsondc.json',dirs[1]+os.sep+'extra.json']
+        assert missing == ['missing.json']
+
+    def testCase020(self):
+        """A changed directory is listed again.
+        """
+        idx = SearchIndex()
+        idx.listdir(dirs[1])
+        time.sleep(0.01)
+        with open(dirs[1]+os.sep+'new.json','w') as fp:
+            fp.write('{}')
+        os.utime(dirs[1],(time.time()+2,time.time()+2))
+        assert 'new.json' in idx.listdir(dirs[1])
+        assert idx.misses == 2
+        os.unlink(dirs[1]+os.sep+'new.json')
+
+    def testCase030(self):
+        """Cold start writes the manifest, with the co-located schema.
+        """
+        global configdata
+        configdata = self.load(manifest=manifest)
+        assert configdata.schemafile == os.path.realpath(dirs[0])+os.sep+'jsondc.jsd'
+        assert configdata.data['address']['city'] == 'New York'
+        assert configdata.filelist == ['missing.json']
+        m = manifest_read(manifest,configdata.pathlist,['jsondc.json','extra.json','missing.json',])
+        assert m[0] == configdata.filepathlist
+        assert m[1] == ['missing.json']
+
+    def testCase040(self):
+        """Warm start by the manifest, no directory is listed.
+        """
+        hits,misses = searchindex.hits,searchindex.misses
+        cd = self.load(manifest=manifest)
+        assert (searchindex.hits,searchindex.misses) == (hits,misses)
+        assert cd.filepathlist == configdata.filepathlist
+        assert cd.schemafile == configdata.schemafile
+        assert cd.data == configdata.data
+
+    def testCase050(self):
+        """A changed file invalidates the manifest.
+        """
+        f = dirs[1]+os.sep+'extra.json'
+        extra(2)
+        os.utime(f,(time.time()+4,time.time()+4))
+        assert manifest_read(manifest,configdata.pathlist,['jsondc.json','extra.json','missing.json',]) == None
+        cd = self.load(manifest=manifest)
+        assert cd.filepathlist == configdata.filepathlist
+        assert manifest_read(manifest,configdata.pathlist,['jsondc.json','extra.json','missing.json',]) != None
+
+    def testCase060(self):
+        """Other search parameters do not apply the manifest.
+        """
+        assert manifest_read(manifest,configdata.pathlist,['jsondc.json',]) == None
+        assert manifest_read(tmpdir+os.sep+'none.json',configdata.pathlist,['jsondc.json',]) == None
+
+    def testCase070(self):
+        """A file rewritten in place is not served by a stale 'stat'.
+        """
+        index = SearchIndex()
+        f = dirs[1]+os.sep+'extra.json'
+        st = index.stat(f)
+        assert index.isfile(f)
+        with open(f,'a') as fp:
+            fp.write(' ')
+        assert index.stat(f).st_size == st.st_size+1
+        assert index.isfile(f)
+        assert not index.isfile(dirs[2]+os.sep+'extra.json')
+
+
+#
+#######################
+#
+
+if __name__ == '__main__':
+    unittest.main()
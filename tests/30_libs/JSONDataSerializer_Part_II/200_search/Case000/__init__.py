@@ -0,0 +1,2 @@
+"""Directory index, and the manifest of resolved files.
+"""
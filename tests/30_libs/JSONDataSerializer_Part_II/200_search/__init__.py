@@ -0,0 +1,2 @@
+"""Search of the data files within the search path.
+"""
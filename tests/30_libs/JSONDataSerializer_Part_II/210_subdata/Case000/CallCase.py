@@ -0,0 +1,140 @@
+"""Sub-data of plugins by jsondata.JSONDataSerializer.subdata_import().
+"""
+from __future__ import absolute_import
+
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+
+#
+if 'ujson' in sys.argv:
+    import ujson as myjson
+else:
+    import json as myjson
+import jsonschema
+from jsonschema import ValidationError
+
+
+from jsondata.JSONDataSerializer import JSONDataSerializer as ConfigData
+from jsondata.JSONDataSerializer import MODE_SCHEMA_OFF,MODE_SCHEMA_DRAFT4
+from jsondata.JSONDataExceptions import JSONDataSourceFile,JSONDataNodeType
+
+# name of application, used for several filenames as MODE_SCHEMA_DRAFT4
+_APPNAME = "jsondc"
+appname = _APPNAME
+mypath = os.path.dirname(__file__)+os.sep
+plugins = [mypath+'plugins'+os.sep+'in', mypath+'plugins'+os.sep+'out']
+#
+#######################
+#
+class CallUnits(unittest.TestCase):
+    """Load the plugin directories 'in' and 'out' into '/plugins'.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        global tmpdir
+        tmpdir = tempfile.mkdtemp()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(tmpdir)
+
+    def load(self,**kargs):
+        kargs['datafile'] = mypath+'base.json'
+        kargs['nodefaultpath'] = True
+        kargs['validator'] = MODE_SCHEMA_OFF
+        return ConfigData(appname,**kargs)
+
+    def plugin(self,name,data):
+        with open(tmpdir+os.sep+name,'w') as fp:
+            myjson.dump(data,fp)
+
+    def testCase000(self):
+        """Sequential load, parents are inserted before the children.
+        """
+        global configdata
+        configdata = self.load(pluginspathlist=plugins,processes=1)
+        assert configdata.data['plugins']['in'] == {
+            'csv': {'module': 'csvin', 'priority': 1},
+            'xml': {'module': 'xmlin', 'priority': 2},
+        }
+        assert configdata.data['plugins']['out'] == {
+            'csv': {'module': 'csvout', 'options': {'delimiter': {'char': ';'}}},
+        }
+        assert configdata.data['defaults'] == {'level': 3}
+
+    def testCase010(self):
+        """Concurrent load results in the same data, also for a PATH like string.
+        """
+        cd = self.load(pluginspathlist=os.pathsep.join(plugins),processes=4)
+        assert cd.data == configdata.data
+
+    def testCase020(self):
+        """Sub-data suppressed.
+        """
+        cd = self.load(pluginspathlist=plugins,nosubdata=True)
+        assert cd.data['plugins'] == {'in': {}, 'out': {}}
+        assert 'defaults' not in cd.data
+
+    def testCase030(self):
+        """Validation by the co-located schema.
+        """
+        cd = self.load()
+        shutil.copy(mypath+'plugins'+os.sep+'in'+os.sep+'csv.jsd',tmpdir+os.sep+'bad.jsd')
+        self.plugin('bad.json',{'$pointer': '/plugins/in/bad', 'priority': 'high'})
+        for processes in (1,2,):
+            try:
+                cd.subdata_import([tmpdir],processes=processes,validator=MODE_SCHEMA_DRAFT4)
+            except ValidationError:
+                pass
+            else:
+                assert False, "expected ValidationError"
+        assert cd.subdata_import([tmpdir],validator=MODE_SCHEMA_OFF) == 1
+        assert cd.data['plugins']['in']['bad'] == {'priority': 'high'}
+        os.unlink(tmpdir+os.sep+'bad.json')
+        os.unlink(tmpdir+os.sep+'bad.jsd')
+
+    def testCase040(self):
+        """Invalid sub-data files.
+        """
+        cd = self.load()
+        self.plugin('array.json',[1,2])
+        for processes in (1,2,):
+            try:
+                cd.subdata_import([tmpdir],processes=processes)
+            except JSONDataNodeType:
+                pass
+            else:
+                assert False, "expected JSONDataNodeType"
+        os.unlink(tmpdir+os.sep+'array.json')
+
+        with open(tmpdir+os.sep+'broken.json','w') as fp:
+            fp.write('{"a": ')
+        try:
+            cd.subdata_import([tmpdir])
+        except JSONDataSourceFile:
+            pass
+        else:
+            assert False, "expected JSONDataSourceFile"
+        os.unlink(tmpdir+os.sep+'broken.json')
+
+    def testCase050(self):
+        """Many files by all cores.
+        """
+        cd = self.load()
+        for i in range(300):
+            self.plugin('p%03d.json'%(i),{'$pointer': '/plugins/in/p%03d'%(i), 'n': i})
+        assert cd.subdata_import([tmpdir]) == 300
+        assert len(cd.data['plugins']['in']) == 300
+        assert cd.data['plugins']['in']['p299'] == {'n': 299}
+
+
+#
+#######################
+#
+
+if __name__ == '__main__':
+    unittest.main()
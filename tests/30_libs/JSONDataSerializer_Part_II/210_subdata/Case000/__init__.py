@@ -0,0 +1,2 @@
+"""Concurrent load, merge by the declared pointer.
+"""
@@ -0,0 +1,2 @@
+"""Sub-data files of plugin directories.
+"""
@@ -0,0 +1,190 @@
+"""Reload by jsondata.JSONDataSerializer.reload() and watch().
+"""
+from __future__ import absolute_import
+
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+import time
+
+#
+if 'ujson' in sys.argv:
+    import ujson as myjson
+else:
+    import json as myjson
+import jsonschema
+from jsonschema import ValidationError
+
+
+from jsondata.JSONDataSerializer import JSONDataSerializer as ConfigData
+from jsondata.JSONDataSerializer import MODE_SCHEMA_OFF,MODE_SCHEMA_DRAFT4
+from jsondata.JSONDataExceptions import JSONDataException,JSONDataSourceFile
+
+# name of application, used for several filenames as MODE_SCHEMA_DRAFT4
+_APPNAME = "jsondc"
+appname = _APPNAME
+mypath = os.path.dirname(__file__)+os.sep
+
+data = {
+    "address": {"streetAddress": "21 2nd Street", "city": "New York", "houseNumber": 12},
+    "phoneNumber": [
+        {"type": "home", "number": "212 555-1234"},
+        {"type": "office", "number": "313 444-555"},
+    ],
+}
+
+def write(fname,content):
+    """Writes with a new mtime, also within the resolution of the filesystem."""
+    write.t += 2
+    with open(fname,'w') as fp:
+        myjson.dump(content,fp)
+    os.utime(fname,(write.t,write.t))
+write.t = time.time()
+
+#
+#######################
+#
+class CallUnits(unittest.TestCase):
+    """Modify the data file and a plugin, reload the changes.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        global tmpdir
+        global configdata
+        global fname
+        global pname
+
+        tmpdir = tempfile.mkdtemp()
+        os.mkdir(tmpdir+os.sep+'plugins')
+        fname = tmpdir+os.sep+'data.json'
+        pname = tmpdir+os.sep+'plugins'+os.sep+'csv.json'
+        write(fname,data)
+        write(pname,{"$pointer": "/plugins/csv", "module": "csvin"})
+
+        kargs = {}
+        kargs['datafile'] = fname
+        kargs['schemafile'] = mypath+'schema.jsd'
+        kargs['nodefaultpath'] = True
+        kargs['validator'] = MODE_SCHEMA_DRAFT4
+        kargs['pluginspathlist'] = [tmpdir+os.sep+'plugins']
+        kargs['reloadable'] = True
+        configdata = ConfigData(appname,**kargs)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(tmpdir)
+
+    def testCase000(self):
+        """Unchanged files.
+        """
+        assert configdata.data['plugins']['csv'] == {'module': 'csvin'}
+        assert len(configdata.reload()) == 0
+
+    def testCase010(self):
+        """Changed data file, the unchanged branches are kept.
+        """
+        address = configdata.data['address']
+        phones = configdata.data['phoneNumber']
+        home = phones[0]
+        d = myjson.loads(myjson.dumps(data))
+        d['address']['city'] = 'Boston'
+        d['phoneNumber'][1]['number'] = '313 444-556'
+        d['phoneNumber'].append({"type": "mobile", "number": "111"})
+        write(fname,d)
+
+        patch = configdata.reload()
+        assert len(patch) == 3
+        assert configdata.data['address'] is address
+        assert configdata.data['phoneNumber'] is phones
+        assert phones[0] is home
+        assert address['city'] == 'Boston'
+        assert phones[1]['number'] == '313 444-556'
+        assert phones[2]['type'] == 'mobile'
+        assert configdata.data['plugins']['csv'] == {'module': 'csvin'}
+
+    def testCase020(self):
+        """Removed items and members.
+        """
+        d = myjson.loads(myjson.dumps(data))
+        d['address'].pop('houseNumber')
+        d['phoneNumber'].pop()
+        write(fname,d)
+
+        patch = configdata.reload()
+        assert len(patch) == 4 # city, houseNumber, mobile, and office
+        d['plugins'] = {'csv': {'module': 'csvin'}}
+        assert configdata.data == d
+
+    def testCase030(self):
+        """Changed plugin, also to another branch.
+        """
+        write(pname,{"$pointer": "/plugins/csv", "module": "csvin2"})
+        assert len(configdata.reload()) == 1
+        assert configdata.data['plugins']['csv'] == {'module': 'csvin2'}
+
+        write(pname,{"$pointer": "/plugins/tsv", "module": "csvin2"})
+        configdata.reload()
+        assert configdata.data['plugins'] == {'tsv': {'module': 'csvin2'}}
+
+    def testCase040(self):
+        """Invalid changes do not modify the data.
+        """
+        before = myjson.loads(myjson.dumps(configdata.data))
+        d = myjson.loads(myjson.dumps(data))
+        d['address']['houseNumber'] = 'twelve'
+        write(fname,d)
+        try:
+            configdata.reload()
+        except ValidationError:
+            pass
+        else:
+            assert False, "expected ValidationError"
+        assert configdata.data == before
+
+        with open(fname,'w') as fp:
+            fp.write('{"address": ')
+        try:
+            configdata.reload()
+        except JSONDataSourceFile:
+            pass
+        else:
+            assert False, "expected JSONDataSourceFile"
+        assert configdata.data == before
+
+    def testCase050(self):
+        """Background polling.
+        """
+        patches = []
+        w = configdata.watch(0.01,patches.append)
+        try:
+            write(fname,data)
+            for _i in range(500):
+                if patches:
+                    break
+                time.sleep(0.01)
+        finally:
+            w.stop()
+        assert patches
+        assert configdata.data['address']['houseNumber'] == 12
+
+    def testCase060(self):
+        """Reload requires 'reloadable'.
+        """
+        cd = ConfigData(appname,datafile=fname,nodefaultpath=True,validator=MODE_SCHEMA_OFF)
+        try:
+            cd.reload()
+        except JSONDataException:
+            pass
+        else:
+            assert False, "expected JSONDataException"
+
+
+#
+#######################
+#
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,2 @@
+"""Reload by stat, applied as a JSONPatch in place.
+"""
@@ -0,0 +1,2 @@
+"""Incremental reload of changed files.
+"""
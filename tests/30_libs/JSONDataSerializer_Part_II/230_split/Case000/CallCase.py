@@ -0,0 +1,220 @@
+"""Split-file persistence by jsondata.JSONDataSerializer.split_export() and split_import().
+"""
+from __future__ import absolute_import
+
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+import time
+
+#
+if 'ujson' in sys.argv:
+    import ujson as myjson
+else:
+    import json as myjson
+import jsonschema
+
+
+from jsondata.JSONDataSerializer import JSONDataSerializer as ConfigData
+from jsondata.JSONDataSerializer import MODE_SCHEMA_OFF,MODE_SCHEMA_DRAFT4,SPLIT_INDEX
+from jsondata.JSONDataExceptions import JSONDataSourceFile
+from jsondata.JSONPointer import JSONPointer
+from jsondata.JSONPatch import JSONPatch,JSONPatchItem
+
+# name of application, used for several filenames as MODE_SCHEMA_DRAFT4
+_APPNAME = "jsondc"
+appname = _APPNAME
+mypath = os.path.dirname(__file__)+os.sep
+#
+#######################
+#
+class CallUnits(unittest.TestCase):
+    """Export a file for each top-level item, and rewrite the changed ones.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        global tmpdir
+        global configdata
+
+        tmpdir = tempfile.mkdtemp()
+        configdata = cls.load()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(tmpdir)
+
+    @classmethod
+    def load(cls):
+        kargs = {}
+        kargs['datafile'] = mypath+'datafile.json'
+        kargs['schemafile'] = mypath+'schema.jsd'
+        kargs['nodefaultpath'] = True
+        kargs['nosubdata'] = True
+        kargs['validator'] = MODE_SCHEMA_DRAFT4
+        return ConfigData(appname,**kargs)
+
+    def inodes(self, d):
+        return dict((f,os.stat(os.path.join(d,f)).st_ino) for f in os.listdir(d))
+
+    def testCase000(self):
+        """Initial export, a file for each top-level item.
+        """
+        global ino
+        assert configdata.dirty == None
+        assert configdata.split_export(tmpdir) == 3
+        assert sorted(os.listdir(tmpdir)) == ['%2Faddress.json','%2FphoneNumber.json',SPLIT_INDEX]
+        assert configdata.dirty == set()
+        with open(tmpdir+os.sep+SPLIT_INDEX) as fp:
+            assert myjson.load(fp)['root'] == {'address':None,'phoneNumber':None}
+        ino = self.inodes(tmpdir)
+
+    def testCase010(self):
+        """Concurrent load, reassembled and validated.
+        """
+        for processes in (1,2,):
+            cd = self.load()
+            cd.data['address']['city'] = 'Boston'
+            assert cd.split_import(tmpdir,processes=processes) == 2
+            assert cd.data == configdata.data
+            assert cd.dirty == set()
+
+    def testCase020(self):
+        """A changed branch rewrites the file of the branch only.
+        """
+        global ino
+        configdata.branch_add(configdata.data['address'],'city','Boston')
+        assert configdata.dirty == set([(u'address',)])
+        assert configdata.split_export(tmpdir) == 1
+        inonew = self.inodes(tmpdir)
+        assert [f for f in ino if ino[f] != inonew[f]] == ['%2Faddress.json']
+        ino = inonew
+
+    def testCase030(self):
+        """A patch marks the branches of the targets.
+        """
+        global ino
+        p = JSONPatch()
+        p += JSONPatchItem('replace','/phoneNumber/0/number','212 555-0000')
+        p += JSONPatchItem('test','/address/city','Boston')
+        assert p.apply(configdata) == (2,[])
+        assert configdata.dirty == set([(u'phoneNumber',)])
+        assert configdata.split_export(tmpdir) == 1
+        inonew = self.inodes(tmpdir)
+        assert [f for f in ino if ino[f] != inonew[f]] == ['%2FphoneNumber.json']
+
+        cd = self.load()
+        cd.split_import(tmpdir)
+        assert cd.data['phoneNumber'][0]['number'] == '212 555-0000'
+        assert cd.data['address']['city'] == 'Boston'
+
+    def testCase040(self):
+        """A new top-level item changes the layout, a removed one deletes its file.
+        """
+        configdata.branch_add(configdata.data,'note',{'text':'x'})
+        assert configdata.dirty == set([()])
+        assert configdata.split_export(tmpdir) == 2
+        assert '%2Fnote.json' in os.listdir(tmpdir)
+
+        configdata.branch_remove(configdata.data,'note')
+        assert configdata.split_export(tmpdir) == 1
+        assert sorted(os.listdir(tmpdir)) == ['%2Faddress.json','%2FphoneNumber.json',SPLIT_INDEX]
+
+    def testCase050(self):
+        """Nested branches, compressed.
+        """
+        d = tmpdir+os.sep+'nested'
+        assert configdata.split_export(d,['/phoneNumber','/phoneNumber/1'],compression='gz') == 3
+        assert sorted(os.listdir(d)) == ['%2FphoneNumber%2F1.json.gz','%2FphoneNumber.json.gz',SPLIT_INDEX]
+
+        cd = self.load()
+        assert cd.split_import(d,processes=2) == 2
+        assert cd.data == configdata.data
+
+        cd.branch_add(JSONPointer('/phoneNumber/1/type'),None,'work')
+        assert cd.dirty == set([(u'phoneNumber',u'1')])
+        cd.branch_add(cd.data['address'],'city','Chicago')
+        assert cd.dirty == set([(u'phoneNumber',u'1'),()])
+        assert cd.split_export(d) == 2
+
+        cd2 = self.load()
+        cd2.split_import(d)
+        assert cd2.data == cd.data
+        assert cd2.data['phoneNumber'][0] == configdata.data['phoneNumber'][0]
+
+    def testCase060(self):
+        """Untracked changes require 'force'.
+        """
+        configdata.split_export(tmpdir) # the layout of the directory
+        configdata.data['address']['houseNumber'] = 13
+        assert configdata.split_export(tmpdir) == 0
+        assert configdata.split_export(tmpdir,force=True) == 3
+
+        cd = self.load()
+        cd.split_import(tmpdir)
+        assert cd.data['address']['houseNumber'] == 13
+
+    def testCase070(self):
+        """A missing branch file fails the import, the data is kept.
+        """
+        os.unlink(tmpdir+os.sep+'%2FphoneNumber.json')
+        cd = self.load()
+        data = cd.data
+        try:
+            cd.split_import(tmpdir)
+        except JSONDataSourceFile:
+            pass
+        else:
+            assert False, "expected JSONDataSourceFile"
+        assert cd.data is data
+
+    def testCase080(self):
+        """Nested nodes by pointers and keys, unknown nodes mark all.
+        """
+        cd = self.load()
+        cd.split_export(tmpdir+os.sep+'marks',['/phoneNumber','/phoneNumber/1'])
+        cd.branch_create(cd.data['phoneNumber'][1],['extra','a'],1)
+        assert cd.dirty == set([(u'phoneNumber',u'1')])
+        cd.dirty.clear()
+        cd.branch_add(JSONPointer('/phoneNumber/0'),'type','work')
+        assert cd.dirty == set([(u'phoneNumber',)])
+        cd.dirty.clear()
+        cd.branch_remove(cd.data['phoneNumber'][2],'type')
+        assert cd.dirty == set([(),(u'phoneNumber',),(u'phoneNumber',u'1')])
+
+    def testCase090(self):
+        """Changes applied by 'reload' are marked.
+        """
+        fname = tmpdir+os.sep+'reload.json'
+        with open(mypath+'datafile.json') as fp:
+            data = myjson.load(fp)
+        with open(fname,'w') as fp:
+            myjson.dump(data,fp)
+        kargs = {}
+        kargs['datafile'] = fname
+        kargs['schemafile'] = mypath+'schema.jsd'
+        kargs['nodefaultpath'] = True
+        kargs['nosubdata'] = True
+        kargs['validator'] = MODE_SCHEMA_DRAFT4
+        kargs['reloadable'] = True
+        cd = ConfigData(appname,**kargs)
+        cd.split_export(tmpdir+os.sep+'reload')
+
+        data['address']['city'] = 'Boston'
+        with open(fname,'w') as fp:
+            myjson.dump(data,fp)
+        t = time.time()+2
+        os.utime(fname,(t,t))
+        assert len(cd.reload()) == 1
+        assert cd.dirty == set([(u'address',)])
+        assert cd.split_export(tmpdir+os.sep+'reload') == 1
+
+
+#
+#######################
+#
+
+if __name__ == '__main__':
+    unittest.main()
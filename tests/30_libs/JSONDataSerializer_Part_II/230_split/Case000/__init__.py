@@ -0,0 +1,2 @@
+"""Export into a file for each branch, rewrite of the changed branches only.
+"""
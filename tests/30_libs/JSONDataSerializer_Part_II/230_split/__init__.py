@@ -0,0 +1,2 @@
+"""Split-file persistence with the tracking of changed branches.
+"""
@@ -0,0 +1,170 @@
+"""Shared schema by jsondata.JSONDataIO.schemacache.
+"""
+from __future__ import absolute_import
+
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+import threading
+
+#
+if 'ujson' in sys.argv:
+    import ujson as myjson
+else:
+    import json as myjson
+import jsonschema
+from jsonschema import ValidationError
+
+
+from jsondata.JSONDataSerializer import JSONDataSerializer as ConfigData
+from jsondata.JSONDataSerializer import MODE_SCHEMA_OFF,MODE_SCHEMA_DRAFT4
+from jsondata.JSONDataIO import SchemaCache,schemacache
+from jsondata.JSONPatch import JSONPatch,JSONPatchItemException
+
+# name of application, used for several filenames as MODE_SCHEMA_DRAFT4
+_APPNAME = "jsondc"
+appname = _APPNAME
+mypath = os.path.dirname(__file__)+os.sep
+#
+#######################
+#
+class CallUnits(unittest.TestCase):
+    """Import repeatedly with the same schema file.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        global tmpdir
+        global schemafile
+
+        tmpdir = tempfile.mkdtemp()
+        shutil.copy(mypath+'item.jsd',tmpdir)
+        schemafile = tmpdir+os.sep+'item.jsd'
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(tmpdir)
+
+    def testCase000(self):
+        """The schema is parsed once by setSchema and json_import.
+        """
+        global configdata
+        misses = schemacache.misses
+        hits = schemacache.hits
+
+        kargs = {}
+        kargs['datafile'] = mypath+'item.json'
+        kargs['schemafile'] = schemafile
+        kargs['nodefaultpath'] = True
+        kargs['nosubdata'] = True
+        kargs['validator'] = MODE_SCHEMA_DRAFT4
+        configdata = ConfigData(appname,**kargs)
+        configdata.data = {'items':{'i':configdata.data}}
+        for i in range(10):
+            assert configdata.json_import(configdata.data['items'],'i'+str(i),mypath+'item.json',schemafile)
+
+        assert schemacache.misses == misses + 1
+        assert schemacache.hits == hits + 11
+        assert configdata.schema == schemacache.load(schemafile)
+        assert configdata.schema is not schemacache.load(schemafile)
+        assert len(configdata.data['items']) == 11
+
+    def testCase010(self):
+        """A changed file is parsed again.
+        """
+        with open(schemafile) as fp:
+            schema = myjson.load(fp)
+        schema['required'] = ['name','size','color']
+        with open(schemafile,'w') as fp:
+            myjson.dump(schema,fp)
+        os.utime(schemafile,(1,1))
+
+        misses = schemacache.misses
+        try:
+            configdata.json_import(configdata.data['items'],'x',mypath+'item.json',schemafile)
+        except ValidationError as e:
+            assert 'color' in e.message
+        else:
+            assert False, "expected ValidationError"
+        assert schemacache.misses == misses + 1
+
+    def testCase020(self):
+        """Compiled validators, checked once, one for each thread.
+        """
+        c = SchemaCache()
+        v = c.validator(mypath+'item.jsd',jsonschema.Draft4Validator)
+        assert v is c.validator(mypath+'item.jsd',jsonschema.Draft4Validator)
+        assert v is c.compiled(c.load(mypath+'item.jsd'),jsonschema.Draft4Validator)
+        assert c.compiled({'type':'object'},jsonschema.Draft4Validator) == None
+        assert c.misses == 1 and c.hits == 2
+
+        other = []
+        t = threading.Thread(target=lambda: other.append(c.validator(mypath+'item.jsd',jsonschema.Draft4Validator)))
+        t.start()
+        t.join()
+        assert other[0] is not v and other[0].schema is v.schema
+
+    def testCase030(self):
+        """Validated patch list.
+        """
+        misses = schemacache.misses
+        for i in range(3):
+            p = JSONPatch()
+            assert p.patch_import(mypath+'patch.json',mypath+'patch.jsd',validator=MODE_SCHEMA_DRAFT4)
+            assert len(p) == 2
+        assert schemacache.misses <= misses + 1
+
+        try:
+            JSONPatch().patch_import(mypath+'invalid.json',mypath+'patch.jsd',validator=MODE_SCHEMA_DRAFT4)
+        except ValidationError as e:
+            assert 'path' in e.message
+        else:
+            assert False, "expected ValidationError"
+        for kargs in ({},{'validator':MODE_SCHEMA_OFF},):
+            try: # the default is off, same as without 'schemafile'
+                JSONPatch().patch_import(mypath+'invalid.json',mypath+'patch.jsd',**kargs)
+            except JSONPatchItemException: # not validated
+                pass
+            else:
+                assert False, "expected JSONPatchItemException"
+
+    def testCase040(self):
+        """LRU eviction.
+        """
+        c = SchemaCache(maxentries=1)
+        c.load(mypath+'item.jsd')
+        c.load(mypath+'patch.jsd')
+        assert len(c) == 1
+        c.load(mypath+'item.jsd')
+        assert c.misses == 3
+
+    def testCase050(self):
+        """Each instance has its own copy of the cached schema.
+        """
+        kargs = {}
+        kargs['datafile'] = mypath+'item.json'
+        kargs['schemafile'] = mypath+'item.jsd'
+        kargs['nodefaultpath'] = True
+        kargs['nosubdata'] = True
+        kargs['validator'] = MODE_SCHEMA_DRAFT4
+        c1 = ConfigData(appname,**kargs)
+        c1.schema['required'] = ['name','size','color']
+        c2 = ConfigData(appname,**kargs)
+        assert 'color' not in c2.schema['required']
+        assert 'color' not in schemacache.load(mypath+'item.jsd')['required']
+        try:
+            c1.validate(c1.data,c1.schema,MODE_SCHEMA_DRAFT4)
+        except ValidationError as e:
+            assert 'color' in e.message
+        else:
+            assert False, "expected ValidationError"
+
+
+#
+#######################
+#
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,2 @@
+"""Schema shared by setSchema, json_import, and patch_import.
+"""
@@ -0,0 +1,2 @@
+"""Process-wide cache of parsed schemas.
+"""
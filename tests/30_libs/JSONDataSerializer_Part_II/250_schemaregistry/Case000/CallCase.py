@@ -0,0 +1,170 @@
+"""Local '$ref' resolution by jsondata.JSONDataSchema.SchemaRegistry.
+"""
+from __future__ import absolute_import
+
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+import warnings
+
+#
+if 'ujson' in sys.argv:
+    import ujson as myjson
+else:
+    import json as myjson
+import jsonschema
+from jsonschema import ValidationError
+
+
+from jsondata.JSONDataSerializer import JSONDataSerializer as ConfigData
+from jsondata.JSONDataSerializer import MODE_SCHEMA_OFF,MODE_SCHEMA_DRAFT4
+from jsondata.JSONDataSchema import SchemaRegistry,fileuri
+from jsondata.JSONDataExceptions import JSONDataValue,JSONDataSourceFile
+
+# name of application, used for several filenames as MODE_SCHEMA_DRAFT4
+_APPNAME = "jsondc"
+appname = _APPNAME
+mypath = os.path.dirname(__file__)+os.sep
+#
+#######################
+#
+class CallUnits(unittest.TestCase):
+    """Validate by a schema split into several files.
+    """
+
+    def refs(self, node, seen=None):
+        """Counts the remaining '$ref' within a possibly cyclic schema."""
+        if seen == None:
+            seen = set()
+        if id(node) in seen or type(node) not in (dict,list):
+            return 0
+        seen.add(id(node))
+        if type(node) is dict:
+            return ('$ref' in node) + sum(self.refs(v,seen) for v in node.values())
+        return sum(self.refs(v,seen) for v in node)
+
+    def testCase000(self):
+        """Load with the schema files of the directory resolved once.
+        """
+        global configdata
+        kargs = {}
+        kargs['datafile'] = mypath+'datafile.json'
+        kargs['schemafile'] = mypath+'schemas'+os.sep+'main.jsd'
+        kargs['nodefaultpath'] = True
+        kargs['nosubdata'] = True
+        kargs['validator'] = MODE_SCHEMA_DRAFT4
+        kargs['schemaregistry'] = True
+        configdata = ConfigData(appname,**kargs)
+
+        registry = configdata.schemaregistry
+        assert self.refs(configdata.schema) == 0
+        address = configdata.schema['properties']['address']
+        assert address is registry.resolve(mypath+'schemas'+os.sep+'address.jsd')
+        assert address is registry.resolve('http://example.com/schemas/address.jsd')
+        assert configdata.schema['properties']['phoneNumber']['items'] \
+            is registry.resolve(fileuri(mypath+'schemas'+os.sep+'common.jsd')+'#/definitions/phone')
+
+    def testCase010(self):
+        """References by 'id' and by fragment.
+        """
+        data = myjson.loads('{"address":{"city":""}}')
+        try:
+            configdata.validate(data,configdata.schema,MODE_SCHEMA_DRAFT4)
+        except ValidationError as e:
+            assert list(e.path) == ['address','city']
+        else:
+            assert False, "expected ValidationError"
+
+        data = myjson.loads('{"address":{"city":"x"},"phoneNumber":[{"number":"1"},{"number":"x"}]}')
+        try:
+            configdata.validate(data,configdata.schema,MODE_SCHEMA_DRAFT4)
+        except ValidationError as e:
+            assert list(e.path) == ['phoneNumber',1,'number']
+        else:
+            assert False, "expected ValidationError"
+
+    def testCase020(self):
+        """Recursive schema.
+        """
+        data = myjson.loads('{"address":{"city":"x"},"tree":{"name":"a","children":[{"name":"b","children":[{}]}]}}')
+        try:
+            configdata.validate(data,configdata.schema,MODE_SCHEMA_DRAFT4)
+        except ValidationError as e:
+            assert list(e.path) == ['tree','children',0,'children',0]
+        else:
+            assert False, "expected ValidationError"
+
+    def testCase030(self):
+        """Import by the shared resolved schema.
+        """
+        configdata.data = {'copy':{'address':{'city':'a'}}}
+        assert configdata.json_import(configdata.data,'copy',mypath+'datafile.json',mypath+'schemas'+os.sep+'main.jsd')
+        assert configdata.data['copy']['tree']['name'] == 'a'
+
+    def testCase040(self):
+        """Unknown references are not fetched.
+        """
+        registry = SchemaRegistry(mypath+'schemas')
+        registry.add_schema({'properties':{'x':{'$ref':'http://example.com/missing.jsd'}}},'urn:test')
+        try:
+            registry.resolve('urn:test')
+        except JSONDataValue:
+            pass
+        else:
+            assert False, "expected JSONDataValue"
+
+    def testCase050(self):
+        """The meta-schemas are registered.
+        """
+        registry = SchemaRegistry()
+        registry.add_schema({'$ref':'http://json-schema.org/draft-04/schema#'},'urn:meta')
+        meta = registry.resolve('urn:meta')
+        assert meta['properties']['not'] is meta
+        v = registry.validator('urn:meta',jsonschema.Draft4Validator)
+        assert v.is_valid({'type':'object'})
+        assert not v.is_valid({'type':1})
+
+    def testCase060(self):
+        """Unparsable files of the search path are skipped.
+        """
+        tmpdir = tempfile.mkdtemp()
+        try:
+            shutil.copytree(mypath+'schemas',tmpdir+os.sep+'schemas')
+            broken = tmpdir+os.sep+'schemas'+os.sep+'broken.jsd'
+            with open(broken,'w') as fp:
+                fp.write('{"type": ')
+            with warnings.catch_warnings(record=True) as w:
+                warnings.simplefilter('always')
+                registry = SchemaRegistry(tmpdir+os.sep+'schemas')
+                assert len(w) == 1 and 'broken.jsd' in str(w[0].message)
+            assert len(registry.documents) == 4 + len(jsonschema.validators.meta_schemas)
+            try:
+                registry.add_file(broken)
+            except JSONDataSourceFile:
+                pass
+            else:
+                assert False, "expected JSONDataSourceFile"
+
+            kargs = {}
+            kargs['datafile'] = mypath+'datafile.json'
+            kargs['schemafile'] = tmpdir+os.sep+'schemas'+os.sep+'main.jsd'
+            kargs['nodefaultpath'] = True
+            kargs['nosubdata'] = True
+            kargs['validator'] = MODE_SCHEMA_DRAFT4
+            kargs['schemaregistry'] = True
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                cd = ConfigData(appname,**kargs)
+            assert cd.data['tree']['name'] == 'a'
+        finally:
+            shutil.rmtree(tmpdir)
+
+
+#
+#######################
+#
+
+if __name__ == '__main__':
+    unittest.main()
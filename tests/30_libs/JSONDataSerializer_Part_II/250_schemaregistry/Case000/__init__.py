@@ -0,0 +1,2 @@
+"""Schema split into files linked by '$ref', by file and by 'id'.
+"""
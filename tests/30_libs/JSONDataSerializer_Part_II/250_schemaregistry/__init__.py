@@ -0,0 +1,2 @@
+"""Local resolution of '$ref' by a registry of schema files.
+"""
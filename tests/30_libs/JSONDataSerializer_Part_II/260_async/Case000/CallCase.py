@@ -0,0 +1,158 @@
+"""Asynchronous calls of jsondata.JSONDataSerializer and jsondata.JSONPatch.
+"""
+from __future__ import absolute_import
+
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+import threading
+import time
+
+#
+if 'ujson' in sys.argv:
+    import ujson as myjson
+else:
+    import json as myjson
+import jsonschema
+from jsonschema import ValidationError
+
+
+from jsondata.JSONDataSerializer import JSONDataSerializer as ConfigData
+from jsondata.JSONDataSerializer import MODE_SCHEMA_OFF,MODE_SCHEMA_DRAFT4
+from jsondata.JSONDataIO import IOExecutor
+from jsondata.JSONPatch import JSONPatch
+from jsondata.JSONPointer import JSONPointer
+
+# name of application, used for several filenames as MODE_SCHEMA_DRAFT4
+_APPNAME = "jsondc"
+appname = _APPNAME
+mypath = os.path.dirname(__file__)+os.sep
+#
+#######################
+#
+class CallUnits(unittest.TestCase):
+    """Import the files 'part<n>.json' into '/parts' concurrently.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        global tmpdir
+        global configdata
+        global executor
+
+        tmpdir = tempfile.mkdtemp()
+        executor = IOExecutor(4,2)
+        kargs = {}
+        kargs['datafile'] = mypath+'base.json'
+        kargs['schemafile'] = mypath+'base.jsd'
+        kargs['nodefaultpath'] = True
+        kargs['nosubdata'] = True
+        kargs['validator'] = MODE_SCHEMA_DRAFT4
+        kargs['executor'] = executor
+        configdata = ConfigData(appname,**kargs)
+
+    @classmethod
+    def tearDownClass(cls):
+        executor.close()
+        shutil.rmtree(tmpdir)
+
+    def testCase000(self):
+        """Concurrent imports with validation, and a callback.
+        """
+        done = []
+        results = [
+            configdata.json_import_async(JSONPointer('/parts'),'p'+str(i),
+                mypath+'part'+str(i)+'.json',mypath+'part.jsd',callback=done.append)
+            for i in range(6)
+        ]
+        for r in results:
+            assert r.get(10)
+        assert len(done) == 6
+        assert sorted(configdata.data['parts'].keys()) == ['p'+str(i) for i in range(6)]
+        assert configdata.data['parts']['p3'] == {'id':3,'items':['x3','y3']}
+
+    def testCase010(self):
+        """The exception is raised by 'get', the data remains unchanged.
+        """
+        r = configdata.json_import_async(configdata.data['parts'],'bad',
+            mypath+'invalid.json',mypath+'part.jsd')
+        try:
+            r.get(10)
+        except ValidationError:
+            pass
+        else:
+            assert False, "expected ValidationError"
+        assert 'bad' not in configdata.data['parts']
+
+    def testCase020(self):
+        """The number of concurrent loads is bounded.
+        """
+        state = {'n':0,'max':0}
+        lock = threading.Lock()
+        def load():
+            with lock:
+                state['n'] += 1
+                state['max'] = max(state['max'],state['n'])
+            time.sleep(0.02)
+            with lock:
+                state['n'] -= 1
+        results = [executor.submit(load,load=True) for _i in range(8)]
+        for r in results:
+            r.get(10)
+        assert state['max'] == 2
+
+    def testCase025(self):
+        """Queued loads block neither the caller, nor the threads of the pool.
+        """
+        ex = IOExecutor(2,1)
+        try:
+            event = threading.Event()
+            first = ex.submit(event.wait,(10,),load=True)
+            second = ex.submit(lambda: 'load',load=True)
+            assert ex.submit(lambda: 'export').get(2) == 'export'
+            assert not second.ready() # waits for 'first'
+            event.set()
+            first.get(10)
+            assert second.get(10) == 'load'
+            failed = ex.submit(lambda: 1/0,load=True)
+            try:
+                failed.get(10)
+            except ZeroDivisionError:
+                assert not failed.successful()
+            else:
+                assert False, "expected ZeroDivisionError"
+        finally:
+            ex.close()
+
+    def testCase030(self):
+        """Export, and import into a new document.
+        """
+        fname = tmpdir+os.sep+'export.json'
+        assert configdata.json_export_async(None,fname).get(10)
+        with open(fname) as fp:
+            assert myjson.load(fp) == configdata.data
+
+    def testCase040(self):
+        """Patch import, apply, and export.
+        """
+        patch = JSONPatch()
+        assert patch.patch_import_async(mypath+'patch.json',executor=executor).get(10)
+        assert len(patch) == 2
+        assert patch(configdata) == (2,[])
+        assert configdata.data['name'] == 'patched'
+        assert configdata.data['parts']['new'] == {'id':9,'items':[]}
+
+        fname = tmpdir+os.sep+'patch.json'
+        assert patch.patch_export_async(fname,executor=executor).get(10)
+        with open(fname) as fp:
+            assert fp.read() == patch.repr_export()
+
+
+#
+#######################
+#
+
+if __name__ == '__main__':
+    unittest.main()
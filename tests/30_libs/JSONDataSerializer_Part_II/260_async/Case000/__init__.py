@@ -0,0 +1,2 @@
+"""Concurrent import of several files into one document.
+"""
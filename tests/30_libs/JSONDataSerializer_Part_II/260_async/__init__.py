@@ -0,0 +1,2 @@
+"""Asynchronous import, export, and patch I/O by a bounded executor.
+"""
@@ -0,0 +1,110 @@
+"""Partial export by jsondata.JSONDataSerializer.json_export(pointers=...).
+"""
+from __future__ import absolute_import
+
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+
+#
+if 'ujson' in sys.argv:
+    import ujson as myjson
+else:
+    import json as myjson
+import jsonschema
+
+
+from jsondata.JSONDataSerializer import JSONDataSerializer as ConfigData
+from jsondata.JSONDataSerializer import MODE_SCHEMA_OFF,MODE_SCHEMA_DRAFT4
+from jsondata.JSONDataIO import iterencode_select,json_load
+from jsondata.JSONPointer import JSONPointer
+
+# name of application, used for several filenames as MODE_SCHEMA_DRAFT4
+_APPNAME = "jsondc"
+appname = _APPNAME
+mypath = os.path.dirname(__file__)+os.sep
+#
+#######################
+#
+class CallUnits(unittest.TestCase):
+    """Export selected branches, the result is compared with the parsed file.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        global tmpdir
+        global configdata
+        global fname
+
+        tmpdir = tempfile.mkdtemp()
+        fname = tmpdir+os.sep+'export.json'
+        kargs = {}
+        kargs['datafile'] = mypath+'datafile.json'
+        kargs['schemafile'] = mypath+'schema.jsd'
+        kargs['nodefaultpath'] = True
+        kargs['nosubdata'] = True
+        kargs['validator'] = MODE_SCHEMA_DRAFT4
+        configdata = ConfigData(appname,**kargs)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(tmpdir)
+
+    def export(self, pointers, sourcenode=None):
+        assert configdata.json_export(sourcenode,fname,pointers=pointers)
+        return json_load(fname)
+
+    def testCase000(self):
+        """The whole document, same format as 'json.dumps'.
+        """
+        assert ''.join(iterencode_select(configdata.data,[''])) == myjson.dumps(configdata.data)
+        assert self.export(['/meta','']) == configdata.data
+
+    def testCase010(self):
+        """A branch, and a pattern through an array.
+        """
+        assert self.export(['/services',JSONPointer('/users/*/name')]) == {
+            'services': configdata.data['services'],
+            'users': [{'name':'u0'},{'name':'u1'},{}],
+        }
+
+    def testCase020(self):
+        """Overlapping selections are merged.
+        """
+        assert self.export(['/users/*/name','/users/1','/users/*/roles/0','/services/*/port']) == {
+            'users': [{'name':'u0','roles':['admin']},{'name':'u1','id':1},{'roles':[]}],
+            'services': {'web':{'port':80},'db':{'port':5432}},
+        }
+
+    def testCase030(self):
+        """Array items are renumbered, missing paths are ignored.
+        """
+        assert self.export(['/users/2','/users/9','/users/-','/none/x','/count/x']) == {
+            'users': [{'id':2,'roles':[]}],
+        }
+        assert self.export([]) == {}
+
+    def testCase040(self):
+        """Relative to a sourcenode, compressed.
+        """
+        global fname
+        fname = tmpdir+os.sep+'export.json.gz'
+        assert self.export(['/web/paths/1','/*/host'],configdata.data['services']) == {
+            'web': {'host':'a','paths':['/x']},
+            'db': {'host':'b'},
+        }
+
+    def testCase050(self):
+        """The data is not modified.
+        """
+        assert configdata.data == json_load(mypath+'datafile.json')
+
+
+#
+#######################
+#
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,2 @@
+"""Selection of services and user attributes.
+"""
@@ -0,0 +1,2 @@
+"""Partial export of branches selected by JSONPointers and patterns.
+"""
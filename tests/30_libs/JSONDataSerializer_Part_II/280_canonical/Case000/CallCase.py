@@ -0,0 +1,119 @@
+"""Canonical encoding by jsondata.JSONData.dumps_canonical() and hash_canonical().
+"""
+from __future__ import absolute_import
+
+import unittest
+import os
+import sys
+import hashlib
+import io
+
+#
+if 'ujson' in sys.argv:
+    import ujson as myjson
+else:
+    import json as myjson
+import jsonschema
+
+
+from jsondata.JSONDataSerializer import JSONDataSerializer as ConfigData
+from jsondata.JSONDataSerializer import MODE_SCHEMA_OFF,MODE_SCHEMA_DRAFT4
+from jsondata.JSONDataExceptions import JSONDataValue
+from jsondata.JSONDataCanonical import dumps_canonical,iterencode_canonical,number_canonical
+from jsondata.JSONPointer import JSONPointer
+
+# name of application, used for several filenames as MODE_SCHEMA_DRAFT4
+_APPNAME = "jsondc"
+appname = _APPNAME
+mypath = os.path.dirname(__file__)+os.sep
+#
+#######################
+#
+class CallUnits(unittest.TestCase):
+    """The examples of RFC8785.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        global configdata
+        global canonical
+
+        kargs = {}
+        kargs['datafile'] = mypath+'rfc8785.json'
+        kargs['schemafile'] = mypath+'schema.jsd'
+        kargs['nodefaultpath'] = True
+        kargs['nosubdata'] = True
+        kargs['validator'] = MODE_SCHEMA_DRAFT4
+        configdata = ConfigData(appname,**kargs)
+
+        with open(mypath+'rfc8785.canonical') as fp:
+            canonical = fp.read()
+
+    def testCase000(self):
+        """Sorted keys, numbers, and escapes.
+        """
+        assert configdata.dumps_canonical() == canonical
+        assert configdata.dumps_canonical(JSONPointer('/literals')) == '[null,true,false]'
+
+    def testCase010(self):
+        """Sorted by the code units of UTF-16.
+        """
+        with open(mypath+'sort.json') as fp:
+            data = myjson.load(fp)
+        s = dumps_canonical(data).decode('utf-8')
+        assert sorted(data.values(),key=lambda v: s.index(v)) == [
+            'Carriage Return','One','Control','Latin Small Letter O With Diaeresis',
+            'Euro Sign','Emoji: Grinning Face','Hebrew Letter Dalet With Dagesh']
+
+    def testCase020(self):
+        """Numbers in the form of ECMAScript.
+        """
+        for x,s in ((0.0,'0'),(-0.0,'0'),(1.0,'1'),(100.0,'100'),(-0.5,'-0.5'),
+                    (1e20,'100000000000000000000'),(1e21,'1e+21'),(1e-6,'0.000001'),
+                    (1.5e-7,'1.5e-7'),(5e-324,'5e-324'),(-1.7976931348623157e308,'-1.7976931348623157e+308'),
+                    (2**64,'18446744073709551616'),(True,'true')):
+            assert dumps_canonical(x) == s, (x,s)
+        for x in (float('nan'),float('inf'),object()):
+            try:
+                dumps_canonical([x])
+            except JSONDataValue:
+                pass
+            else:
+                assert False, "expected JSONDataValue"
+
+    def testCase030(self):
+        """Hash by chunks, same as the hash of the text.
+        """
+        h = configdata.hash_canonical()
+        assert h.hexdigest() == hashlib.sha256(canonical).hexdigest()
+        h = configdata.hash_canonical(sink=hashlib.md5())
+        assert h.hexdigest() == hashlib.md5(canonical).hexdigest()
+        f = configdata.hash_canonical(sink=io.BytesIO())
+        assert f.getvalue() == canonical
+
+    def testCase040(self):
+        """Deep nesting, and many chunks.
+        """
+        d = []
+        for _i in range(20000):
+            d = [d, {'a': 1}]
+        chunks = list(iterencode_canonical(d,100))
+        assert len(chunks) > 100
+        s = ''.join(chunks)
+        assert s.startswith('[[[') and s.endswith(',{"a":1}]')
+        assert len(s) == 20000*10+2
+
+    def testCase050(self):
+        """Equal data of different order and format.
+        """
+        a = {'b': [1.0, u'x'], 'a': {'y': None, 'x': 2}}
+        b = myjson.loads('{"a": {"x": 2.0, "y": null}, "b": [1, "x"]}')
+        assert dumps_canonical(a) == dumps_canonical(b) == '{"a":{"x":2,"y":null},"b":[1,"x"]}'
+
+
+#
+#######################
+#
+
+if __name__ == '__main__':
+    unittest.main()
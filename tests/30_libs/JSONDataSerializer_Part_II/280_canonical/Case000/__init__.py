@@ -0,0 +1,2 @@
+"""Examples of RFC8785, numbers, sort order, and hashing.
+"""
@@ -0,0 +1,2 @@
+"""Canonical encoding in accordance to RFC8785.
+"""
@@ -0,0 +1,144 @@
+"""Compiled plans by jsondata.JSONPatch.compile().
+"""
+from __future__ import absolute_import
+
+import unittest
+import os
+import sys
+import copy
+
+#
+if 'ujson' in sys.argv:
+    import ujson as myjson
+else:
+    import json as myjson
+import jsonschema
+
+
+from jsondata.JSONDataSerializer import JSONDataSerializer as ConfigData
+from jsondata.JSONDataSerializer import MODE_SCHEMA_OFF,MODE_SCHEMA_DRAFT4
+from jsondata.JSONPatch import JSONPatch,JSONPatchItem,JSONPatchPlan,JSONPatchItemException
+from jsondata.JSONPointer import JSONPointer
+
+# name of application, used for several filenames as MODE_SCHEMA_DRAFT4
+_APPNAME = "jsondc"
+appname = _APPNAME
+mypath = os.path.dirname(__file__)+os.sep
+#
+#######################
+#
+class CallUnits(unittest.TestCase):
+    """Apply the plan of 'patch.json' onto copies of 'datafile.json'.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        global data
+        global expected
+        global patch
+        global plan
+
+        with open(mypath+'datafile.json') as fp:
+            data = myjson.load(fp)
+        with open(mypath+'expected.json') as fp:
+            expected = myjson.load(fp)
+        patch = JSONPatch()
+        patch.patch_import(mypath+'patch.json')
+        plan = patch.compile()
+
+    def testCase000(self):
+        """Repeated application, the inserted values are not shared.
+        """
+        docs = [copy.deepcopy(data) for _i in range(3)]
+        for d in docs:
+            assert plan(d) == (12,[])
+            assert d == expected
+        docs[0]['config']['d']['e'].append(8)
+        assert docs[1]['config']['d']['e'] == [7]
+        assert plan.steps[2][5] == {'e': []}
+
+    def testCase010(self):
+        """Same result as 'JSONPatch.apply' for the operations without aliases.
+        """
+        p0 = JSONPatch()
+        p0.patch_import(mypath+'patch.json')
+        p = JSONPatch()
+        for i in (0,1,2,3,4,5,6,9,10,11):
+            p += p0[i]
+        d0 = copy.deepcopy(data)
+        d1 = copy.deepcopy(data)
+        pl = p.compile()
+        assert p.apply(d0) == pl.apply(d1) == (10,[])
+        assert d0 == d1
+
+    def testCase020(self):
+        """Failed test, and missing nodes.
+        """
+        p = JSONPatch()
+        p += JSONPatchItem('test','/name','other')
+        p += JSONPatchItem('test','/config/b/c/1',2)
+        assert p.compile().apply(copy.deepcopy(data)) == (2,[0])
+
+        p = JSONPatch()
+        p += JSONPatchItem('replace','/none/x',1)
+        try:
+            p.compile().apply(copy.deepcopy(data))
+        except KeyError:
+            pass
+        else:
+            assert False, "expected KeyError"
+
+    def testCase030(self):
+        """Operations 'move' and 'copy' by JSONPatchItem.
+        """
+        d = copy.deepcopy(data)
+        p = JSONPatch()
+        p += JSONPatchItem('move','/moved','/config/b')
+        p += JSONPatchItem('copy','/copied','/moved/c')
+        assert repr(p) == "[{u'op': u'move', u'path': u'/moved', u'from': u'/config/b'}, " \
+            "{u'op': u'copy', u'path': u'/copied', u'from': u'/moved/c'}]"
+        assert p.apply(d) == (2,[])
+        assert d['moved'] == {'c': [1,2,3]} and d['copied'] == [1,2,3]
+        assert 'b' not in d['config']
+
+    def testCase040(self):
+        """Serializer, with the creation of missing nodes, and dirty branches.
+        """
+        kargs = {}
+        kargs['datafile'] = mypath+'datafile.json'
+        kargs['schemafile'] = mypath+'schema.jsd'
+        kargs['nodefaultpath'] = True
+        kargs['nosubdata'] = True
+        kargs['validator'] = MODE_SCHEMA_DRAFT4
+        configdata = ConfigData(appname,**kargs)
+        configdata.dirty = set()
+
+        p = JSONPatch()
+        p += JSONPatchItem('add','/new/x','y')
+        p += JSONPatchItem('add','/config/b/c/0',0)
+        assert p.compile().apply(configdata) == (2,[])
+        assert configdata.data['new'] == {'x': 'y'}
+        assert configdata.data['config']['b']['c'] == [0,2,3]
+        assert configdata.dirty == set([()])
+        assert plan.apply(configdata) == (12,[])
+
+    def testCase050(self):
+        """The whole document is not a valid target.
+        """
+        p = JSONPatch()
+        p += JSONPatchItem('replace','',{})
+        try:
+            p.compile()
+        except JSONPatchItemException:
+            pass
+        else:
+            assert False, "expected JSONPatchItemException"
+        assert isinstance(plan,JSONPatchPlan) and len(plan) == 12
+
+
+#
+#######################
+#
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,2 @@
+"""Plan applied onto copies of a document, compared with JSONPatch.apply.
+"""
@@ -0,0 +1,2 @@
+"""Compiled execution plans of JSONPatch.
+"""
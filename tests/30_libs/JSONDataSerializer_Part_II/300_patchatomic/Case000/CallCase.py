@@ -0,0 +1,163 @@
+"""Atomic application by jsondata.JSONPatch.apply().
+"""
+from __future__ import absolute_import
+
+import unittest
+import os
+import sys
+import copy
+
+#
+if 'ujson' in sys.argv:
+    import ujson as myjson
+else:
+    import json as myjson
+import jsonschema
+
+
+from jsondata.JSONDataSerializer import JSONDataSerializer as ConfigData
+from jsondata.JSONDataSerializer import MODE_SCHEMA_OFF,MODE_SCHEMA_DRAFT4
+from jsondata.JSONPatch import JSONPatch,JSONPatchItem,JSONPatchException
+from jsondata.JSONPointer import JSONPointer
+
+# name of application, used for several filenames as MODE_SCHEMA_DRAFT4
+_APPNAME = "jsondc"
+appname = _APPNAME
+mypath = os.path.dirname(__file__)+os.sep
+#
+#######################
+#
+class CallUnits(unittest.TestCase):
+    """Apply 'patch.json' followed by a failing task.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        global data
+        global patch
+
+        with open(mypath+'datafile.json') as fp:
+            data = myjson.load(fp)
+        patch = JSONPatch()
+        patch.patch_import(mypath+'patch.json')
+
+    def testCase000(self):
+        """Complete patch.
+        """
+        d = copy.deepcopy(data)
+        assert patch.apply(d) == (11,[])
+        assert d == {
+            'config': {'a': 2, 'b': {'c': [2,3,1]}, 'd': {'e': [7]}},
+            'items': [{'id': 10}],
+            'copied': {'c': [1,2,3]},
+            'tags': [],
+        }
+
+    def testCase010(self):
+        """Failed test after each number of tasks, the document is unchanged.
+        """
+        for i in range(len(patch)+1):
+            p = JSONPatch()
+            for x in patch[:i]:
+                p += x
+            p += JSONPatchItem('test','/config/a',99)
+            d = copy.deepcopy(data)
+            assert p.apply(d) == (i+1,[i])
+            assert d == data, i
+
+    def testCase020(self):
+        """Exception after each number of tasks, the document is unchanged.
+        """
+        for i in range(len(patch)+1):
+            p = JSONPatch()
+            for x in patch[:i]:
+                p += x
+            p += JSONPatchItem('remove','/none')
+            d = copy.deepcopy(data)
+            try:
+                p.apply(d)
+            except KeyError:
+                pass
+            else:
+                assert False, "expected KeyError"
+            assert d == data, i
+
+    def testCase025(self):
+        """Parent replaced by a value, the document is unchanged.
+        """
+        for op in ('replace','add'):
+            p = JSONPatch()
+            p += JSONPatchItem(op,'/a','x')
+            p += JSONPatchItem('replace','/a/99',1)
+            d = {u'a':[1],u'f':1}
+            try:
+                p.apply(d)
+            except JSONPatchException:
+                pass
+            else:
+                assert False, "expected JSONPatchException"
+            assert d == {u'a':[1],u'f':1}, op
+
+    def testCase026(self):
+        """The values are inserted as copies.
+        """
+        p = JSONPatch()
+        p += JSONPatchItem('add','/x',[])
+        p += JSONPatchItem('add','/x/-',1)
+        d0 = {}
+        d1 = {}
+        assert p.apply(d0) == (2,[])
+        assert p.apply(d1) == (2,[])
+        assert d0 == d1 == {'x':[1]}
+        assert d0['x'] is not d1['x']
+        assert p[0].value == []
+
+    def testCase030(self):
+        """Not atomic, the failed tests are skipped and reported by index.
+        """
+        p = JSONPatch()
+        t = JSONPatchItem('test','/name','other')
+        p += t
+        p += JSONPatchItem('replace','/name','x')
+        p += t
+        p += JSONPatchItem('test','/name','x')
+        p += t
+        d = copy.deepcopy(data)
+        assert p.apply(d,False) == (5,[0,2,4])
+        assert d['name'] == 'x'
+
+        d = copy.deepcopy(data)
+        assert p.apply(d) == (5,[0])
+        assert d == data
+
+    def testCase040(self):
+        """Serializer, the created nodes are removed.
+        """
+        kargs = {}
+        kargs['datafile'] = mypath+'datafile.json'
+        kargs['schemafile'] = mypath+'schema.jsd'
+        kargs['nodefaultpath'] = True
+        kargs['nosubdata'] = True
+        kargs['validator'] = MODE_SCHEMA_DRAFT4
+        configdata = ConfigData(appname,**kargs)
+
+        p = JSONPatch()
+        p += JSONPatchItem('add','/new/x/y','z')
+        p += JSONPatchItem('add','/items/-',{'id': 3})
+        p += JSONPatchItem('add','/config/b/c/0',0)
+        assert p.compile().apply(configdata) == (3,[])
+        assert configdata.data['new'] == {'x': {'y': 'z'}}
+        assert configdata.data['items'][3] == {'id': 3}
+
+        p += JSONPatchItem('test','/name','other')
+        configdata.data = copy.deepcopy(data)
+        assert p.apply(configdata) == (4,[3])
+        assert configdata.data == data
+
+
+#
+#######################
+#
+
+if __name__ == '__main__':
+    unittest.main()
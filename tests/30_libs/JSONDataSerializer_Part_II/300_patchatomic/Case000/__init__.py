@@ -0,0 +1,2 @@
+"""Failed tasks at several positions, the document remains unchanged.
+"""
@@ -0,0 +1,2 @@
+"""Atomic application of JSONPatch with the rollback by inverse operations.
+"""
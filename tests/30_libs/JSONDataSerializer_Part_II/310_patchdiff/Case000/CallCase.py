@@ -0,0 +1,189 @@
+"""Creation of patches by jsondata.JSONPatch.from_diff().
+"""
+from __future__ import absolute_import
+
+import unittest
+import os
+import sys
+import copy
+import random
+
+#
+if 'ujson' in sys.argv:
+    import ujson as myjson
+else:
+    import json as myjson
+import jsonschema
+
+
+from jsondata.JSONDataSerializer import JSONDataSerializer as ConfigData
+from jsondata.JSONDataSerializer import MODE_SCHEMA_OFF,MODE_SCHEMA_DRAFT4
+from jsondata.JSONPatch import JSONPatch,JSONPatchItem,JSONPatchException
+from jsondata.JSONPointer import JSONPointer
+
+# name of application, used for several filenames as MODE_SCHEMA_DRAFT4
+_APPNAME = "jsondc"
+appname = _APPNAME
+mypath = os.path.dirname(__file__)+os.sep
+
+def randomdata(r, depth=0):
+    x = r.random()
+    if depth < 3 and x < 0.3:
+        return dict((r.choice('abcdef'),randomdata(r,depth+1)) for _i in range(r.randint(0,5)))
+    if depth < 3 and x < 0.6:
+        return [randomdata(r,depth+1) for _i in range(r.randint(0,8))]
+    return r.choice([1,2,1.5,u'x',u'y',None,True,u'a longer string value'])
+
+def randomchange(r, x, depth=0):
+    x = copy.deepcopy(x)
+    if type(x) is dict:
+        for k in list(x):
+            if r.random() < 0.2:
+                del x[k]
+            elif r.random() < 0.4:
+                x[k] = randomchange(r,x[k],depth+1)
+        if x and r.random() < 0.3:
+            x[r.choice('uvw')] = x.pop(r.choice(list(x)))
+        if r.random() < 0.3:
+            x[r.choice('abcdefg')] = randomdata(r,depth+1)
+    elif type(x) is list:
+        for _i in range(r.randint(0,3)):
+            y = r.random()
+            if y < 0.3 and x:
+                x.pop(r.randrange(len(x)))
+            elif y < 0.6:
+                x.insert(r.randint(0,len(x)),randomdata(r,depth+1))
+            elif y < 0.8 and x:
+                i = r.randrange(len(x))
+                x[i] = randomchange(r,x[i],depth+1)
+            elif x:
+                x.insert(r.randint(0,len(x)-1),x.pop(r.randrange(len(x))))
+    elif r.random() < 0.5:
+        return randomdata(r,depth)
+    return x
+
+#
+#######################
+#
+class CallUnits(unittest.TestCase):
+    """Compare 'datafile.json' with 'expected.json'.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        global data
+        global expected
+
+        with open(mypath+'datafile.json') as fp:
+            data = myjson.load(fp)
+        with open(mypath+'expected.json') as fp:
+            expected = myjson.load(fp)
+
+    def testCase000(self):
+        """Changed members, a moved object, and changed arrays.
+        """
+        p = JSONPatch.from_diff(data,expected)
+        assert repr(p[0]) == "{u'op': u'move', u'path': u'/new', u'from': u'/old'}"
+        assert sorted(repr(x) for x in p[1:]) == [
+            "{u'op': u'add', u'path': u'/items/3/tags/-', u'value': u'w'}",
+            "{u'op': u'add', u'path': u'/list/-', u'value': 9}",
+            "{u'op': u'remove', u'path': u'/items/1'}",
+            "{u'op': u'replace', u'path': u'/config/a', u'value': 2}",
+        ]
+        d = copy.deepcopy(data)
+        assert p.apply(d) == (5,[])
+        assert d == expected
+        assert len(JSONPatch.from_diff(data,copy.deepcopy(data))) == 0
+
+    def testCase010(self):
+        """Arrays, insertions are appended, the following items are moved.
+        """
+        p = JSONPatch.from_diff([1,2,3,4,5,6],[1,6,2,3,4,5])
+        assert len(p) == 4 and all(x.op == 3 for x in p)
+        assert repr(JSONPatch.from_diff([1,2,3],[3,1,2])) == \
+            "[{u'op': u'move', u'path': u'/-', u'from': u'/0'}, " \
+            "{u'op': u'move', u'path': u'/-', u'from': u'/0'}]"
+        assert repr(JSONPatch.from_diff([1,2,3,4],[1,3,4])) == \
+            "[{u'op': u'remove', u'path': u'/1'}]"
+        assert repr(JSONPatch.from_diff([1,2,3],[1,9,3])) == \
+            "[{u'op': u'replace', u'path': u'/1', u'value': 9}]"
+
+    def testCase020(self):
+        """Beyond the cost the arrays are compared by index.
+        """
+        a = list(range(10))
+        b = list(range(10,0,-1))
+        p = JSONPatch.from_diff(a,b,2)
+        assert len(p) == 9 and all(x.op == 5 for x in p)
+        for maxcost in (0,2,1000):
+            p = JSONPatch.from_diff([0,1,2,3],[9,0,1,2,3],maxcost)
+            d = [0,1,2,3]
+            p.apply(d)
+            assert d == [9,0,1,2,3]
+
+    def testCase030(self):
+        """Random changes, applied by the patch, and by the plan.
+        """
+        r = random.Random(4711)
+        n = 0
+        while n < 500:
+            a = randomdata(r)
+            b = randomchange(r,a)
+            if type(a) not in (dict,list) or type(a) is not type(b):
+                continue
+            n += 1
+            for maxcost in (0,3,1000):
+                p = JSONPatch.from_diff(a,b,maxcost)
+                d0 = copy.deepcopy(a)
+                d1 = copy.deepcopy(a)
+                p.apply(d0)
+                p.compile().apply(d1)
+                assert d0 == d1 == b, (a,b,maxcost)
+
+    def testCase040(self):
+        """Serializer as source, the patch applies onto the serializer.
+        """
+        kargs = {}
+        kargs['datafile'] = mypath+'datafile.json'
+        kargs['schemafile'] = mypath+'schema.jsd'
+        kargs['nodefaultpath'] = True
+        kargs['nosubdata'] = True
+        kargs['validator'] = MODE_SCHEMA_DRAFT4
+        configdata = ConfigData(appname,**kargs)
+
+        p = JSONPatch.from_diff(configdata,expected)
+        assert p.apply(configdata) == (5,[])
+        assert configdata.data == expected
+
+    def testCase050(self):
+        """The whole document is not a valid target.
+        """
+        try:
+            JSONPatch.from_diff({},[])
+        except JSONPatchException:
+            pass
+        else:
+            assert False, "expected JSONPatchException"
+        assert len(JSONPatch.from_diff([],[])) == 0
+
+    def testCase060(self):
+        """Paths within an enclosing document.
+        """
+        p = JSONPatch.from_diff({'a':1},{'a':2,'b':[]},prefix=['x',0])
+        assert sorted(repr(x) for x in p) == [
+            "{u'op': u'add', u'path': u'/x/0/b', u'value': []}",
+            "{u'op': u'replace', u'path': u'/x/0/a', u'value': 2}",
+        ]
+        assert repr(JSONPatch.from_diff({},[],prefix=['x'])) == \
+            "[{u'op': u'replace', u'path': u'/x', u'value': []}]"
+        d = {'x':[copy.deepcopy(data)]}
+        assert JSONPatch.from_diff(data,expected,prefix=['x',0]).apply(d) == (5,[])
+        assert d == {'x':[expected]}
+
+
+#
+#######################
+#
+
+if __name__ == '__main__':
+    unittest.main()
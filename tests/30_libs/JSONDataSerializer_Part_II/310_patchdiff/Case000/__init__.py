@@ -0,0 +1,2 @@
+"""Patches from the difference of the data files, applied onto copies of the source.
+"""
@@ -0,0 +1,2 @@
+"""Creation of JSONPatch by the difference of two documents.
+"""
@@ -0,0 +1,179 @@
+"""Optimization by jsondata.JSONPatch.optimize().
+"""
+from __future__ import absolute_import
+
+import unittest
+import os
+import sys
+import copy
+import random
+
+#
+if 'ujson' in sys.argv:
+    import ujson as myjson
+else:
+    import json as myjson
+import jsonschema
+
+
+from jsondata.JSONDataSerializer import JSONDataSerializer as ConfigData
+from jsondata.JSONDataSerializer import MODE_SCHEMA_OFF,MODE_SCHEMA_DRAFT4
+from jsondata.JSONPatch import JSONPatch,JSONPatchItem,JSONPatchPlan
+from jsondata.JSONPointer import JSONPointer
+
+# name of application, used for several filenames as MODE_SCHEMA_DRAFT4
+_APPNAME = "jsondc"
+appname = _APPNAME
+mypath = os.path.dirname(__file__)+os.sep
+
+def nodes(d, path=()):
+    yield path,d
+    if type(d) is dict:
+        for k,v in d.items():
+            for x in nodes(v,path+(k,)):
+                yield x
+    elif type(d) is list:
+        for i,v in enumerate(d):
+            for x in nodes(v,path+(i,)):
+                yield x
+
+def randompatch(r, doc, n):
+    """Creates a patch of tasks, which apply onto 'doc' one by one."""
+    values = [1,u'x',None,[],{},[1,2],{u'k':[1]},{u'a':{u'b':1}}]
+    p = JSONPatch()
+    d = copy.deepcopy(doc)
+    while len(p) < n:
+        present = [x for x in nodes(d) if x[0]]
+        containers = [x for x in nodes(d) if type(x[1]) in (dict,list)]
+        c,node = r.choice(containers)
+        if type(node) is list:
+            child = list(c)+[r.choice(['-',0,1])]
+        else:
+            child = list(c)+[r.choice('abcd')]
+        op = r.choice(['add','add','replace','replace','remove','move','copy','test'])
+        if op == 'add':
+            x = JSONPatchItem(op,JSONPointer(child,False),r.choice(values))
+        elif not present:
+            continue
+        else:
+            t,v = r.choice(present)
+            if op == 'test':
+                x = JSONPatchItem(op,JSONPointer(list(t),False),copy.deepcopy(v))
+            elif op == 'replace':
+                x = JSONPatchItem(op,JSONPointer(list(t),False),r.choice(values))
+            elif op == 'remove':
+                x = JSONPatchItem(op,JSONPointer(list(t),False))
+            else:
+                x = JSONPatchItem(op,JSONPointer(child,False),JSONPointer(list(t),False))
+        try:
+            dx = copy.deepcopy(d)
+            JSONPatchPlan([x]).apply(dx)
+        except Exception:
+            continue
+        p += x
+        d = dx
+    return p
+
+#
+#######################
+#
+class CallUnits(unittest.TestCase):
+    """Optimize 'patch.json', and apply onto copies of 'datafile.json'.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        global data
+        global patch
+
+        with open(mypath+'datafile.json') as fp:
+            data = myjson.load(fp)
+        patch = JSONPatch()
+        patch.patch_import(mypath+'patch.json')
+
+    def testCase000(self):
+        """Folded chains, shadowed tasks, and merged array items.
+        """
+        p = patch.optimize()
+        assert [repr(x) for x in p] == [
+            "{u'op': u'add', u'path': u'/config/x', u'value': 3}",
+            "{u'op': u'remove', u'path': u'/config/x'}",
+            "{u'op': u'add', u'path': u'/config/d', u'value': {u'e': [7, 8], u'f': True}}",
+            "{u'op': u'replace', u'path': u'/copied', u'value': {u'c': []}}",
+            "{u'op': u'replace', u'path': u'/items/0/id', u'value': 10}",
+            "{u'op': u'add', u'path': u'/items/1/tags/-', u'value': u'a'}",
+            "{u'op': u'test', u'path': u'/items/1/tags/0', u'value': u'a'}",
+            "{u'op': u'replace', u'path': u'/items/2', u'value': {u'id': 20}}",
+            "{u'op': u'replace', u'path': u'/name', u'value': u'optimized'}",
+            "{u'op': u'replace', u'path': u'/config/a', u'value': 2}",
+            "{u'op': u'test', u'path': u'/config/a', u'value': 2}",
+            "{u'op': u'replace', u'path': u'/config/a', u'value': 3}",
+        ]
+        d0 = copy.deepcopy(data)
+        d1 = copy.deepcopy(data)
+        assert patch.compile().apply(d0) == (20,[])
+        assert p.apply(d1) == (12,[])
+        assert d0 == d1
+
+    def testCase010(self):
+        """The present patch, and its values are not changed.
+        """
+        assert len(patch) == 20
+        assert patch[4].value == {'e': []}
+        assert patch.optimize().optimize() == patch.optimize()
+
+    def testCase020(self):
+        """Tasks on shifted array items, and failed tests are not folded.
+        """
+        p = JSONPatch()
+        p += JSONPatchItem('replace','/items/1/id',5)
+        p += JSONPatchItem('remove','/items/0')
+        p += JSONPatchItem('replace','/items/0/id',6)
+        p += JSONPatchItem('test','/items/0/id',7)
+        p += JSONPatchItem('replace','/items/0/id',8)
+        o = p.optimize()
+        assert len(o) == 5
+        d = copy.deepcopy(data)
+        assert o.apply(d) == (5,[3])
+        assert d == data
+
+    def testCase030(self):
+        """Random patches, same result as the original patch.
+        """
+        r = random.Random(4711)
+        doc = {u'a': {u'b': [1, {u'c': 2}]}, u'l': [1, 2, 3], u'd': {}}
+        n = n0 = 0
+        for _i in range(300):
+            p = randompatch(r,doc,r.randint(1,12))
+            o = p.optimize()
+            d0 = copy.deepcopy(doc)
+            d1 = copy.deepcopy(doc)
+            assert p.compile().apply(d0) == (len(p),[])
+            assert o.compile().apply(d1) == (len(o),[])
+            assert d0 == d1, (repr(p),repr(o))
+            n += len(p)
+            n0 += len(o)
+        assert n0 < n
+
+    def testCase040(self):
+        """Serializer.
+        """
+        kargs = {}
+        kargs['datafile'] = mypath+'datafile.json'
+        kargs['schemafile'] = mypath+'schema.jsd'
+        kargs['nodefaultpath'] = True
+        kargs['nosubdata'] = True
+        kargs['validator'] = MODE_SCHEMA_DRAFT4
+        configdata = ConfigData(appname,**kargs)
+
+        assert patch.optimize().apply(configdata) == (12,[])
+        assert configdata.data['config']['d'] == {'e': [7, 8], 'f': True}
+        assert configdata.data['name'] == 'optimized'
+
+
+#
+#######################
+#
+
+if __name__ == '__main__':
+    unittest.main()
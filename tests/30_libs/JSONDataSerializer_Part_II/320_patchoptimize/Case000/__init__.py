@@ -0,0 +1,2 @@
+"""Recorded chains of tasks, the optimized patch results in the same document.
+"""
@@ -0,0 +1,2 @@
+"""Optimization of JSONPatch by the folding of tasks.
+"""
@@ -0,0 +1,132 @@
+"""Bulk application by jsondata.JSONPatch.apply_bulk().
+"""
+from __future__ import absolute_import
+
+import unittest
+import os
+import sys
+import copy
+import shutil
+import tempfile
+
+#
+if 'ujson' in sys.argv:
+    import ujson as myjson
+else:
+    import json as myjson
+import jsonschema
+
+
+from jsondata.JSONDataSerializer import JSONDataSerializer as ConfigData
+from jsondata.JSONDataSerializer import MODE_SCHEMA_OFF,MODE_SCHEMA_DRAFT4
+from jsondata.JSONDataExceptions import JSONDataSourceFile
+from jsondata.JSONDataIO import json_load,json_write
+from jsondata.JSONPatch import JSONPatch,JSONPatchItem,JSONPatchItemException
+from jsondata.JSONPointer import JSONPointer
+
+# name of application, used for several filenames as MODE_SCHEMA_DRAFT4
+_APPNAME = "jsondc"
+appname = _APPNAME
+mypath = os.path.dirname(__file__)+os.sep
+#
+#######################
+#
+class CallUnits(unittest.TestCase):
+    """Apply 'patch.json' onto copies of 'datafile.json'.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        global data
+        global expected
+        global patch
+
+        with open(mypath+'datafile.json') as fp:
+            data = myjson.load(fp)
+        patch = JSONPatch()
+        patch.patch_import(mypath+'patch.json')
+        expected = copy.deepcopy(data)
+        assert patch.compile().apply(expected) == (5,[])
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.files = []
+        for i in range(40):
+            d = copy.deepcopy(data)
+            if i % 10 == 3:
+                d['name'] = 'other'
+            f = os.path.join(self.tmpdir,'doc%02d.json' % i)
+            if i % 4 == 0:
+                f += '.gz'
+            json_write(f,d)
+            self.files.append(f)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def check(self, results):
+        assert [r[0] for r in results] == self.files
+        for i,(f,ok,value) in enumerate(results):
+            if i % 10 == 3:
+                assert not ok and value == [0]
+                assert json_load(f)['name'] == 'other'
+            else:
+                assert ok and value is True
+                assert json_load(f) == expected
+
+    def testCase000(self):
+        """Files written by a pool of processes, failed tests unchanged.
+        """
+        self.check(list(patch.apply_bulk(iter(self.files),2,chunksize=3)))
+
+    def testCase010(self):
+        """Files written sequentially, written again only when changed.
+        """
+        self.check(list(patch.apply_bulk(self.files,1)))
+        p = JSONPatch()
+        p += JSONPatchItem('replace','/config/a',2)
+        assert [r[2] for r in p.apply_bulk(self.files[:3],2)] == [False,False,False]
+
+    def testCase020(self):
+        """Patched data of the files, and missing files.
+        """
+        files = self.files[:5]+[os.path.join(self.tmpdir,'none.json')]
+        results = list(patch.apply_bulk(files,2,writeback=False,chunksize=2))
+        assert results[0] == (files[0],True,expected)
+        assert results[3] == (files[3],False,[0])
+        assert json_load(files[0]) == data
+        assert results[5][0] == files[5] and not results[5][1]
+        assert isinstance(results[5][2],JSONDataSourceFile)
+
+    def testCase030(self):
+        """In-memory documents by a generator, not changed.
+        """
+        docs = [copy.deepcopy(data) for _i in range(3)]
+        for processes in (1,2):
+            results = list(patch.apply_bulk((d for d in docs),processes,chunksize=1))
+            assert results == [(0,True,expected),(1,True,expected),(2,True,expected)]
+            assert docs[0] == data
+
+    def testCase040(self):
+        """Abandoned results, and an invalid patch.
+        """
+        g = patch.apply_bulk(iter(self.files),2,chunksize=1)
+        assert next(g)[1]
+        g.close()
+
+        p = JSONPatch()
+        p += JSONPatchItem('replace','',{})
+        try:
+            p.apply_bulk(self.files)
+        except JSONPatchItemException:
+            pass
+        else:
+            assert False, "expected JSONPatchItemException"
+
+
+#
+#######################
+#
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,2 @@
+"""Copies of the data file, patched in place, and in-memory documents.
+"""
@@ -0,0 +1,2 @@
+"""Bulk application of JSONPatch onto many documents by a pool of processes.
+"""